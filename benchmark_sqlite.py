@@ -0,0 +1,80 @@
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import bindparam, select
+
+from pywordle import my_globals
+from pywordle.logic import db_manager as dbm
+from pywordle.logic import sqlite_profile
+from pywordle.model.models import Word
+
+parser = argparse.ArgumentParser(
+    description="Compare the SQLite profiles on a copy of the database."
+)
+parser.add_argument(
+    "--profiles", nargs="+", choices=my_globals.SQLITE_PROFILES, default=None
+)
+parser.add_argument("--lookups", type=int, default=10_000)
+parser.add_argument("--queries", type=int, default=50)
+parser.add_argument("--draws", type=int, default=2_000)
+parser.add_argument("--transactions", type=int, default=200)
+parser.add_argument("--rows", type=int, default=50, help="results per transaction")
+args = parser.parse_args()
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        function()
+
+    return time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as directory:
+    for profile in args.profiles or my_globals.SQLITE_PROFILES:
+        path = Path(directory) / f"{profile}.sqlite3"
+        shutil.copyfile(my_globals.WORKING_DIR / my_globals.DATABASE_FILE, path)
+
+        engine = sqlite_profile.create_engine(f"sqlite:///{path}", profile=profile)
+        dbm.Session = sessionmaker(engine)
+        dbm.invalidate_caches()
+
+        word_id = dbm.get_random_word().id
+        results = [(word_id, None)] * args.rows
+        words = [word.word for word in dbm.get_words()]
+        lookup = select(Word.id).where(Word.word == bindparam("word"))
+
+        # SQLite only, exist() is answered from memory after the first call
+        with dbm.Session() as session:
+            lookups = timed(
+                lambda: session.execute(
+                    lookup, {"word": random.choice(words)}
+                ).scalar_one(),
+                args.lookups,
+            )
+
+        queries = timed(lambda: dbm.get_words(allow_nsfw_words=False), args.queries)
+        draws = timed(dbm.get_random_word, args.draws)
+        inserts = timed(lambda: dbm.add_results(results), args.transactions)
+        commits = timed(lambda: dbm.add_results(results[:1]), args.transactions)
+
+        pragmas = sqlite_profile.current_pragmas(engine)
+        engine.dispose()
+
+        print(f"{profile}: {pragmas}")
+        print(f"  word lookup        {lookups / args.lookups * 1e6:8.2f} µs/call")
+        print(f"  get_words          {queries / args.queries * 1000:8.2f} ms/call")
+        print(f"  get_random_word    {draws / args.draws * 1e6:8.1f} µs/call")
+        print(
+            f"  add_results        {args.transactions * args.rows / inserts:8.0f} "
+            f"rows/s ({args.rows} rows/transaction)"
+        )
+        print(
+            f"  add_results        {commits / args.transactions * 1000:8.2f} ms/commit"
+        )
@@ -0,0 +1,5 @@
+from pywordle.logic import db_manager as dbm
+from pywordle.my_globals import DAILY_START
+
+days = dbm.build_daily_schedule()
+print("Scheduled", days, "daily words from", DAILY_START)
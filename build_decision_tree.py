@@ -0,0 +1,9 @@
+import sys
+
+from pywordle.logic import db_manager as dbm
+from pywordle.logic import decision_tree
+
+opener = sys.argv[1]
+words = dbm.get_words()
+path = decision_tree.build(words, opener)
+print("Solved", len(words), "words with opener", opener, "into", path)
@@ -0,0 +1,6 @@
+from pywordle.logic import db_manager as dbm
+from pywordle.logic import pattern_matrix
+
+words = dbm.get_words()
+path = pattern_matrix.build(words)
+print("Scored", len(words), "x", len(words), "words into", path)
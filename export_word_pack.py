@@ -0,0 +1,4 @@
+from pywordle.logic import db_manager as dbm
+
+path = dbm.export_word_pack()
+print("Exported words into", path)
@@ -0,0 +1,10 @@
+from pywordle.logic import db_manager as dbm
+from pywordle.logic.word_lists_parser.word_list_1 import WordList1Parser
+
+
+# Zipf weights: the most frequent word is drawn max_rank times as often as a
+# word, that is not ranked (weight 1)
+ranks = WordList1Parser.get_ranks()
+max_rank = max(ranks.values())
+dbm.set_weights({word: max_rank / rank for word, rank in ranks.items()}, default=1.0)
+print("Weighted", len(ranks), "words.")
@@ -0,0 +1,21 @@
+import argparse
+from pathlib import Path
+
+from pywordle.logic import db_manager as dbm
+from pywordle.logic import openers
+
+parser = argparse.ArgumentParser(description="Rank every word as first guess.")
+parser.add_argument("--output", type=Path, default=Path("openers.csv"))
+parser.add_argument("--processes", type=int, default=None)
+parser.add_argument("--without-depth", action="store_true")
+args = parser.parse_args()
+
+scores = openers.find_openers(
+    dbm.get_words(), processes=args.processes, with_depth=not args.without_depth
+)
+openers.write_csv(scores, args.output)
+
+for position, score in enumerate(scores[:10], start=1):
+    print(position, score.word, score.expected_remaining, score.worst_case)
+
+print("Ranked", len(scores), "openers into", args.output)
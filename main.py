@@ -1,18 +1,28 @@
+import argparse
 import sys
 import asyncio
 
 from PySide2.QtWidgets import QApplication
 from asyncqt import QEventLoop
 
+from pywordle.logic.word_pack import WordPack
 from pywordle.view.main_window import MainWindow
 
+parser = argparse.ArgumentParser(description="Play pyWordle.")
+parser.add_argument(
+    "--word-pack",
+    action="store_true",
+    help="serve words from the word pack (kiosk mode, see export_word_pack.py)",
+)
+
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
 
-    window = MainWindow()
+    window = MainWindow(word_pack=WordPack() if args.word_pack else None)
     window.show()
 
     with loop:
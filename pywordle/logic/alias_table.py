@@ -0,0 +1,76 @@
+"""
+Walker/Vose alias table for weighted sampling.
+
+The table is built once in O(n), afterwards every draw is O(1): a uniform
+slot and one biased coin decide between the slot and its alias.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Sequence
+
+
+class AliasTable:
+    """Weighted sampling of indices 0..n-1 in constant time."""
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        """Build the table (Vose's method).
+
+        :param weights: Non-negative weight of every index, at least one
+            weight must be positive.
+        :type weights: Sequence[float]
+        :raise: ValueError
+        """
+
+        count = len(weights)
+        total = float(sum(weights))
+
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights must not be negative.")
+
+        if total <= 0:
+            raise ValueError("At least one weight must be positive.")
+
+        scaled = [weight * count / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+
+        self.probabilities = array("d", [1.0]) * count
+        self.aliases = array("I", range(count))
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # remaining slots are full (up to rounding errors)
+        for index in small + large:
+            self.probabilities[index] = 1.0
+            self.aliases[index] = index
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def sample(self, rng: None | random.Random = None) -> int:
+        """Draw a weighted random index.
+
+        :param rng: Random number generator (default: module random).
+        :type rng: None | random.Random
+        :return: The drawn index.
+        :rtype: int
+        """
+
+        generator = rng if rng is not None else random
+        index = generator.randrange(len(self.probabilities))
+
+        if generator.random() < self.probabilities[index]:
+            return index
+
+        return self.aliases[index]
@@ -0,0 +1,111 @@
+"""
+Anagram and letter-multiset index.
+
+Words are grouped by their sorted letters (the letter multiset) for exact
+anagrams. "At least these letters" is answered with the letter count
+bitsets of the candidate index: one AND per distinct letter.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Sequence
+
+from pywordle.logic import db_manager
+from pywordle.logic.candidates import CandidateIndex
+from pywordle.logic.codec import ALPHABET, WORD_LENGTH
+from pywordle.logic.helper import upper
+from pywordle.model.models import Word
+
+
+def multiset_key(letters: str) -> str:
+    """Get the key of a letter multiset (sorted uppered letters).
+
+    :param letters: The letters.
+    :type letters: str
+    :return: The sorted letters.
+    :rtype: str
+    """
+
+    return "".join(sorted(upper(letters)))
+
+
+class LetterIndex:
+    """Words by letter multiset and by minimum letter counts."""
+
+    def __init__(self, words: Sequence[Word]) -> None:
+        self._candidates = CandidateIndex(words)
+        self.words = self._candidates.words
+        self.letter_counts = self._candidates.letter_counts
+
+        self._multisets: dict[str, list[int]] = {}
+
+        for index, word in enumerate(self.words):
+            self._multisets.setdefault(multiset_key(word.word), []).append(index)
+
+    @classmethod
+    def from_database(cls, allow_nsfw_words: bool = True) -> LetterIndex:
+        """Create an index over the enabled words of the database.
+
+        :param allow_nsfw_words: If False, words with nsfw=True are ignored.
+        :type allow_nsfw_words: bool
+        :return: The letter index.
+        :rtype: LetterIndex
+        """
+
+        return cls(db_manager.get_words(allow_nsfw_words=allow_nsfw_words))
+
+    def anagrams(self, letters: str) -> list[Word]:
+        """Get the words using exactly these letters.
+
+        :param letters: The letters (any order).
+        :type letters: str
+        :return: The words.
+        :rtype: list[Word]
+        """
+
+        return [
+            self.words[index]
+            for index in self._multisets.get(multiset_key(letters), ())
+        ]
+
+    def containing(self, letters: str) -> list[Word]:
+        """Get the words containing at least these letters (with duplicates).
+
+        :param letters: The letters (any order), e.g. "EE" for words with at
+            least two 'E'.
+        :type letters: str
+        :return: The words.
+        :rtype: list[Word]
+        """
+
+        letters = upper(letters)
+
+        if len(letters) > WORD_LENGTH or any(
+            letter not in ALPHABET for letter in letters
+        ):
+            return []
+
+        bits = self._candidates.all
+
+        for letter, count in Counter(letters).items():
+            bits &= self._candidates.count_bits(ALPHABET.index(letter), count)
+
+        return self._candidates.words_of(bits)
+
+
+_shared = db_manager.VersionedCache(LetterIndex.from_database)
+
+
+def shared() -> LetterIndex:
+    """Get the index of the database words, built once per version.
+
+    The index is rebuilt after words or flags changed (e.g. by add_word_list,
+    see db_manager.dictionary_version). Safe to call from worker threads, the
+    index is shared read-only.
+
+    :return: The letter index.
+    :rtype: LetterIndex
+    """
+
+    return _shared.get()
@@ -0,0 +1,85 @@
+"""
+Async facade of db_manager.
+
+All queries run on one dedicated database thread, so the asyncio (asyncqt)
+event loop of the UI never waits for the disk. The db_manager functions of
+the UI have typed wrappers with the same arguments, that return an
+awaitable future instead of the result:
+
+    word_exists = await db.exist(word)
+
+Any other function runs with call (e.g. db.call(prefix_trie.shared)).
+Calls are submitted immediately and run in call order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from pywordle.logic import db_manager
+from pywordle.model.models import Word
+
+T = TypeVar("T")
+
+
+class AsyncDB:
+    """Runs db_manager functions on a dedicated thread."""
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pywordle-db"
+        )
+
+    def call(
+        self, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> asyncio.Future[T]:
+        """Run any function on the database thread (e.g. index builders).
+
+        :param function: The function.
+        :type function: Callable[..., T]
+        :return: Future of the result.
+        :rtype: asyncio.Future[T]
+        """
+
+        loop = asyncio.get_event_loop()
+
+        return loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    def exist(self, word: str) -> asyncio.Future[bool]:
+        """See db_manager.exist."""
+
+        return self.call(db_manager.exist, word)
+
+    def draw_word(
+        self, allow_nsfw_words: bool = True, allow_disabled_words: bool = False
+    ) -> asyncio.Future[None | Word]:
+        """See db_manager.draw_word."""
+
+        return self.call(db_manager.draw_word, allow_nsfw_words, allow_disabled_words)
+
+    def get_words(
+        self, allow_nsfw_words: bool = True, allow_disabled_words: bool = False
+    ) -> asyncio.Future[list[Word]]:
+        """See db_manager.get_words."""
+
+        return self.call(db_manager.get_words, allow_nsfw_words, allow_disabled_words)
+
+    def add_word(
+        self, word: str, ignore_unique_constraint_exception: bool = False
+    ) -> asyncio.Future[None]:
+        """See db_manager.add_word."""
+
+        return self.call(db_manager.add_word, word, ignore_unique_constraint_exception)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the database thread.
+
+        :param wait: If True, wait until the submitted calls are done (e.g.
+            results, that are saved while the window closes).
+        :type wait: bool
+        """
+
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,193 @@
+"""
+Bitset index over the dictionary to find the answers still possible after
+some guesses.
+
+Bit i of every bitset (Python int) stands for the i-th word of the index.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle.logic import db_manager
+from pywordle.logic.codec import ALPHABET, WORD_LENGTH, letter_codes
+from pywordle.model.models import Word
+
+
+def _to_bitset(mask: npt.NDArray[np.bool_]) -> int:
+    """Convert a bool array to a bitset (bit i = mask[i])."""
+
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+class CandidateIndex:
+    """Bitsets per (position, letter) and per (letter, at least k times)."""
+
+    def __init__(self, words: Sequence[Word]) -> None:
+        self.words = list(words)
+        self.all = (1 << len(self.words)) - 1
+
+        codes = letter_codes([word.word for word in self.words])
+        rows = np.arange(len(self.words))
+
+        # count vector of every word, row = word, column = letter code
+        self.letter_counts = np.zeros((len(self.words), len(ALPHABET)), dtype=np.uint8)
+
+        for position in range(WORD_LENGTH):
+            np.add.at(self.letter_counts, (rows, codes[:, position]), 1)
+
+        self._positions = [
+            [_to_bitset(codes[:, position] == code) for code in range(len(ALPHABET))]
+            for position in range(WORD_LENGTH)
+        ]
+        self._counts = [
+            [_to_bitset(self.letter_counts[:, code] >= count) for count in range(1, 6)]
+            for code in range(len(ALPHABET))
+        ]
+
+    @classmethod
+    def from_database(cls, allow_nsfw_words: bool = True) -> CandidateIndex:
+        """Create an index over the enabled words of the database.
+
+        :param allow_nsfw_words: If False, words with nsfw=True are ignored.
+        :type allow_nsfw_words: bool
+        :return: The candidate index.
+        :rtype: CandidateIndex
+        """
+
+        return cls(db_manager.get_words(allow_nsfw_words=allow_nsfw_words))
+
+    def position_bits(self, position: int, letter_code: int) -> int:
+        """Get the bitset of words with given letter on given position.
+
+        :param position: Position of the letter (0..4).
+        :type position: int
+        :param letter_code: Code of the letter (index in ALPHABET).
+        :type letter_code: int
+        :return: Bitset of words.
+        :rtype: int
+        """
+
+        return self._positions[position][letter_code]
+
+    def count_bits(self, letter_code: int, count: int) -> int:
+        """Get the bitset of words, that contain given letter at least count times.
+
+        :param letter_code: Code of the letter (index in ALPHABET).
+        :type letter_code: int
+        :param count: Minimum number of occurences.
+        :type count: int
+        :return: Bitset of words.
+        :rtype: int
+        """
+
+        if count <= 0:
+            return self.all
+
+        if count > WORD_LENGTH:
+            return 0
+
+        return self._counts[letter_code][count - 1]
+
+    def filter(self, guess: str, pattern: int, candidates: None | int = None) -> int:
+        """Remove all words from candidates, that do not give pattern for guess.
+
+        Correct positions keep the words with the letter on this position,
+        all other positions drop the words with the letter on this position.
+        A letter on other position exists more often than on the correct
+        positions (same duplicate-letter rules as scoring.score).
+
+        :param guess: Guessed word.
+        :type guess: str
+        :param pattern: Feedback pattern of guess (see scoring).
+        :type pattern: int
+        :param candidates: Bitset of candidates (default: all words).
+        :type candidates: None | int
+        :return: Bitset of remaining candidates.
+        :rtype: int
+        """
+
+        bits = self.all if candidates is None else candidates
+        codes = [int(code) for code in letter_codes([guess])[0]]
+
+        digits = []
+
+        for _ in range(WORD_LENGTH):
+            pattern, digit = divmod(pattern, 3)
+            digits.append(digit)
+
+        for position, (code, digit) in enumerate(zip(codes, digits)):
+            if digit == 2:
+                bits &= self._positions[position][code]
+            else:
+                bits &= ~self._positions[position][code]
+
+        for position, (code, digit) in enumerate(zip(codes, digits)):
+            if digit == 2:
+                continue
+
+            correct = sum(
+                1
+                for other_code, other_digit in zip(codes, digits)
+                if other_code == code and other_digit == 2
+            )
+
+            if digit == 1:
+                bits &= self.count_bits(code, correct + 1)
+            else:
+                bits &= ~self.count_bits(code, correct + 1)
+
+        return bits
+
+    def candidates(
+        self, history: Iterable[tuple[str, int]], candidates: None | int = None
+    ) -> int:
+        """Get the bitset of words still possible after all guesses of history.
+
+        :param history: Pairs of guessed word and feedback pattern.
+        :type history: Iterable[tuple[str, int]]
+        :param candidates: Bitset of candidates (default: all words).
+        :type candidates: None | int
+        :return: Bitset of remaining candidates.
+        :rtype: int
+        """
+
+        bits = self.all if candidates is None else candidates
+
+        for guess, pattern in history:
+            bits = self.filter(guess, pattern, bits)
+
+            if not bits:
+                break
+
+        return bits
+
+    def indices(self, bits: int) -> list[int]:
+        """Get the indices of all words in bitset.
+
+        :param bits: Bitset of words.
+        :type bits: int
+        :return: Indices of the words in the index (ascending).
+        :rtype: list[int]
+        """
+
+        data = np.frombuffer(
+            bits.to_bytes((len(self.words) + 7) // 8, "little"), dtype=np.uint8
+        )
+        mask = np.unpackbits(data, bitorder="little")[: len(self.words)]
+
+        return np.flatnonzero(mask).tolist()
+
+    def words_of(self, bits: int) -> list[Word]:
+        """Get all words in bitset.
+
+        :param bits: Bitset of words.
+        :type bits: int
+        :return: Words in the same order as in the index.
+        :rtype: list[Word]
+        """
+
+        return [self.words[index] for index in self.indices(bits)]
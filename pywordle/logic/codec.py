@@ -0,0 +1,169 @@
+"""
+Compact integer encoding of 5-letter words.
+
+Every letter is a 5 bit code (index in ALPHABET), the 5 letters of a word are
+packed into one 25 bit integer with the first letter in the most significant
+bits. So sorting codes sorts the words by ALPHABET order and word lists fit
+into array("I") or numpy.uint32 arrays. 'ß' is encoded as 'ẞ' (see
+helper.upper) and decoded to 'ẞ'.
+
+numpy is imported by the array functions (letter_codes, pack, unpack) on
+first use, so the word pack (and a kiosk start with it) does not load it.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from pywordle.logic.helper import upper
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+WORD_LENGTH = 5
+BITS_PER_LETTER = 5
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜẞ"
+_LETTER_CODES = {letter: code for code, letter in enumerate(ALPHABET)}
+
+_LETTER_MASK = (1 << BITS_PER_LETTER) - 1
+_SHIFTS = tuple(
+    BITS_PER_LETTER * (WORD_LENGTH - 1 - position) for position in range(WORD_LENGTH)
+)
+
+
+def letter_codes(words: Sequence[str]) -> npt.NDArray[np.uint8]:
+    """Convert words to an array of letter codes (index of letter in ALPHABET).
+
+    :param words: Words with exact 5 letters.
+    :type words: Sequence[str]
+    :return: Array of letter codes with shape (len(words), 5).
+    :rtype: numpy.ndarray[numpy.uint8]
+    :raise: ValueError
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    codes = np.empty((len(words), WORD_LENGTH), dtype=np.uint8)
+
+    for row, word in enumerate(words):
+        word = upper(word)
+
+        if len(word) != WORD_LENGTH:
+            raise ValueError(f"Word '{word}' must have exact {WORD_LENGTH} letters.")
+
+        try:
+            codes[row] = [_LETTER_CODES[letter] for letter in word]
+        except KeyError as error:
+            raise ValueError(f"Word '{word}' has invalid letter {error}.") from error
+
+    return codes
+
+
+def encode(word: str) -> int:
+    """Encode a word as 25 bit integer.
+
+    :param word: Word with exact 5 letters.
+    :type word: str
+    :return: The code of the word.
+    :rtype: int
+    :raise: ValueError
+    """
+
+    word = upper(word)
+
+    if len(word) != WORD_LENGTH:
+        raise ValueError(f"Word '{word}' must have exact {WORD_LENGTH} letters.")
+
+    code = 0
+
+    for letter in word:
+        try:
+            code = (code << BITS_PER_LETTER) | _LETTER_CODES[letter]
+        except KeyError as error:
+            raise ValueError(f"Word '{word}' has invalid letter {error}.") from error
+
+    return code
+
+
+def decode(code: int) -> str:
+    """Decode a word encoded by encode.
+
+    :param code: The code of the word.
+    :type code: int
+    :return: The uppered word.
+    :rtype: str
+    :raise: ValueError
+    """
+
+    if not 0 <= code < 1 << (BITS_PER_LETTER * WORD_LENGTH):
+        raise ValueError(f"Invalid word code {code}.")
+
+    try:
+        return "".join(ALPHABET[(code >> shift) & _LETTER_MASK] for shift in _SHIFTS)
+    except IndexError as error:
+        raise ValueError(f"Invalid word code {code}.") from error
+
+
+def encode_words(words: Iterable[str]) -> array[int]:
+    """Encode words as array("I").
+
+    :param words: Words with exact 5 letters.
+    :type words: Iterable[str]
+    :return: The codes of the words.
+    :rtype: array.array[int]
+    :raise: ValueError
+    """
+
+    return array("I", map(encode, words))
+
+
+def decode_words(codes: Iterable[int]) -> list[str]:
+    """Decode words encoded by encode or encode_words.
+
+    :param codes: The codes of the words.
+    :type codes: Iterable[int]
+    :return: The uppered words.
+    :rtype: list[str]
+    :raise: ValueError
+    """
+
+    return [decode(int(code)) for code in codes]
+
+
+def pack(codes: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint32]:
+    """Pack letter codes (see letter_codes) into word codes.
+
+    :param codes: Array of letter codes with shape (n, 5).
+    :type codes: numpy.ndarray[numpy.uint8]
+    :return: The word codes with shape (n,).
+    :rtype: numpy.ndarray[numpy.uint32]
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    codes = np.asarray(codes, dtype=np.uint32).reshape(-1, WORD_LENGTH)
+
+    return np.bitwise_or.reduce(
+        codes << np.array(_SHIFTS, dtype=np.uint32), axis=1
+    ).astype(np.uint32)
+
+
+def unpack(words: npt.NDArray[np.uint32]) -> npt.NDArray[np.uint8]:
+    """Unpack word codes into letter codes (inverse of pack).
+
+    :param words: The word codes with shape (n,).
+    :type words: numpy.ndarray[numpy.uint32]
+    :return: Array of letter codes with shape (n, 5).
+    :rtype: numpy.ndarray[numpy.uint8]
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    words = np.asarray(words, dtype=np.uint32).reshape(-1, 1)
+
+    return ((words >> np.array(_SHIFTS, dtype=np.uint32)) & _LETTER_MASK).astype(
+        np.uint8
+    )
@@ -0,0 +1,90 @@
+"""
+Deterministic daily-challenge schedule.
+
+The schedule depends only on the seed and the sorted word list, so every
+client generates the same answers without a coordinating service. A word is
+not repeated inside the no-repeat window: picked words wait in a queue and
+return to the pool after window days. Days of deleted words get a
+replacement, that depends only on the seed, the day and the words.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from datetime import date
+from typing import Iterable, Sequence
+
+
+def schedule(
+    words: Sequence[str], days: int, seed: int | str, window: int
+) -> list[int]:
+    """Generate the answers of consecutive days.
+
+    :param words: Eligible words (the order is normalized by sorting).
+    :type words: Sequence[str]
+    :param days: Number of days to generate.
+    :type days: int
+    :param seed: Seed of the schedule.
+    :type seed: int | str
+    :param window: Minimum number of days between two occurrences of a word,
+        limited to the number of words - 1.
+    :type window: int
+    :return: Index (in words) of the answer of every day.
+    :rtype: list[int]
+    :raise: ValueError
+    """
+
+    if not words:
+        raise ValueError("No words to schedule.")
+
+    window = max(0, min(window, len(words) - 1))
+    rng = random.Random(seed)
+
+    # swap-remove pool of the selectable words and queue of recent answers
+    pool = sorted(range(len(words)), key=lambda index: words[index])
+    recent: deque[int] = deque()
+    answers = []
+
+    for _ in range(days):
+        position = rng.randrange(len(pool))
+        answer = pool[position]
+        pool[position] = pool[-1]
+        pool.pop()
+
+        recent.append(answer)
+
+        if len(recent) > window:
+            pool.append(recent.popleft())
+
+        answers.append(answer)
+
+    return answers
+
+
+def replacement(
+    words: Sequence[str], recent: Iterable[str], seed: int | str, day: date
+) -> None | int:
+    """Pick a new answer of a day, whose word was deleted.
+
+    :param words: Eligible words (the order is normalized by sorting).
+    :type words: Sequence[str]
+    :param recent: Answers inside the no-repeat window around the day, they
+        are skipped, unless no other word is left.
+    :type recent: Iterable[str]
+    :param seed: Seed of the schedule.
+    :type seed: int | str
+    :param day: The day.
+    :type day: datetime.date
+    :return: Index (in words) of the answer or None, if words is empty.
+    :rtype: None | int
+    """
+
+    if not words:
+        return None
+
+    recent = set(recent)
+    pool = sorted(range(len(words)), key=lambda index: words[index])
+    candidates = [index for index in pool if words[index] not in recent] or pool
+
+    return random.Random(f"{seed}:{day.isoformat()}").choice(candidates)
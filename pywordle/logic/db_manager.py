@@ -4,148 +4,920 @@ DB Manager
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, List
+import random
+import sys
+import threading
+from array import array
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+)
 
 from more_itertools import chunked
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.sql import exists, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Query, sessionmaker, undefer
+from sqlalchemy.orm.session import Session as OrmSession
+from sqlalchemy.sql import (
+    bindparam,
+    delete,
+    false,
+    func,
+    literal_column,
+    select,
+    true,
+    update,
+)
 
 from pywordle import my_globals
-from pywordle.model.models import Result, Word
+from pywordle.logic import daily, pattern_matrix, word_pack
+from pywordle.logic.alias_table import AliasTable
+from pywordle.logic.codec import ALPHABET, WORD_LENGTH
+from pywordle.logic.helper import upper
+from pywordle.logic.sqlite_profile import create_engine
+from pywordle.model.models import DailyWord, Deck, Result, Word
 
+# PRAGMAs of my_globals.SQLITE_PROFILE (e.g. WAL: readers do not block the writer)
 engine = create_engine(my_globals.DATABASE_URL)
 Session = sessionmaker(engine)
 
+# ids of the selectable words by (allow_nsfw_words, allow_disabled_words)
+_word_ids: dict[tuple[bool, bool], array[int]] = {}
+
+# ids of the words with positive weight and their alias table by filter
+_weighted_word_ids: dict[tuple[bool, bool], tuple[array[int], None | AliasTable]] = {}
+
+# all words (uppered) for exist, loaded on first use
+_dictionary: None | frozenset[str] = None
+
+# increased on every change of words or flags (see dictionary_version)
+_dictionary_version = 0
+
+# bytes of one word id in Deck.word_ids
+_DECK_ITEM_SIZE = 8
+
+# word ids per "WHERE id IN (...)" statement
+_IN_CHUNK_SIZE = 500
+
+# more words added to a deck are appended and the undrawn part is shuffled
+# once, fewer are inserted one by one (every insert moves the undrawn part)
+_DECK_SHUFFLE_THRESHOLD = 1000
+
+# key of the _Changes of a unit of work in Session.info
+_CHANGES = "pywordle_changes"
+
+
+class ImportReport(NamedTuple):
+    """Result of import_words."""
+
+    inserted: int
+    # words, that already existed or were duplicates in the imported words
+    skipped: int
+
+
+def _check_word(word: str) -> str:
+    """Upper word and check, that it has 5 letters of codec.ALPHABET.
+
+    :param word: The word to check.
+    :type word: str
+    :return: The uppered word.
+    :rtype: str
+    :raise: ValueError
+    """
+
+    word = upper(word)
+
+    if len(word) != WORD_LENGTH:
+        raise ValueError(
+            f"Lenght error - word: '{word}'. The word length must be exact 5!"
+        )
+
+    invalid = set(word).difference(ALPHABET)
+
+    if invalid:
+        raise ValueError(
+            f"Letter error - word: '{word}'. "
+            f"Invalid letters: {', '.join(sorted(invalid))}!"
+        )
+
+    return word
+
+
+def _invalidate_selections() -> None:
+    """Drop the cached ids of the random word selections.
+
+    Is called by all functions, that change words or flags.
+    """
+
+    global _dictionary_version  # pylint: disable=global-statement
+
+    _dictionary_version += 1
+    _word_ids.clear()
+    _weighted_word_ids.clear()
+
+
+def _patch_dictionary(added: Sequence[str] = (), removed: Sequence[str] = ()) -> None:
+    """Apply changed words to the dictionary of exist (if loaded).
+
+    The frozenset is replaced as a whole, so concurrent readers always see a
+    consistent dictionary.
+    """
+
+    global _dictionary  # pylint: disable=global-statement
+
+    if _dictionary is not None:
+        _dictionary = _dictionary.union(map(upper, added)).difference(
+            map(upper, removed)
+        )
+
+
+def invalidate_caches() -> None:
+    """Drop all cached word data.
+
+    Call it, if the database was changed by another process (changes by the
+    functions of this module update the caches).
+    """
+
+    global _dictionary  # pylint: disable=global-statement
+
+    _invalidate_selections()
+    _dictionary = None
+
+
+def dictionary_version() -> int:
+    """Get the version of the words in database.
+
+    The version changes with every change of words or flags (e.g. by
+    add_word_list) and with invalidate_caches, so indexes derived from the
+    words know, when to rebuild.
+
+    :return: The dictionary version.
+    :rtype: int
+    """
+
+    return _dictionary_version
+
+
+T = TypeVar("T")
+
+
+class VersionedCache(Generic[T]):
+    """A value built from the database words (by build), rebuilt once per
+    dictionary version (e.g. the shared indexes of the GUI).
+
+    Safe to use from worker threads, the value is shared read-only.
+    """
+
+    def __init__(self, build: Callable[[], T]) -> None:
+        self._build = build
+        self._value: None | tuple[int, T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Get the value, rebuilt if the dictionary version changed.
+
+        :return: The value of the current dictionary version.
+        :rtype: T
+        """
+
+        version = dictionary_version()
+
+        with self._lock:
+            if self._value is None or self._value[0] != version:
+                self._value = (version, self._build())
+
+            return self._value[1]
+
+
+class _Changes:
+    """Changes of a unit of work, applied to decks, pattern matrix and caches
+    once per commit (last change of a word wins)."""
+
+    def __init__(self) -> None:
+        self.dirty = False
+        self.word_ids: set[int] = set()
+        # ids of inserted words, that still have the default flags
+        self.inserted: set[int] = set()
+        # word -> exists (dictionary of exist)
+        self.words: dict[str, bool] = {}
+        # word id -> Word (add to pattern matrix) or None (remove)
+        self.matrix: dict[int, Any] = {}
+
+    def changed(self, word_ids: Iterable[int] = ()) -> None:
+        """Record changed flags or weights of words."""
+
+        word_ids = set(word_ids)
+        self.dirty = True
+        self.word_ids.update(word_ids)
+        self.inserted.difference_update(word_ids)
+
+    def added(self, words: Iterable[Any], inserted: bool = False) -> None:
+        """Record added or enabled words (with id and word).
+
+        inserted marks new words with the default flags (enabled, not nsfw).
+        """
+
+        words = list(words)
+        self.changed(word.id for word in words)
+
+        if inserted:
+            self.inserted.update(word.id for word in words)
+
+        self.words.update((word.word, True) for word in words)
+        self.matrix.update((word.id, word) for word in words)
+
+    def removed(self, words: Iterable[Any], deleted: bool) -> None:
+        """Record deleted or disabled words (with id and word)."""
+
+        for word in words:
+            self.changed([word.id])
+            self.matrix[word.id] = None
+
+            if deleted:
+                self.words[word.word] = False
+
+    def apply(self) -> None:
+        """Apply the committed changes to pattern matrix and caches."""
+
+        if not self.dirty:
+            return
+
+        # the caches first, the changes are committed whatever the matrix does
+        _patch_dictionary(
+            added=[word for word, exists in self.words.items() if exists],
+            removed=[word for word, exists in self.words.items() if not exists],
+        )
+        _invalidate_selections()
+
+        added = [word for word in self.matrix.values() if word is not None]
+        removed = [word_id for word_id, word in self.matrix.items() if word is None]
+
+        try:
+            if added:
+                pattern_matrix.add_words(added)
+
+            if removed:
+                pattern_matrix.remove_words(removed)
+        except Exception:  # pylint: disable=broad-except
+            # readers skip a stale file (scoring on the fly) until it is rebuilt
+            pattern_matrix.mark_stale()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[OrmSession]:
+    """Batch many changes into one session and one transaction.
+
+    Pass the session to the changing functions of this module::
+
+        with db_manager.unit_of_work() as session:
+            db_manager.set_nsfw_many(word_ids, True, session=session)
+            db_manager.delete_word(word_id, session=session)
+
+    All changes are committed together at the end (none, if an exception is
+    raised). The decks are updated once before, the pattern matrix and the
+    caches once after the commit.
+
+    :return: The session of the unit of work.
+    :rtype: sqlalchemy.orm.session.Session
+    """
+
+    changes = _Changes()
+
+    with Session(expire_on_commit=False) as session:
+        session.info[_CHANGES] = changes
+
+        try:
+            yield session
+
+            session.flush()
+            _update_decks(session, changes.word_ids, changes.inserted)
+            session.commit()
+        finally:
+            session.info.pop(_CHANGES, None)
+
+    changes.apply()
+
+
+@contextmanager
+def _unit(session: None | OrmSession) -> Iterator[tuple[OrmSession, _Changes]]:
+    """Use the session of a unit of work or run in a new unit of work."""
+
+    if session is None:
+        with unit_of_work() as new_session:
+            yield new_session, new_session.info[_CHANGES]
+    elif _CHANGES not in session.info:
+        raise ValueError("Session is not a session of unit_of_work.")
+    else:
+        yield session, session.info[_CHANGES]
+
+
+def _filter_words(
+    query: Query, allow_nsfw_words: bool, allow_disabled_words: bool
+) -> Query:
+    """Apply the nsfw and enabled filters of get_random_word to query."""
+
+    if not allow_nsfw_words:
+        query = query.filter(Word.nsfw.is_(False))
+
+    if not allow_disabled_words:
+        query = query.filter(Word.enabled.is_(True))
+
+    return query
+
+
+def _pack_ids(word_ids: Sequence[int]) -> bytes:
+    """Pack word ids as little-endian int64 (Deck.word_ids)."""
+
+    packed = array("q", word_ids)
+
+    if sys.byteorder == "big":
+        packed.byteswap()
+
+    return packed.tobytes()
+
+
+def _unpack_ids(data: bytes) -> array[int]:
+    """Unpack word ids packed by _pack_ids."""
+
+    word_ids = array("q")
+    word_ids.frombytes(data)
+
+    if sys.byteorder == "big":
+        word_ids.byteswap()
+
+    return word_ids
+
+
+def _shuffle_deck(session: OrmSession, deck: Deck) -> None:
+    """Fill the deck with a new seeded permutation of the eligible words."""
+
+    query = _filter_words(
+        session.query(Word.id), deck.allow_nsfw_words, deck.allow_disabled_words
+    )
+    word_ids = [word_id for word_id, in query.order_by(Word.id)]
+    random.Random(deck.seed).shuffle(word_ids)
+
+    deck.word_ids = _pack_ids(word_ids)
+    deck.size = len(word_ids)
+    deck.cursor = 0
+
+
+def _update_decks(
+    session: OrmSession, word_ids: Iterable[int], inserted: Iterable[int] = ()
+) -> None:
+    """Apply added, changed or deleted words to the undrawn part of all decks.
+
+    A word, that became eligible, is added at a random position of the
+    undrawn part (unless it was drawn already), a word, that is not eligible
+    anymore, is removed from it. The positions are drawn from the seed of the
+    deck and its state, so equal decks get equal updates. The flags of
+    inserted words (default flags) are not queried.
+    """
+
+    changed = set(word_ids)
+
+    if not changed:
+        return
+
+    decks = session.query(Deck).options(undefer(Deck.word_ids)).all()
+
+    if not decks:
+        return
+
+    # flags of the changed words, that still exist
+    flags = dict.fromkeys(changed.intersection(inserted), (True, False))
+
+    for chunk in chunked(changed.difference(flags), _IN_CHUNK_SIZE):
+        flags.update(
+            (word_id, (enabled, nsfw))
+            for word_id, enabled, nsfw in session.query(
+                Word.id, Word.enabled, Word.nsfw
+            ).filter(Word.id.in_(chunk))
+        )
+
+    for deck in decks:
+        eligible = {
+            word_id
+            for word_id, (enabled, nsfw) in flags.items()
+            if (deck.allow_nsfw_words or not nsfw)
+            and (deck.allow_disabled_words or enabled)
+        }
+
+        deck_ids = _unpack_ids(deck.word_ids)
+        drawn = deck_ids[: deck.cursor]
+        undrawn = [
+            word_id
+            for word_id in deck_ids[deck.cursor :]
+            if word_id not in changed or word_id in eligible
+        ]
+        added = sorted(eligible.difference(drawn, undrawn))
+
+        if not added and len(undrawn) == deck.size - deck.cursor:
+            continue
+
+        rng = random.Random(f"{deck.seed}:{deck.cursor}:{deck.size}")
+
+        if len(added) > _DECK_SHUFFLE_THRESHOLD:
+            undrawn += added
+            rng.shuffle(undrawn)
+        else:
+            for word_id in added:
+                undrawn.insert(rng.randint(0, len(undrawn)), word_id)
+
+        deck.word_ids = _pack_ids([*drawn, *undrawn])
+        deck.size = len(drawn) + len(undrawn)
+
 
 def exist(word: str) -> bool:
-    """Check if given word exists in database.
+    """Check if given word exists in database (enabled or not).
+
+    All words are loaded once into an in-memory set, afterwards the check
+    does not touch the database.
 
     :param word: The word to check.
     :return: True, if word exists in database and False, if not.
     :rtype: bool
     """
 
-    with Session() as session:
-        word_is_exisiting = session.query(exists().where(Word.word == word)).scalar()
+    global _dictionary  # pylint: disable=global-statement
 
-    return word_is_exisiting
+    dictionary = _dictionary
 
+    if dictionary is None:
+        with Session() as session:
+            dictionary = frozenset(upper(text) for text, in session.query(Word.word))
 
-def add_result(word_id: int, result: Result) -> None:
+        _dictionary = dictionary
+
+    return upper(word) in dictionary
+
+
+def add_result(word_id: int, result: Result, session: None | OrmSession = None) -> None:
     """Add given result to given world and save new result in database.
 
     :param word_id: ID of the word to save the result in.
     :type word_id: int
     :param result: The new result, that shall be saved in database.
     :type result: Result
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
-    with Session() as session:
-        word = session.query(Word).get(word_id)
-        word.results.append(result)
-        session.commit()
+    with _unit(session) as (session, _):
+        result.word_id = word_id
+        session.add(result)
 
 
-def add_word(word: str, ignore_unique_constraint_exception: bool = False) -> None:
+def add_results(
+    results: Sequence[tuple[int, None | int] | tuple[int, None | int, datetime]],
+    session: None | OrmSession = None,
+) -> None:
+    """Add results of many games to database (one bulk insert).
+
+    :param results: Word id, guessed_in_run (None, if not guessed) and
+        optional created_at (default: now) of every game.
+    :type results: Sequence[tuple[int, None | int] | tuple[int, None | int,
+        datetime.datetime]]
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
+    """
+
+    if not results:
+        return
+
+    now = datetime.utcnow()
+
+    with _unit(session) as (session, _):
+        session.execute(
+            Result.__table__.insert(),
+            [
+                {
+                    "word_id": word_id,
+                    "guessed_in_run": guessed_in_run,
+                    "created_at": created_at[0] if created_at else now,
+                }
+                for word_id, guessed_in_run, *created_at in results
+            ],
+        )
+
+
+def add_word(
+    word: str,
+    ignore_unique_constraint_exception: bool = False,
+    session: None | OrmSession = None,
+) -> None:
     """Add given word to database.
 
-    :param word: Word to add
+    :param word: Word to add (any case, stored uppered).
     :type word: str
     :param ignore_unique_constraint_exception:
-        If true, ignore insert exceptions,
-        if false, raise insetr exceptions like UNIQUE CONSTRAINT errors etc.
+        If true, an existing word is ignored (see import_words),
+        if false, raise insert exceptions like UNIQUE CONSTRAINT errors etc.
     :type ignore_unique_constraint_exception: bool
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
-    with Session() as session:
-        if ignore_unique_constraint_exception:
-            session_add = session.add
-
-            def add(*args: list[Any], **kwargs: dict[Any, Any]) -> None:
-                try:
-                    session_add(args, kwargs)
-                except SQLAlchemyError:  # nolint # noqa
-                    pass
+    if ignore_unique_constraint_exception:
+        import_words([word], session=session)
+        return
 
-            session.add = add
+    word = _check_word(word)
 
-        session.add(
-            Word(
-                word=word,
-                created_at=datetime.utcnow(),
-            )
+    with _unit(session) as (session, changes):
+        new_word = Word(
+            word=word,
+            created_at=datetime.utcnow(),
         )
-        session.commit()
+        session.add(new_word)
+        session.flush()
+        changes.added([new_word])
 
 
-def add_word_list(word_list: List[str]) -> None:
+def add_word_list(word_list: List[str], session: None | OrmSession = None) -> None:
     """Add words of list to database (bulk insert).
 
-    :param word_list: List of words
+    :param word_list: List of words (any case, stored uppered).
     :type word_list: list[str]
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
     bulk_size = 1000
+
+    # stored uppered, NOCASE folds ASCII letters only (e.g. not 'ä')
+    word_list = [_check_word(word) for word in word_list]
     words = [Word(word=word, created_at=datetime.utcnow()) for word in word_list]
 
     chunks = chunked(words, bulk_size)
 
-    with Session() as session:
+    with _unit(session) as (session, changes):
         for chunk in chunks:
             session.bulk_save_objects(chunk, return_defaults=False)
 
-        session.commit()
+        for chunk in chunked(word_list, bulk_size):
+            changes.added(session.query(Word).filter(Word.word.in_(chunk)))
 
 
-def delete_word(word_id: int) -> None:
+def import_words(
+    words: Iterable[str],
+    rebuild_indexes: bool = False,
+    chunk_size: int = 10_000,
+    session: None | OrmSession = None,
+) -> ImportReport:
+    """Import words, skipping existing and duplicate words (one transaction).
+
+    The words are streamed in chunks into INSERT ... ON CONFLICT DO NOTHING
+    (DBAPI executemany with the word as only parameter), no ORM objects are
+    created.
+
+    :param words: Words to import (any case, stored uppered).
+    :type words: Iterable[str]
+    :param rebuild_indexes: If True, the (not unique) indexes of the words
+        table are dropped during the import and rebuilt at the end, faster
+        for imports much larger than the table.
+    :type rebuild_indexes: bool
+    :param chunk_size: Words per executemany.
+    :type chunk_size: int
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :return: Number of inserted and skipped words.
+    :rtype: ImportReport
+    :raise: ValueError
+    """
+
+    table = Word.__table__
+    # the defaults are rendered into the statement, so rows need no processing
+    statement = (
+        insert(table)
+        .values(
+            word=bindparam("word"),
+            created_at=func.now(),
+            enabled=true(),
+            nsfw=false(),
+            weight=literal_column(table.c.weight.server_default.arg),
+        )
+        .on_conflict_do_nothing(index_elements=[table.c.word])
+    )
+    indexes = [index for index in table.indexes if not index.unique]
+    dropped = False
+    total = inserted = 0
+
+    with _unit(session) as (session, changes):
+        sql = str(statement.compile(dialect=session.connection().dialect))
+
+        # new words get higher ids than all existing words
+        last_id = session.execute(select(func.max(table.c.id))).scalar() or 0
+
+        for chunk in chunked(map(_check_word, words), chunk_size):
+            inserted += (
+                session.connection()
+                .exec_driver_sql(sql, [(word,) for word in chunk])
+                .rowcount
+            )
+            total += len(chunk)
+
+            # after the first insert (pysqlite begins the transaction with it),
+            # so the DDL is rolled back on errors
+            if rebuild_indexes and not dropped:
+                for index in indexes:
+                    index.drop(session.connection())
+
+                dropped = True
+
+        if dropped:
+            for index in indexes:
+                index.create(session.connection())
+
+        changes.added(
+            session.execute(
+                select(table.c.id, table.c.word).where(table.c.id > last_id)
+            ).all(),
+            inserted=True,
+        )
+
+    return ImportReport(inserted, total - inserted)
+
+
+def _words_of(session: OrmSession, word_ids: Sequence[int]) -> list[Any]:
+    """Get id and word of the existing words with given ids (no ORM objects)."""
+
+    table = Word.__table__
+    rows = []
+
+    for chunk in chunked(word_ids, _IN_CHUNK_SIZE):
+        rows += session.execute(
+            select(table.c.id, table.c.word).where(table.c.id.in_(chunk))
+        ).all()
+
+    return rows
+
+
+def delete_words(word_ids: Sequence[int], session: None | OrmSession = None) -> int:
+    """Delete words and their results by id (without loading the words).
+
+    :param word_ids: IDs of the words.
+    :type word_ids: Sequence[int]
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :return: Number of deleted words.
+    :rtype: int
+    :raise: ValueError
+    """
+
+    with _unit(session) as (session, changes):
+        words = _words_of(session, word_ids)
+        days: list[date] = []
+
+        # sqlite does not enforce the foreign keys (ondelete="cascade")
+        for chunk in chunked([word.id for word in words], _IN_CHUNK_SIZE):
+            days += session.execute(
+                select(DailyWord.day).where(DailyWord.word_id.in_(chunk))
+            ).scalars()
+            session.execute(delete(Result).where(Result.word_id.in_(chunk)))
+            session.execute(delete(DailyWord).where(DailyWord.word_id.in_(chunk)))
+            session.execute(delete(Word).where(Word.id.in_(chunk)))
+
+        _refill_daily_words(session, sorted(days))
+        changes.removed(words, deleted=True)
+
+    return len(words)
+
+
+def _refill_daily_words(session: OrmSession, days: Sequence[date]) -> None:
+    """Schedule new answers for the days of deleted words (see
+    daily.replacement), so every client fills them the same way."""
+
+    if not days:
+        return
+
+    words = _filter_words(session.query(Word.id, Word.word), False, False).all()
+    window = timedelta(days=my_globals.DAILY_NO_REPEAT_WINDOW)
+    created_at = datetime.utcnow()
+
+    for day in days:
+        recent = session.execute(
+            select(Word.word)
+            .join(DailyWord, DailyWord.word_id == Word.id)
+            .where(DailyWord.day.between(day - window, day + window))
+        ).scalars()
+        answer = daily.replacement(
+            [word for _, word in words], recent, my_globals.DAILY_SEED, day
+        )
+
+        if answer is None:
+            return
+
+        session.execute(
+            DailyWord.__table__.insert(),
+            {"day": day, "word_id": words[answer][0], "created_at": created_at},
+        )
+
+
+def delete_word(word_id: int, session: None | OrmSession = None) -> None:
     """Delete word by given word_id.
 
     :param word_id: ID of the word.
     :type word_id: int
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
-    with Session() as session:
-        word = session.query(Word).get(word_id)
-        session.delete(word)
-        session.commit()
+    delete_words([word_id], session=session)
+
+
+def _update_words(
+    session: OrmSession, word_ids: Sequence[int], **values: Any
+) -> list[Any]:
+    """Set values of the words with given ids by UPDATE ... WHERE id IN (...).
+
+    :return: Id and word of the updated words.
+    """
 
+    words = _words_of(session, word_ids)
 
-def set_enable(word_id: int, enable: bool) -> None:
+    for chunk in chunked([word.id for word in words], _IN_CHUNK_SIZE):
+        session.execute(update(Word).where(Word.id.in_(chunk)).values(**values))
+
+    return words
+
+
+def set_enable_many(
+    word_ids: Sequence[int], enable: bool, session: None | OrmSession = None
+) -> int:
+    """Set enable flag of many words (without loading the words).
+
+    :param word_ids: IDs of the words.
+    :type word_ids: Sequence[int]
+    :param enable: Enable flag
+    :type enable: bool
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :return: Number of existing words.
+    :rtype: int
+    :raise: ValueError
+    """
+
+    with _unit(session) as (session, changes):
+        words = _update_words(session, word_ids, enabled=enable)
+
+        if enable:
+            changes.added(words)
+        else:
+            changes.removed(words, deleted=False)
+
+    return len(words)
+
+
+def set_enable(word_id: int, enable: bool, session: None | OrmSession = None) -> None:
     """Set enable flag of word by given word_id.
 
     :param word_id: ID of the word.
     :type word_id: int
     :param enable: Enable flag
     :type enable: bool
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
-    with Session() as session:
-        word = session.query(Word).get(word_id)
-        word.enabled = enable
-        session.commit()
+    set_enable_many([word_id], enable, session=session)
+
+
+def set_nsfw_many(
+    word_ids: Sequence[int], is_nsfw: bool, session: None | OrmSession = None
+) -> int:
+    """Set nsfw flag of many words (without loading the words).
+
+    :param word_ids: IDs of the words.
+    :type word_ids: Sequence[int]
+    :param is_nsfw: NSFW flag
+    :type is_nsfw: bool
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :return: Number of existing words.
+    :rtype: int
+    :raise: ValueError
+    """
 
+    with _unit(session) as (session, changes):
+        words = _update_words(session, word_ids, nsfw=is_nsfw)
+        changes.changed(word.id for word in words)
 
-def set_nsfw(word_id: int, is_nsfw: bool) -> None:
+    return len(words)
+
+
+def set_nsfw(word_id: int, is_nsfw: bool, session: None | OrmSession = None) -> None:
     """Set nsfw flag of word by given word_id.
 
     :param word_id: ID of the word.
     :type word_id: int
     :param is_nsfw: NSFW flag
     :type is_nsfw: bool
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
     """
 
-    with Session() as session:
-        word = session.query(Word).get(word_id)
-        word.nsfw = is_nsfw
-        session.commit()
+    set_nsfw_many([word_id], is_nsfw, session=session)
+
+
+def set_weights(
+    weights: Mapping[str, float],
+    default: None | float = None,
+    session: None | OrmSession = None,
+) -> None:
+    """Set the weights of words (e.g. by corpus frequency) in one bulk update.
+
+    :param weights: Weight by word, words not in database are ignored.
+    :type weights: Mapping[str, float]
+    :param default: If not None, weight of all words not in weights.
+    :type default: None | float
+    :param session: Session of a unit of work (default: own unit of work).
+    :type session: None | sqlalchemy.orm.session.Session
+    :raise: ValueError
+    """
+
+    if any(weight < 0 for weight in weights.values()) or (default or 0) < 0:
+        raise ValueError("Weights must not be negative.")
+
+    table = Word.__table__
+
+    with _unit(session) as (session, changes):
+        if default is not None:
+            session.execute(table.update().values(weight=default))
+
+        if weights:
+            session.execute(
+                table.update()
+                .where(table.c.word == bindparam("_word"))
+                .values(weight=bindparam("_weight")),
+                [
+                    {"_word": upper(word), "_weight": weight}
+                    for word, weight in weights.items()
+                ],
+            )
+
+        changes.changed()
+
+
+def _random_word_id(
+    session: OrmSession,
+    allow_nsfw_words: bool,
+    allow_disabled_words: bool,
+    weighted: bool,
+) -> None | int:
+    """Draw a random word id with the cached ids (and alias table) of a filter."""
+
+    key = (allow_nsfw_words, allow_disabled_words)
+
+    if not weighted:
+        if key not in _word_ids:
+            query = _filter_words(
+                session.query(Word.id), allow_nsfw_words, allow_disabled_words
+            )
+            _word_ids[key] = array("q", (word_id for word_id, in query))
+
+        word_ids = _word_ids[key]
+
+        return random.choice(word_ids) if word_ids else None
+
+    if key not in _weighted_word_ids:
+        query = _filter_words(
+            session.query(Word.id, Word.weight).filter(Word.weight > 0),
+            allow_nsfw_words,
+            allow_disabled_words,
+        )
+        rows = query.all()
+        _weighted_word_ids[key] = (
+            array("q", (word_id for word_id, _ in rows)),
+            AliasTable([weight for _, weight in rows]) if rows else None,
+        )
+
+    word_ids, alias_table = _weighted_word_ids[key]
+
+    return word_ids[alias_table.sample()] if alias_table is not None else None
 
 
 def get_random_word(
     allow_nsfw_words: bool = True,
     allow_disabled_words: bool = False,
+    weighted: bool = False,
 ) -> None | Word:
     """Get a random word from database.
 
@@ -161,18 +933,228 @@ def get_random_word(
         will be considered.
         If allow_disabled_words is False (default), disabled words
         will be ignored.
+
+        If weighted is True, words are drawn proportional to their weight
+        (see set_weights) in O(1) with an alias table, that is rebuilt only
+        if weights or flags changed.
     :rtype: None | Word
     """
 
     with Session() as session:
-        query = session.query(Word)
+        for _ in range(2):
+            word_id = _random_word_id(
+                session, allow_nsfw_words, allow_disabled_words, weighted
+            )
+
+            if word_id is None:
+                return None
+
+            word = session.query(Word).get(word_id)
+
+            if (
+                word is not None
+                and (allow_nsfw_words or not word.nsfw)
+                and (allow_disabled_words or word.enabled)
+            ):
+                return word
+
+            # word was changed by another process, reload ids and try again
+            invalidate_caches()
+
+    return None
+
+
+def draw_word(
+    allow_nsfw_words: bool = True,
+    allow_disabled_words: bool = False,
+) -> None | Word:
+    """Draw the next word from the deck of the filter (no repeats).
+
+    The deck is a shuffled permutation of the eligible words, that is stored
+    in database with a cursor, so answers repeat only after all eligible words
+    were drawn. The deck is reshuffled with the next seed, if it is exhausted.
+
+    :return:
+        The next word record of the deck or None, if no word is eligible.
+        The filters allow_nsfw_words and allow_disabled_words work the same
+        way as in get_random_word.
+    :rtype: None | Word
+    """
+
+    with Session(expire_on_commit=False) as session:
+        deck = (
+            session.query(Deck)
+            .filter_by(
+                allow_nsfw_words=allow_nsfw_words,
+                allow_disabled_words=allow_disabled_words,
+            )
+            .one_or_none()
+        )
+
+        if deck is None:
+            deck = Deck(
+                allow_nsfw_words=allow_nsfw_words,
+                allow_disabled_words=allow_disabled_words,
+                seed=random.randrange(2**31),
+            )
+            session.add(deck)
+            _shuffle_deck(session, deck)
+
+        word = None
+        reshuffled = False
+
+        while word is None:
+            if deck.cursor >= deck.size:
+                if reshuffled:
+                    break
 
-        if not allow_nsfw_words:
-            query = query.filter(Word.nsfw.is_(False))
+                deck.seed = (deck.seed + 1) % 2**31
+                _shuffle_deck(session, deck)
+                reshuffled = True
+                continue
 
-        if not allow_disabled_words:
-            query = query.filter(Word.enabled.is_(True))
+            # read only the id at the cursor, not the whole deck
+            offset = deck.cursor * _DECK_ITEM_SIZE + 1
+            data = (
+                session.query(func.substr(Deck.word_ids, offset, _DECK_ITEM_SIZE))
+                .filter(Deck.id == deck.id)
+                .scalar()
+            )
+            deck.cursor += 1
+            word = session.query(Word).get(_unpack_ids(data)[0])
+
+            if word is not None and not (
+                (allow_nsfw_words or not word.nsfw)
+                and (allow_disabled_words or word.enabled)
+            ):
+                # word was changed by another process
+                word = None
+
+        session.commit()
+
+    return word
+
+
+def get_words(
+    allow_nsfw_words: bool = True,
+    allow_disabled_words: bool = False,
+) -> list[Word]:
+    """Get all words from database ordered by id.
 
-        word = query.order_by(func.random()).first()
+    :return:
+        All word records, that are enabled and nsfw flag will
+        be ignored (default).
+        The filters allow_nsfw_words and allow_disabled_words work the same
+        way as in get_random_word.
+    :rtype: list[Word]
+    """
+
+    with Session() as session:
+        query = _filter_words(
+            session.query(Word), allow_nsfw_words, allow_disabled_words
+        )
+        words = query.order_by(Word.id).all()
+
+    return words
+
+
+def export_word_pack(path: None | Path = None) -> Path:
+    """Export all words with flags and weights as binary word pack.
+
+    The pack is the read-only runtime backend of word_pack (exist and random
+    words without SQLAlchemy).
+
+    :param path: Path of the word pack (default: next to database).
+    :type path: None | pathlib.Path
+    :return: Path of the written word pack.
+    :rtype: pathlib.Path
+    """
+
+    with Session() as session:
+        words = [
+            word_pack.PackedWord(
+                word_id, upper(text), bool(enabled), bool(nsfw), weight
+            )
+            for word_id, text, enabled, nsfw, weight in session.query(
+                Word.id, Word.word, Word.enabled, Word.nsfw, Word.weight
+            )
+        ]
+
+    return word_pack.write(words, path)
+
+
+def build_daily_schedule(
+    start: None | date = None,
+    days: None | int = None,
+    seed: None | int | str = None,
+    window: None | int = None,
+) -> int:
+    """Precompute the daily-challenge answers (replaces days from start on).
+
+    The answers are drawn deterministically (see daily.schedule) from the
+    enabled, non-nsfw words, so every client with the same words gets the
+    same schedule. The defaults are defined in my_globals.
+
+    :param start: First day of the schedule.
+    :type start: None | datetime.date
+    :param days: Number of days.
+    :type days: None | int
+    :param seed: Seed of the schedule.
+    :type seed: None | int | str
+    :param window: Minimum number of days between two occurrences of a word.
+    :type window: None | int
+    :return: Number of scheduled days.
+    :rtype: int
+    :raise: ValueError
+    """
+
+    start = start or my_globals.DAILY_START
+    days = my_globals.DAILY_DAYS if days is None else days
+    seed = my_globals.DAILY_SEED if seed is None else seed
+    window = my_globals.DAILY_NO_REPEAT_WINDOW if window is None else window
+    table = DailyWord.__table__
+    created_at = datetime.utcnow()
+
+    with Session() as session:
+        query = _filter_words(session.query(Word.id, Word.word), False, False)
+        words = query.all()
+        answers = daily.schedule([word for _, word in words], days, seed, window)
+
+        session.execute(table.delete().where(table.c.day >= start))
+
+        if answers:
+            session.execute(
+                table.insert(),
+                [
+                    {
+                        "day": start + timedelta(days=offset),
+                        "word_id": words[answer][0],
+                        "created_at": created_at,
+                    }
+                    for offset, answer in enumerate(answers)
+                ],
+            )
+
+        session.commit()
+
+    return len(answers)
+
+
+def get_daily_word(day: None | date = None) -> None | Word:
+    """Get the answer of the daily challenge (see build_daily_schedule).
+
+    :param day: The day (default: today).
+    :type day: None | datetime.date
+    :return: The word of the day or None, if the day is not scheduled.
+    :rtype: None | Word
+    """
+
+    with Session() as session:
+        word = (
+            session.query(Word)
+            .join(DailyWord, DailyWord.word_id == Word.id)
+            .filter(DailyWord.day == (day or date.today()))
+            .one_or_none()
+        )
 
     return word
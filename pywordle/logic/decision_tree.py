@@ -0,0 +1,446 @@
+"""
+Precomputed decision tree (opening book) for a chosen opener.
+
+For every feedback pattern the best next guess (most expected information)
+is stored recursively until every answer is solved. The first level
+subtrees are solved in parallel and checkpointed, so an interrupted build
+resumes with the missing subtrees only.
+
+File layout (little endian):
+
+    header      magic (4s), format version (H), padding, word count n (I),
+                opener (I)
+    word ids    n x int64
+    codes       n x 5 x uint8, letter codes of the words (see letter_codes)
+    table       243 x (offset (Q), length (I)) of the first level subtrees,
+                length 0 = no subtree
+    subtrees    node = guess (I), number of children (B),
+                children = pattern (B), node
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle import my_globals
+from pywordle.logic.codec import ALPHABET, WORD_LENGTH, letter_codes
+from pywordle.logic.helper import upper
+from pywordle.logic.hints import best_guess
+from pywordle.logic.pattern_matrix import PatternMatrix, rows_of
+from pywordle.logic.scoring import ALL_CORRECT, PATTERN_COUNT, score_matrix
+from pywordle.model.models import Word
+
+MAGIC = b"PWDT"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxII")
+_TABLE_ENTRY = struct.Struct("<QI")
+_NODE = struct.Struct("<IB")
+
+
+def default_path() -> Path:
+    """Get the path of the decision tree file next to the database.
+
+    :return: Path of the decision tree file.
+    :rtype: pathlib.Path
+    """
+
+    return my_globals.WORKING_DIR / my_globals.DECISION_TREE_FILE
+
+
+class DecisionNode(NamedTuple):
+    """Next guess (index of word) and subtrees by feedback pattern."""
+
+    guess: int
+    children: dict[int, DecisionNode]
+
+
+class PatternSource:  # pylint: disable=too-few-public-methods
+    """Feedback patterns of all guesses, precomputed or scored on the fly.
+
+    The rows of the words in the pattern matrix come from rows_of, if they
+    are None, the patterns are scored on the fly from the letter codes.
+    """
+
+    def __init__(
+        self,
+        codes: npt.NDArray[np.uint8],
+        matrix_path: None | Path = None,
+        rows: None | npt.NDArray[np.int64] = None,
+    ) -> None:
+        self.codes = codes
+        self.rows = rows
+        self.matrix = None if rows is None else PatternMatrix(matrix_path).matrix
+
+    def patterns(self, answers: npt.NDArray[np.int64]) -> npt.NDArray[np.uint8]:
+        """Get the patterns of all guesses (rows) for given answers (columns).
+
+        :param answers: Indices of the answers.
+        :type answers: numpy.ndarray[numpy.int64]
+        :return: Feedback patterns, row = guess, column = answer.
+        :rtype: numpy.ndarray[numpy.uint8]
+        """
+
+        if self.matrix is not None and self.rows is not None:
+            return np.asarray(self.matrix[np.ix_(self.rows, self.rows[answers])])
+
+        return score_matrix(self.codes, self.codes[answers])
+
+    def row(self, guess: int, answers: npt.NDArray[np.int64]) -> npt.NDArray[np.uint8]:
+        """Get the patterns of one guess for given answers.
+
+        :param guess: Index of the guess.
+        :type guess: int
+        :param answers: Indices of the answers.
+        :type answers: numpy.ndarray[numpy.int64]
+        :return: Feedback patterns for every answer.
+        :rtype: numpy.ndarray[numpy.uint8]
+        """
+
+        if self.matrix is not None and self.rows is not None:
+            return np.asarray(self.matrix[self.rows[guess], self.rows[answers]])
+
+        return score_matrix(self.codes[[guess]], self.codes[answers])[0]
+
+
+def _split(
+    source: PatternSource, answers: npt.NDArray[np.int64]
+) -> tuple[int, npt.NDArray[np.uint8]]:
+    """Get the best guess for answers and its patterns (greedy by entropy)."""
+
+    patterns = source.patterns(answers)
+    guess, entropy = best_guess(patterns, answers)
+
+    if entropy == 0.0 and guess not in answers:
+        # no guess splits the answers, but guessing an answer always does
+        guess = int(answers[0])
+
+    return guess, patterns[guess]
+
+
+def solve(source: PatternSource, answers: npt.NDArray[np.int64]) -> DecisionNode:
+    """Build the subtree, that solves all given answers (greedy by entropy).
+
+    :param source: Feedback patterns of all guesses.
+    :type source: PatternSource
+    :param answers: Indices of the answers still possible.
+    :type answers: numpy.ndarray[numpy.int64]
+    :return: The subtree.
+    :rtype: DecisionNode
+    """
+
+    if len(answers) == 1:
+        return DecisionNode(int(answers[0]), {})
+
+    guess, row = _split(source, answers)
+    children = {
+        int(pattern): solve(source, answers[row == pattern])
+        for pattern in np.unique(row)
+        if pattern != ALL_CORRECT
+    }
+
+    return DecisionNode(guess, children)
+
+
+def total_guesses(source: PatternSource, answers: npt.NDArray[np.int64]) -> int:
+    """Get the number of guesses to solve every answer (greedy by entropy).
+
+    :param source: Feedback patterns of all guesses.
+    :type source: PatternSource
+    :param answers: Indices of the answers still possible.
+    :type answers: numpy.ndarray[numpy.int64]
+    :return: Sum of the guesses needed for every answer.
+    :rtype: int
+    """
+
+    if len(answers) == 1:
+        return 1
+
+    guess, row = _split(source, answers)
+
+    # every answer needs this guess
+    return len(answers) + sum(
+        total_guesses(source, answers[row == pattern])
+        for pattern in np.unique(row)
+        if pattern != ALL_CORRECT
+    )
+
+
+def _encode(node: DecisionNode, data: bytearray) -> None:
+    data += _NODE.pack(node.guess, len(node.children))
+
+    for pattern, child in sorted(node.children.items()):
+        data.append(pattern)
+        _encode(child, data)
+
+
+def _decode(data: bytes | mmap.mmap, offset: int) -> tuple[DecisionNode, int]:
+    guess, child_count = _NODE.unpack_from(data, offset)
+    offset += _NODE.size
+    children = {}
+
+    for _ in range(child_count):
+        pattern = data[offset]
+        children[pattern], offset = _decode(data, offset + 1)
+
+    return DecisionNode(guess, children), offset
+
+
+def _solve_bucket(
+    codes: npt.NDArray[np.uint8],
+    matrix_path: None | Path,
+    rows: None | npt.NDArray[np.int64],
+    answers: npt.NDArray[np.int64],
+) -> bytes:
+    """Solve a first level subtree and return it encoded (worker task)."""
+
+    data = bytearray()
+    _encode(solve(PatternSource(codes, matrix_path, rows), answers), data)
+
+    return bytes(data)
+
+
+class _Checkpoint:
+    """Directory with the already solved first level subtrees of a build."""
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.directory = path.with_name(f"{path.name}.parts")
+        fingerprint_file = self.directory / "fingerprint"
+
+        if self.directory.exists() and (
+            not fingerprint_file.exists()
+            or fingerprint_file.read_text(encoding="utf8") != fingerprint
+        ):
+            # checkpoint of another word list or opener
+            shutil.rmtree(self.directory)
+
+        self.directory.mkdir(exist_ok=True)
+        fingerprint_file.write_text(fingerprint, encoding="utf8")
+
+    def _part(self, pattern: int) -> Path:
+        return self.directory / f"{pattern}.bin"
+
+    def load(self, pattern: int) -> None | bytes:
+        """Get the solved subtree of pattern or None."""
+
+        part = self._part(pattern)
+
+        return part.read_bytes() if part.exists() else None
+
+    def save(self, pattern: int, data: bytes) -> None:
+        """Save the solved subtree of pattern."""
+
+        tmp_part = self.directory / f"{pattern}.tmp"
+        tmp_part.write_bytes(data)
+        os.replace(tmp_part, self._part(pattern))
+
+    def remove(self) -> None:
+        """Remove the checkpoint directory."""
+
+        shutil.rmtree(self.directory)
+
+
+def build(  # pylint: disable=too-many-locals
+    words: Sequence[Word],
+    opener: str,
+    path: None | Path = None,
+    matrix_path: None | Path = None,
+    processes: None | int = None,
+) -> Path:
+    """Build the decision tree for opener and write the decision tree file.
+
+    The first level subtrees (one per feedback pattern of the opener) are
+    solved in a process pool. Solved subtrees are checkpointed next to the
+    file, an interrupted build resumes with the missing subtrees.
+
+    :param words: Guesses and answers (e.g. db_manager.get_words()).
+    :type words: Sequence[Word]
+    :param opener: The first guess.
+    :type opener: str
+    :param path: Path of the decision tree file (default: next to database).
+    :type path: None | pathlib.Path
+    :param matrix_path: Path of the pattern matrix file (default: next to
+        database), patterns are scored on the fly, if it is not current.
+    :type matrix_path: None | pathlib.Path
+    :param processes: Number of worker processes (default: number of CPUs).
+    :type processes: None | int
+    :return: Path of the written decision tree file.
+    :rtype: pathlib.Path
+    :raise: ValueError
+    """
+
+    path = path or default_path()
+    texts = [upper(word.word) for word in words]
+
+    try:
+        opener_index = texts.index(upper(opener))
+    except ValueError as error:
+        raise ValueError(f"Opener '{opener}' is not in the word list.") from error
+
+    ids = np.array([word.id for word in words], dtype="<i8")
+    codes = letter_codes(texts)
+    rows = rows_of(words, matrix_path)
+    opener_row = PatternSource(codes, matrix_path, rows).row(
+        opener_index, np.arange(len(words))
+    )
+
+    fingerprint = hashlib.sha256(
+        ids.tobytes() + codes.tobytes() + struct.pack("<I", opener_index)
+    ).hexdigest()
+    checkpoint = _Checkpoint(path, fingerprint)
+
+    buckets = {
+        int(pattern): np.flatnonzero(opener_row == pattern)
+        for pattern in np.unique(opener_row)
+        if pattern != ALL_CORRECT
+    }
+    subtrees = {pattern: checkpoint.load(pattern) for pattern in buckets}
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(_solve_bucket, codes, matrix_path, rows, answers): pattern
+            for pattern, answers in buckets.items()
+            if subtrees[pattern] is None
+        }
+
+        for future in as_completed(futures):
+            pattern = futures[future]
+            subtrees[pattern] = future.result()
+            checkpoint.save(pattern, future.result())
+
+    table = bytearray()
+    offset = _HEADER.size + ids.nbytes + codes.nbytes
+    offset += PATTERN_COUNT * _TABLE_ENTRY.size
+
+    for pattern in range(PATTERN_COUNT):
+        length = len(subtrees.get(pattern) or b"")
+        table += _TABLE_ENTRY.pack(offset if length else 0, length)
+        offset += length
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+
+    with open(tmp_path, mode="wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(words), opener_index))
+        file.write(ids.tobytes())
+        file.write(codes.tobytes())
+        file.write(table)
+
+        for pattern in range(PATTERN_COUNT):
+            file.write(subtrees.get(pattern) or b"")
+
+    os.replace(tmp_path, path)
+    checkpoint.remove()
+
+    return path
+
+
+class DecisionTree:
+    """Read-only decision tree, subtrees are loaded on first access."""
+
+    def __init__(self, path: None | Path = None) -> None:
+        self.path = path or default_path()
+
+        with open(self.path, mode="rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._data) < _HEADER.size:
+            raise ValueError(f"Invalid decision tree file: {self.path}")
+
+        magic, version, count, opener = _HEADER.unpack_from(self._data)
+
+        if magic != MAGIC:
+            raise ValueError(f"Invalid decision tree file: {self.path}")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported decision tree version {version} "
+                f"(expected {FORMAT_VERSION}): {self.path}"
+            )
+
+        self._count = count
+        self._opener = opener
+        self._ids_offset = _HEADER.size
+        self._codes_offset = self._ids_offset + 8 * count
+        self._table_offset = self._codes_offset + WORD_LENGTH * count
+        self._subtrees: dict[int, None | DecisionNode] = {}
+
+    def word(self, index: int) -> str:
+        """Get the word with given index.
+
+        :param index: Index of the word (e.g. DecisionNode.guess).
+        :type index: int
+        :return: The word.
+        :rtype: str
+        """
+
+        offset = self._codes_offset + WORD_LENGTH * index
+        codes = self._data[offset : offset + WORD_LENGTH]
+
+        return "".join(ALPHABET[code] for code in codes)
+
+    def word_id(self, index: int) -> int:
+        """Get the id of the word with given index.
+
+        :param index: Index of the word (e.g. DecisionNode.guess).
+        :type index: int
+        :return: ID of the word.
+        :rtype: int
+        """
+
+        return struct.unpack_from("<q", self._data, self._ids_offset + 8 * index)[0]
+
+    @property
+    def opener(self) -> str:
+        """The first guess of the decision tree."""
+
+        return self.word(self._opener)
+
+    def subtree(self, pattern: int) -> None | DecisionNode:
+        """Get (and load on first access) the subtree after the opener.
+
+        :param pattern: Feedback pattern of the opener.
+        :type pattern: int
+        :return: The subtree or None, if the pattern is not possible.
+        :rtype: None | DecisionNode
+        """
+
+        if pattern not in self._subtrees:
+            offset, length = _TABLE_ENTRY.unpack_from(
+                self._data, self._table_offset + pattern * _TABLE_ENTRY.size
+            )
+            self._subtrees[pattern] = _decode(self._data, offset)[0] if length else None
+
+        return self._subtrees[pattern]
+
+    def next_guess(self, patterns: Sequence[int]) -> None | str:
+        """Get the next guess after the given feedback patterns.
+
+        :param patterns: Feedback patterns of the guesses so far, the first
+            pattern is the feedback of the opener.
+        :type patterns: Sequence[int]
+        :return: The next guess or None, if the patterns are not possible.
+        :rtype: None | str
+        """
+
+        if not patterns:
+            return self.opener
+
+        node = self.subtree(patterns[0])
+
+        for pattern in patterns[1:]:
+            if node is None:
+                return None
+
+            node = node.children.get(pattern)
+
+        return None if node is None else self.word(node.guess)
@@ -0,0 +1,64 @@
+"""
+Advisory locks of open files between processes.
+
+fcntl.flock on POSIX, msvcrt.locking (first byte) on Windows. The lock is
+held until unlock or until the file is closed.
+"""
+
+from __future__ import annotations
+
+from typing import IO, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment] # pylint: disable=invalid-name
+    import msvcrt
+
+
+def lock(file: IO[Any], blocking: bool = True) -> bool:
+    """Lock an open file exclusively.
+
+    :param file: The open file.
+    :type file: IO[Any]
+    :param blocking: If True, wait for the lock, if False, return at once.
+    :type blocking: bool
+    :return: True, if the file is locked, False, if another file object (of
+        this or another process) holds the lock.
+    :rtype: bool
+    """
+
+    try:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(file.fileno(), flags)
+        else:
+            position = file.seek(0, 1)
+            file.seek(0)
+            msvcrt.locking(
+                file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+            )
+            file.seek(position)
+    except OSError:
+        if blocking:
+            raise
+
+        return False
+
+    return True
+
+
+def unlock(file: IO[Any]) -> None:
+    """Release the lock of an open file.
+
+    :param file: The open file.
+    :type file: IO[Any]
+    """
+
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        position = file.seek(0, 1)
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        file.seek(position)
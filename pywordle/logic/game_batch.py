@@ -0,0 +1,106 @@
+"""
+Struct-of-arrays engine for many concurrent games.
+
+All games of a batch share one word list. Answers and guesses are indices
+in this word list, the state of every game lives in NumPy arrays instead of
+a Python object per game.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle.logic.scoring import ALL_CORRECT, letter_codes, score_pairs
+from pywordle.model.models import Word
+from pywordle.my_globals import MAX_RUNS
+
+# pattern of a game, that did not take part in a step
+NO_PATTERN = 255
+
+
+class GameBatch:
+    """Many games in NumPy arrays, advanced together by step."""
+
+    def __init__(self, words: Sequence[Word], answers: Sequence[int]) -> None:
+        self.words = list(words)
+        self.codes = letter_codes([word.word for word in self.words])
+
+        count = len(answers)
+        self.answers = np.asarray(answers, dtype=np.uint32)
+        self.runs = np.zeros(count, dtype=np.uint8)
+        self.guesses = np.zeros((count, MAX_RUNS), dtype=np.uint32)
+        self.patterns = np.zeros((count, MAX_RUNS), dtype=np.uint8)
+        self.done = np.zeros(count, dtype=bool)
+        self.won = np.zeros(count, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def step(self, guess_ids: Sequence[int]) -> npt.NDArray[np.uint8]:
+        """Score the guess of every game and advance all running games.
+
+        :param guess_ids: Index of the guessed word for every game, ignored
+            for finished games.
+        :type guess_ids: Sequence[int]
+        :return: Feedback pattern for every game (NO_PATTERN for finished
+            games).
+        :rtype: numpy.ndarray[numpy.uint8]
+        :raise: ValueError
+        """
+
+        guess_ids = np.asarray(guess_ids, dtype=np.uint32)
+
+        if guess_ids.shape != self.answers.shape:
+            raise ValueError(f"Exact {len(self)} guesses required.")
+
+        games = np.flatnonzero(~self.done)
+        guesses = guess_ids[games]
+        runs = self.runs[games]
+
+        patterns = score_pairs(self.codes[guesses], self.codes[self.answers[games]])
+
+        self.guesses[games, runs] = guesses
+        self.patterns[games, runs] = patterns
+        self.runs[games] += 1
+        self.won[games] = patterns == ALL_CORRECT
+        self.done[games] = self.won[games] | (self.runs[games] >= MAX_RUNS)
+
+        result = np.full(len(self), NO_PATTERN, dtype=np.uint8)
+        result[games] = patterns
+
+        return result
+
+    def restart(self, games: Sequence[int], answers: Sequence[int]) -> None:
+        """Start new games in the given slots (e.g. finished games).
+
+        :param games: Slots of the games to restart.
+        :type games: Sequence[int]
+        :param answers: Index of the new answer for every slot.
+        :type answers: Sequence[int]
+        """
+
+        games = np.asarray(games, dtype=np.int64)
+
+        self.answers[games] = answers
+        self.runs[games] = 0
+        self.guesses[games] = 0
+        self.patterns[games] = 0
+        self.done[games] = False
+        self.won[games] = False
+
+    def history(self, game: int) -> list[tuple[str, int]]:
+        """Get the guessed words and feedback patterns of one game.
+
+        :param game: Slot of the game.
+        :type game: int
+        :return: Pairs of guessed word and feedback pattern.
+        :rtype: list[tuple[str, int]]
+        """
+
+        return [
+            (self.words[self.guesses[game, run]].word, int(self.patterns[game, run]))
+            for run in range(self.runs[game])
+        ]
@@ -0,0 +1,255 @@
+"""
+Entropy based hint engine.
+
+Every possible guess is ranked by the expected information (entropy in bits)
+of its feedback pattern over the answers still possible. The ranking runs in
+worker processes and the best guess so far is streamed as chunks complete.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import AsyncIterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle.logic.pattern_matrix import PatternMatrix, default_path, rows_of
+from pywordle.logic.scoring import PATTERN_COUNT, letter_codes, score_matrix
+from pywordle.model.models import Word
+
+# number of guesses ranked by one worker task
+CHUNK_SIZE = 512
+
+# number of guess x answer patterns counted at once by expected_entropy
+_ENTROPY_CHUNK_SIZE = 1 << 20
+
+# preferred, if a guess can be the answer and has (nearly) the same entropy
+_CANDIDATE_BONUS = 1e-6
+
+
+def expected_entropy(patterns: npt.NDArray[np.uint8]) -> npt.NDArray[np.float64]:
+    """Get the expected information of every guess (row) over the answers.
+
+    :param patterns: Feedback patterns, row = guess, column = answer.
+    :type patterns: numpy.ndarray[numpy.uint8]
+    :return: Entropy in bits for every row.
+    :rtype: numpy.ndarray[numpy.float64]
+    """
+
+    rows, answers = patterns.shape
+    entropies = np.zeros(rows)
+
+    if not answers:
+        return entropies
+
+    # counted in blocks of rows, so the int32 bins stay small for many answers
+    rows_per_chunk = max(1, _ENTROPY_CHUNK_SIZE // answers)
+    offsets = np.arange(rows_per_chunk, dtype=np.int32)[:, None] * PATTERN_COUNT
+
+    for start in range(0, rows, rows_per_chunk):
+        chunk = patterns[start : start + rows_per_chunk]
+        counts = np.bincount(
+            (chunk + offsets[: len(chunk)]).ravel(),
+            minlength=len(chunk) * PATTERN_COUNT,
+        ).reshape(len(chunk), PATTERN_COUNT)
+
+        probabilities = counts / answers
+        log_probabilities = np.log2(
+            probabilities, out=np.zeros_like(probabilities), where=counts > 0
+        )
+        entropies[start : start + len(chunk)] = -(
+            probabilities * log_probabilities
+        ).sum(axis=1)
+
+    return entropies
+
+
+def best_guess(
+    patterns: npt.NDArray[np.uint8], answers: Sequence[int]
+) -> tuple[int, float]:
+    """Get the guess (row) with the most expected information.
+
+    If guesses have the same entropy, a guess that can be the answer wins.
+
+    :param patterns: Feedback patterns, row = guess, column = answer.
+    :type patterns: numpy.ndarray[numpy.uint8]
+    :param answers: Rows of the guesses, that are possible answers.
+    :type answers: Sequence[int]
+    :return: Row of the best guess and its entropy in bits.
+    :rtype: tuple[int, float]
+    """
+
+    return _best_of(expected_entropy(patterns), answers)
+
+
+def best_scored_guess(
+    codes: npt.NDArray[np.uint8], answers: Sequence[int]
+) -> tuple[int, float]:
+    """Get the guess with the most expected information (see best_guess).
+
+    The guesses are scored on the fly in chunks of CHUNK_SIZE rows, so the
+    patterns of all guesses never exist at once.
+
+    :param codes: Letter codes of the guesses (see letter_codes).
+    :type codes: numpy.ndarray[numpy.uint8]
+    :param answers: Rows of the guesses, that are possible answers.
+    :type answers: Sequence[int]
+    :return: Row of the best guess and its entropy in bits.
+    :rtype: tuple[int, float]
+    """
+
+    answer_codes = codes[np.asarray(answers, dtype=np.int64)]
+    entropies = np.zeros(len(codes))
+
+    for start in range(0, len(codes), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        entropies[start:stop] = _rank_codes(codes[start:stop], answer_codes)
+
+    return _best_of(entropies, answers)
+
+
+def _best_of(
+    entropies: npt.NDArray[np.float64], answers: Sequence[int]
+) -> tuple[int, float]:
+    """Get the row with the highest entropy, possible answers win ties."""
+
+    ranks = entropies.copy()
+    ranks[np.asarray(answers, dtype=np.int64)] += _CANDIDATE_BONUS
+    row = int(np.argmax(ranks))
+
+    return row, float(entropies[row])
+
+
+def _rank_matrix_rows(  # pylint: disable=too-many-arguments
+    path: Path,
+    rows: npt.NDArray[np.int64],
+    columns: npt.NDArray[np.int64],
+    guess_ids: npt.NDArray[np.int64],
+    answer_ids: npt.NDArray[np.int64],
+    guess_codes: npt.NDArray[np.uint8],
+    answer_codes: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.float64]:
+    """Rank guesses with the precomputed patterns (worker task).
+
+    The file may have changed since the rows were looked up (e.g. compacted
+    or rebuilt), then the rows do not hold the words any more and the
+    guesses are scored on the fly.
+    """
+
+    try:
+        matrix = PatternMatrix(path)
+    except (FileNotFoundError, ValueError):
+        return _rank_codes(guess_codes, answer_codes)
+
+    if matrix.stale or not (
+        _holds(matrix, rows, guess_ids) and _holds(matrix, columns, answer_ids)
+    ):
+        return _rank_codes(guess_codes, answer_codes)
+
+    return expected_entropy(matrix.matrix[np.ix_(rows, columns)])
+
+
+def _holds(
+    matrix: PatternMatrix, rows: npt.NDArray[np.int64], ids: npt.NDArray[np.int64]
+) -> bool:
+    """Check if the rows of matrix hold the living words with given ids."""
+
+    if len(rows) and rows.max() >= matrix.count:
+        return False
+
+    return bool(np.array_equal(matrix.ids[rows], ids) and matrix.alive[rows].all())
+
+
+def _rank_codes(
+    guess_codes: npt.NDArray[np.uint8], answer_codes: npt.NDArray[np.uint8]
+) -> npt.NDArray[np.float64]:
+    """Rank guesses by scoring them on the fly (worker task)."""
+
+    return expected_entropy(score_matrix(guess_codes, answer_codes))
+
+
+class HintEngine:  # pylint: disable=too-few-public-methods
+    """Ranks all guesses by expected entropy over the remaining answers."""
+
+    def __init__(self, guesses: Sequence[Word], matrix_path: None | Path = None):
+        self.guesses = list(guesses)
+        self._codes = letter_codes([word.word for word in self.guesses])
+        self._ids = np.array([word.id for word in self.guesses], dtype=np.int64)
+        self._matrix_path = matrix_path or default_path()
+
+        # without usable pattern matrix, patterns are scored on the fly (the
+        # workers check the rows against the ids, see _rank_matrix_rows)
+        self._rows = rows_of(self.guesses, self._matrix_path)
+
+    async def best_guesses(
+        self, executor: Executor, answers: Sequence[int]
+    ) -> AsyncIterator[tuple[Word, float]]:
+        """Rank all guesses and yield the best guess so far after every chunk.
+
+        :param executor: Executor for the ranking tasks (e.g. process pool).
+        :type executor: concurrent.futures.Executor
+        :param answers: Indices (in guesses) of the answers still possible.
+        :type answers: Sequence[int]
+        :return: Async iterator of best guess so far and its entropy in bits.
+        :rtype: AsyncIterator[tuple[Word, float]]
+        """
+
+        answer_indices = np.asarray(answers, dtype=np.int64)
+
+        if len(answer_indices) == 0:
+            return
+
+        if len(answer_indices) <= 2:
+            yield self.guesses[answer_indices[0]], float(len(answer_indices) - 1)
+            return
+
+        loop = asyncio.get_event_loop()
+        is_answer = np.zeros(len(self.guesses), dtype=bool)
+        is_answer[answer_indices] = True
+
+        async def rank(start: int) -> tuple[int, npt.NDArray[np.float64]]:
+            stop = start + CHUNK_SIZE
+
+            if self._rows is not None:
+                entropies = await loop.run_in_executor(
+                    executor,
+                    _rank_matrix_rows,
+                    self._matrix_path,
+                    self._rows[start:stop],
+                    self._rows[answer_indices],
+                    self._ids[start:stop],
+                    self._ids[answer_indices],
+                    self._codes[start:stop],
+                    self._codes[answer_indices],
+                )
+            else:
+                entropies = await loop.run_in_executor(
+                    executor,
+                    _rank_codes,
+                    self._codes[start:stop],
+                    self._codes[answer_indices],
+                )
+
+            return start, entropies
+
+        best_index = -1
+        best_rank = -1.0
+        best_entropy = 0.0
+
+        for next_result in asyncio.as_completed(
+            [rank(start) for start in range(0, len(self.guesses), CHUNK_SIZE)]
+        ):
+            start, entropies = await next_result
+            candidates = is_answer[start : start + len(entropies)]
+            ranks = entropies + candidates * _CANDIDATE_BONUS
+            chunk_best = int(np.argmax(ranks))
+
+            if ranks[chunk_best] > best_rank:
+                best_index = start + chunk_best
+                best_rank = float(ranks[chunk_best])
+                best_entropy = float(entropies[chunk_best])
+
+            yield self.guesses[best_index], best_entropy
@@ -0,0 +1,212 @@
+"""
+Exhaustive best-opener search.
+
+Every word is evaluated as first guess by the expected number of remaining
+candidates, the worst case (largest bucket) and the average number of
+guesses with a greedy follow-up (see decision_tree.total_guesses). The
+openers are sharded over a process pool and every finished shard is
+checkpointed in a sidecar SQLite database, so an interrupted run resumes.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.sql import insert, select
+
+from pywordle import my_globals
+from pywordle.logic.decision_tree import PatternSource, total_guesses
+from pywordle.logic.pattern_matrix import rows_of
+from pywordle.logic.scoring import ALL_CORRECT, letter_codes
+from pywordle.model.models import Word
+
+# number of openers evaluated by one worker task
+SHARD_SIZE = 16
+
+meta = MetaData()
+
+opener_scores = Table(
+    "opener_scores",
+    meta,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("word_id", Integer, primary_key=True),
+    Column("word", String(5), nullable=False),
+    Column("expected_remaining", Float, nullable=False),
+    Column("worst_case", Integer, nullable=False),
+    Column("average_depth", Float, nullable=True),
+)
+
+
+class OpenerScore(NamedTuple):
+    """Evaluation of one opener."""
+
+    word_id: int
+    word: str
+    expected_remaining: float
+    worst_case: int
+    average_depth: None | float
+
+
+def _score_shard(
+    codes: npt.NDArray[np.uint8],
+    matrix_path: None | Path,
+    rows: None | npt.NDArray[np.int64],
+    openers: list[int],
+    with_depth: bool,
+) -> list[tuple[int, float, int, None | float]]:
+    """Evaluate the openers of a shard (worker task)."""
+
+    source = PatternSource(codes, matrix_path, rows)
+    answers = np.arange(len(codes))
+    results = []
+
+    for opener in openers:
+        row = source.row(opener, answers)
+        bucket_sizes = np.bincount(row)
+
+        expected_remaining = float((bucket_sizes**2).sum() / len(answers))
+        worst_case = int(bucket_sizes.max())
+        average_depth = None
+
+        if with_depth:
+            guesses = len(answers) + sum(
+                total_guesses(source, answers[row == pattern])
+                for pattern in np.unique(row)
+                if pattern != ALL_CORRECT
+            )
+            average_depth = guesses / len(answers)
+
+        results.append((opener, expected_remaining, worst_case, average_depth))
+
+    return results
+
+
+def rank(scores: Sequence[OpenerScore]) -> list[OpenerScore]:
+    """Sort opener scores, the best opener first.
+
+    :param scores: Opener scores.
+    :type scores: Sequence[OpenerScore]
+    :return: Opener scores sorted by expected remaining candidates, worst case
+        and average depth.
+    :rtype: list[OpenerScore]
+    """
+
+    return sorted(
+        scores,
+        key=lambda score: (
+            score.expected_remaining,
+            score.worst_case,
+            score.average_depth if score.average_depth is not None else np.inf,
+            score.word,
+        ),
+    )
+
+
+def find_openers(  # pylint: disable=too-many-arguments,too-many-locals
+    words: Sequence[Word],
+    checkpoint_url: None | str = None,
+    matrix_path: None | Path = None,
+    processes: None | int = None,
+    with_depth: bool = True,
+) -> list[OpenerScore]:
+    """Evaluate every word as opener against all words as answers.
+
+    :param words: Openers and answers (e.g. db_manager.get_words()).
+    :type words: Sequence[Word]
+    :param checkpoint_url: Database URL of the checkpoint (default: sidecar
+        SQLite database next to the database).
+    :type checkpoint_url: None | str
+    :param matrix_path: Path of the pattern matrix file (default: next to
+        database), patterns are scored on the fly, if it is not current.
+    :type matrix_path: None | pathlib.Path
+    :param processes: Number of worker processes (default: number of CPUs).
+    :type processes: None | int
+    :param with_depth: If False, the average depth (most expensive part) is
+        not evaluated.
+    :type with_depth: bool
+    :return: Ranked opener scores (see rank).
+    :rtype: list[OpenerScore]
+    """
+
+    texts = [word.word for word in words]
+    ids = np.array([word.id for word in words], dtype="<i8")
+    codes = letter_codes(texts)
+    rows = rows_of(words, matrix_path)
+
+    fingerprint = hashlib.sha256(
+        ids.tobytes() + codes.tobytes() + bytes([with_depth])
+    ).hexdigest()
+
+    engine = create_engine(checkpoint_url or my_globals.OPENERS_DATABASE_URL)
+    meta.create_all(engine)
+
+    with engine.connect() as connection:
+        finished = {
+            row.word_id: OpenerScore(
+                row.word_id,
+                row.word,
+                row.expected_remaining,
+                row.worst_case,
+                row.average_depth,
+            )
+            for row in connection.execute(
+                select(opener_scores).where(opener_scores.c.fingerprint == fingerprint)
+            )
+        }
+
+    openers = [index for index, word in enumerate(words) if word.id not in finished]
+    shards = [
+        openers[start : start + SHARD_SIZE]
+        for start in range(0, len(openers), SHARD_SIZE)
+    ]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_score_shard, codes, matrix_path, rows, shard, with_depth)
+            for shard in shards
+        ]
+
+        for future in as_completed(futures):
+            scores = [
+                OpenerScore(int(ids[index]), texts[index], *values)
+                for index, *values in future.result()
+            ]
+
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(opener_scores),
+                    [
+                        {"fingerprint": fingerprint, **score._asdict()}
+                        for score in scores
+                    ],
+                )
+
+            finished.update((score.word_id, score) for score in scores)
+
+    engine.dispose()
+
+    return rank(list(finished.values()))
+
+
+def write_csv(scores: Sequence[OpenerScore], path: Path) -> None:
+    """Write opener scores as CSV file (with header and rank column).
+
+    :param scores: Ranked opener scores.
+    :type scores: Sequence[OpenerScore]
+    :param path: Path of the CSV file.
+    :type path: pathlib.Path
+    """
+
+    with path.open(newline="", mode="w", encoding="utf8") as csvfile:
+        writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+        writer.writerow(("rank", *OpenerScore._fields))
+
+        for position, score in enumerate(scores, start=1):
+            writer.writerow((position, *score))
@@ -0,0 +1,545 @@
+"""
+Persisted guess x answer feedback matrix.
+
+File layout (little endian):
+
+    header      magic (4s), format version (H), stale flag (B), padding,
+                capacity c (I), used slots n (I)
+    word ids    c x int64, the ordering of rows and columns
+    codes       c x 5 x uint8, letter codes of the words (see letter_codes)
+    alive       c x uint8, 0 marks a tombstone (deleted or disabled word)
+    matrix      c x c x uint8, row = guess, column = answer
+
+Only the first n slots are used. New words are appended as new row and
+column into the free capacity, removed words are masked as tombstones and
+dropped by compact. The matrix is opened with numpy.memmap, so several
+processes share one page-cached copy of the file. Writers hold an exclusive
+lock of the lock file next to it (path + ".lock"), so they never append into
+the same slots or replace the file under each other.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle import my_globals
+from pywordle.logic import file_lock
+from pywordle.logic.scoring import WORD_LENGTH, letter_codes, score_matrix
+from pywordle.model.models import Word
+
+MAGIC = b"PWPM"
+FORMAT_VERSION = 2
+
+# compact the file, if more than this fraction of the used slots are tombstones
+COMPACTION_THRESHOLD = 0.25
+
+_HEADER = struct.Struct("<4sHBxII")
+_STALE_FLAG_OFFSET = 6
+_SLOTS_OFFSET = 8
+_SLOTS = struct.Struct("<II")
+
+# number of matrix rows scored by one worker task
+_ROWS_PER_TASK = 512
+
+
+def default_path() -> Path:
+    """Get the path of the pattern matrix file next to the database.
+
+    :return: Path of the pattern matrix file.
+    :rtype: pathlib.Path
+    """
+
+    return my_globals.WORKING_DIR / my_globals.PATTERN_MATRIX_FILE
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold the lock of the pattern matrix file between writers."""
+
+    with open(path.with_name(f"{path.name}.lock"), mode="a+b") as lock_file:
+        file_lock.lock(lock_file)
+        yield
+
+
+def _capacity_for(count: int) -> int:
+    """Get the capacity for count words with room for some new words."""
+
+    return max(count + count // 4, 64)
+
+
+def _offsets(capacity: int) -> tuple[int, int, int, int]:
+    """Get the offsets of word ids, codes, alive flags and matrix."""
+
+    ids_offset = _HEADER.size
+    codes_offset = ids_offset + 8 * capacity
+    alive_offset = codes_offset + WORD_LENGTH * capacity
+    matrix_offset = alive_offset + capacity
+
+    return ids_offset, codes_offset, alive_offset, matrix_offset
+
+
+class PatternMatrix:  # pylint: disable=too-many-instance-attributes
+    """Memory-mapped pattern matrix (read-only, if not opened writable)."""
+
+    def __init__(self, path: None | Path = None, writable: bool = False) -> None:
+        self.path = path or default_path()
+        self.writable = writable
+        self._open()
+
+    def _open(self) -> None:
+        """Read the header and map the sections of the file."""
+
+        with open(self.path, mode="rb") as file:
+            header = file.read(_HEADER.size)
+
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Invalid pattern matrix file: {self.path}")
+
+        magic, version, stale, capacity, count = _HEADER.unpack(header)
+
+        if magic != MAGIC:
+            raise ValueError(f"Invalid pattern matrix file: {self.path}")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported pattern matrix version {version} "
+                f"(expected {FORMAT_VERSION}): {self.path}"
+            )
+
+        self.stale = bool(stale)
+        self.capacity: int = capacity
+        self.count: int = count
+
+        mode = "r+" if self.writable else "r"
+        ids_offset, codes_offset, alive_offset, matrix_offset = _offsets(capacity)
+
+        self._ids = np.memmap(
+            self.path, dtype="<i8", mode=mode, offset=ids_offset, shape=(capacity,)
+        )
+        self._codes = np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode=mode,
+            offset=codes_offset,
+            shape=(capacity, WORD_LENGTH),
+        )
+        self._alive = np.memmap(
+            self.path, dtype=np.uint8, mode=mode, offset=alive_offset, shape=(capacity,)
+        )
+        self._matrix = np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode=mode,
+            offset=matrix_offset,
+            shape=(capacity, capacity),
+        )
+        self._indices: None | dict[int, int] = None
+
+    @property
+    def ids(self) -> npt.NDArray[np.int64]:
+        """Word ids of the used slots (rows/columns)."""
+
+        return self._ids[: self.count]
+
+    @property
+    def codes(self) -> npt.NDArray[np.uint8]:
+        """Letter codes of the words in the used slots."""
+
+        return self._codes[: self.count]
+
+    @property
+    def alive(self) -> npt.NDArray[np.bool_]:
+        """Mask of the used slots, False marks a tombstone."""
+
+        return self._alive[: self.count].astype(bool)
+
+    @property
+    def matrix(self) -> npt.NDArray[np.uint8]:
+        """Feedback patterns of the used slots, row = guess, column = answer."""
+
+        return self._matrix[: self.count, : self.count]
+
+    def index_of(self, word_id: int) -> int:
+        """Get the row/column index of the word with given word_id.
+
+        :param word_id: ID of the word.
+        :type word_id: int
+        :return: Row/column index of the word (tombstones included).
+        :rtype: int
+        :raise: KeyError
+        """
+
+        if self._indices is None:
+            self._indices = {
+                int(word_id): index for index, word_id in enumerate(self.ids)
+            }
+
+        return self._indices[word_id]
+
+    def add_words(self, words: Sequence[Word]) -> None:
+        """Append new words as row and column, revive tombstoned words.
+
+        Only the new rows and columns are scored. If the capacity is
+        exhausted, the file is rewritten with more capacity (without scoring).
+
+        :param words: Added or enabled words.
+        :type words: Sequence[Word]
+        """
+
+        new_words = []
+
+        for word in words:
+            try:
+                index = self.index_of(word.id)
+            except KeyError:
+                new_words.append(word)
+                continue
+
+            code = letter_codes([word.word])
+
+            # sqlite may reuse the id of a deleted word for another word
+            if (self._codes[index] != code[0]).any():
+                codes = self._codes[: self.count]
+                self._codes[index] = code[0]
+                self._matrix[index, : self.count] = score_matrix(code, codes)[0]
+                self._matrix[: self.count, index] = score_matrix(codes, code)[:, 0]
+
+            self._alive[index] = 1
+
+        if new_words:
+            count = self.count + len(new_words)
+
+            if count > self.capacity:
+                self.flush()
+                _rewrite(self, np.arange(self.count), _capacity_for(count))
+                self._open()
+
+            start = self.count
+            new_codes = letter_codes([word.word for word in new_words])
+
+            self._ids[start:count] = [word.id for word in new_words]
+            self._codes[start:count] = new_codes
+            self._alive[start:count] = 1
+
+            codes = self._codes[:count]
+            self._matrix[start:count, :count] = score_matrix(new_codes, codes)
+            self._matrix[:start, start:count] = score_matrix(codes[:start], new_codes)
+
+            self.count = count
+            self._indices = None
+
+        self.flush()
+
+    def remove_words(self, word_ids: Iterable[int]) -> None:
+        """Mask the words with given word_ids as tombstones.
+
+        :param word_ids: IDs of deleted or disabled words.
+        :type word_ids: Iterable[int]
+        """
+
+        for word_id in word_ids:
+            try:
+                self._alive[self.index_of(word_id)] = 0
+            except KeyError:
+                pass
+
+        self.flush()
+
+    def tombstones(self) -> int:
+        """Get the number of tombstones in the used slots.
+
+        :return: Number of tombstones.
+        :rtype: int
+        """
+
+        return self.count - int(np.count_nonzero(self._alive[: self.count]))
+
+    def flush(self) -> None:
+        """Flush changes of a writable pattern matrix to disk."""
+
+        for memmap in (self._ids, self._codes, self._alive, self._matrix):
+            memmap.flush()
+
+        with open(self.path, mode="r+b") as file:
+            file.seek(_SLOTS_OFFSET)
+            file.write(_SLOTS.pack(self.capacity, self.count))
+
+    def close(self) -> None:
+        """Unmap the file (Windows can not replace a mapped file).
+
+        The matrix is unusable until reopened, views of the sections (e.g.
+        matrix) keep their mapping alive.
+        """
+
+        del self._ids, self._codes, self._alive, self._matrix
+
+
+def _create_file(
+    path: Path,
+    capacity: int,
+    ids: npt.NDArray[np.int64],
+    codes: npt.NDArray[np.uint8],
+) -> int:
+    """Create a file with header, ids, codes and alive flags.
+
+    :return: Offset of the (still zeroed) matrix.
+    """
+
+    count = len(ids)
+    *_, matrix_offset = _offsets(capacity)
+
+    with open(path, mode="wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, capacity, count))
+        file.write(ids.astype("<i8").tobytes())
+        file.write(bytes(8 * (capacity - count)))
+        file.write(codes.astype(np.uint8).tobytes())
+        file.write(bytes(WORD_LENGTH * (capacity - count)))
+        file.write(b"\x01" * count)
+        file.truncate(matrix_offset + capacity * capacity)
+
+    return matrix_offset
+
+
+def _score_rows(  # pylint: disable=too-many-arguments
+    path: Path,
+    offset: int,
+    capacity: int,
+    codes: npt.NDArray[np.uint8],
+    start: int,
+    stop: int,
+) -> None:
+    """Score rows start..stop and write them directly into the matrix file."""
+
+    matrix = np.memmap(
+        path, dtype=np.uint8, mode="r+", offset=offset, shape=(capacity, capacity)
+    )
+    matrix[start:stop, : len(codes)] = score_matrix(codes[start:stop], codes)
+    matrix.flush()
+
+
+def build(
+    words: Sequence[Word],
+    path: None | Path = None,
+    processes: None | int = None,
+) -> Path:
+    """Score all words against each other and write the pattern matrix file.
+
+    The rows are split in tasks and scored in a process pool. The new file
+    replaces the old one atomically, open memory maps keep the old file.
+
+    :param words: Words for rows and columns (e.g. db_manager.get_words()).
+    :type words: Sequence[Word]
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    :param processes: Number of worker processes (default: number of CPUs).
+    :type processes: None | int
+    :return: Path of the written pattern matrix file.
+    :rtype: pathlib.Path
+    """
+
+    path = path or default_path()
+
+    with _locked(path):
+        _build(words, path, processes)
+
+    return path
+
+
+def _build(words: Sequence[Word], path: Path, processes: None | int) -> None:
+    """Write the pattern matrix file (caller holds the lock)."""
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+
+    count = len(words)
+    capacity = _capacity_for(count)
+    ids = np.array([word.id for word in words], dtype="<i8")
+    codes = letter_codes([word.word for word in words])
+    offset = _create_file(tmp_path, capacity, ids, codes)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _score_rows,
+                tmp_path,
+                offset,
+                capacity,
+                codes,
+                start,
+                min(start + _ROWS_PER_TASK, count),
+            )
+            for start in range(0, count, _ROWS_PER_TASK)
+        ]
+
+        for future in futures:
+            future.result()
+
+    os.replace(tmp_path, path)
+
+
+def _rewrite(
+    matrix: PatternMatrix, indices: npt.NDArray[np.int_], capacity: int
+) -> None:
+    """Copy the given slots of matrix into a new file with given capacity.
+
+    The new file replaces the file of matrix, which is closed before.
+    """
+
+    tmp_path = matrix.path.with_name(f"{matrix.path.name}.tmp")
+    offset = _create_file(
+        tmp_path, capacity, matrix.ids[indices], matrix.codes[indices]
+    )
+    new_matrix = np.memmap(
+        tmp_path, dtype=np.uint8, mode="r+", offset=offset, shape=(capacity, capacity)
+    )
+
+    for start in range(0, len(indices), _ROWS_PER_TASK):
+        rows = indices[start : start + _ROWS_PER_TASK]
+        new_matrix[start : start + len(rows), : len(indices)] = matrix.matrix[rows][
+            :, indices
+        ]
+
+    new_matrix.flush()
+    del new_matrix
+
+    matrix.close()
+    os.replace(tmp_path, matrix.path)
+
+
+def is_current(path: None | Path = None) -> bool:
+    """Check if the pattern matrix file exists, is readable and not stale.
+
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    :return: True, if the file can be maintained incrementally.
+    :rtype: bool
+    """
+
+    try:
+        return not PatternMatrix(path).stale
+    except (FileNotFoundError, ValueError):
+        return False
+
+
+def rows_of(
+    words: Sequence[Word], path: None | Path = None
+) -> None | npt.NDArray[np.int64]:
+    """Get the rows/columns of the words in the current pattern matrix file.
+
+    :param words: Words to look up.
+    :type words: Sequence[Word]
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    :return:
+        Row/column index for every word or None, if the file does not exist,
+        is stale or misses a word.
+    :rtype: None | numpy.ndarray[numpy.int64]
+    """
+
+    try:
+        matrix = PatternMatrix(path)
+
+        if matrix.stale:
+            return None
+
+        return np.array([matrix.index_of(word.id) for word in words], dtype=np.int64)
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def add_words(words: Sequence[Word], path: None | Path = None) -> None:
+    """Add words to the pattern matrix file (see PatternMatrix.add_words).
+
+    Nothing is done, if the file does not exist or is stale.
+
+    :param words: Added or enabled words.
+    :type words: Sequence[Word]
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    """
+
+    if not words:
+        return
+
+    path = path or default_path()
+
+    # the used slots are read, appended and flushed under the lock
+    with _locked(path):
+        if is_current(path):
+            PatternMatrix(path, writable=True).add_words(words)
+
+
+def remove_words(word_ids: Iterable[int], path: None | Path = None) -> None:
+    """Mask words in the pattern matrix file (see PatternMatrix.remove_words).
+
+    The file is compacted, if too many tombstones exist. Nothing is done,
+    if the file does not exist or is stale.
+
+    :param word_ids: IDs of deleted or disabled words.
+    :type word_ids: Iterable[int]
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    """
+
+    path = path or default_path()
+
+    with _locked(path):
+        if not is_current(path):
+            return
+
+        matrix = PatternMatrix(path, writable=True)
+        matrix.remove_words(word_ids)
+
+        if matrix.tombstones() > matrix.count * COMPACTION_THRESHOLD:
+            matrix.close()
+            _compact(path)
+
+
+def compact(path: None | Path = None) -> None:
+    """Rewrite the pattern matrix file without tombstones.
+
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    """
+
+    path = path or default_path()
+
+    with _locked(path):
+        _compact(path)
+
+
+def _compact(path: Path) -> None:
+    """Rewrite the file without tombstones (caller holds the lock)."""
+
+    matrix = PatternMatrix(path)
+    indices = np.flatnonzero(matrix.alive)
+
+    _rewrite(matrix, indices, _capacity_for(len(indices)))
+
+
+def mark_stale(path: None | Path = None) -> None:
+    """Flag the pattern matrix file as stale (if it exists).
+
+    :param path: Path of the pattern matrix file (default: next to database).
+    :type path: None | pathlib.Path
+    """
+
+    path = path or default_path()
+
+    if not path.exists():
+        return
+
+    with _locked(path):
+        try:
+            with open(path, mode="r+b") as file:
+                file.seek(_STALE_FLAG_OFFSET)
+                file.write(b"\x01")
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,174 @@
+"""
+Packed prefix trie over the codec alphabet.
+
+The nodes are stored in breadth-first order in two arrays: the bitmask of
+the child letters (bit = letter code) and the index of the first child. The
+children of a node are stored consecutively in letter order, so the child
+of a letter is first child + number of lower bits set in the mask.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Sequence
+
+from pywordle.logic import db_manager
+from pywordle.logic.codec import ALPHABET, BITS_PER_LETTER, WORD_LENGTH, encode_words
+from pywordle.logic.helper import upper
+
+_LETTER_MASK = (1 << BITS_PER_LETTER) - 1
+
+
+class PrefixTrie:
+    """Read-only trie to check, if a prefix can complete a word."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        codes = sorted(set(encode_words(words)))
+
+        self.masks = array("I")
+        self.first_children = array("I")
+        self.word_count = len(codes)
+
+        # a node of a level is the range of the words with its prefix
+        level = [(0, len(codes))]
+        next_index = 1
+
+        for depth in range(WORD_LENGTH + 1):
+            shift = BITS_PER_LETTER * (WORD_LENGTH - 1 - depth)
+            next_level = []
+
+            for start, stop in level:
+                mask = 0
+                self.first_children.append(next_index)
+
+                while depth < WORD_LENGTH and start < stop:
+                    letter = (codes[start] >> shift) & _LETTER_MASK
+                    end = start + 1
+
+                    while end < stop and (codes[end] >> shift) & _LETTER_MASK == letter:
+                        end += 1
+
+                    mask |= 1 << letter
+                    next_level.append((start, end))
+                    start = end
+
+                self.masks.append(mask)
+                next_index += mask.bit_count()
+
+            level = next_level
+
+    @classmethod
+    def from_database(cls) -> PrefixTrie:
+        """Create a trie over all words of the database (same words as exist).
+
+        :return: The prefix trie.
+        :rtype: PrefixTrie
+        """
+
+        return cls(
+            word.word
+            for word in db_manager.get_words(
+                allow_nsfw_words=True, allow_disabled_words=True
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __contains__(self, word: object) -> bool:
+        return (
+            isinstance(word, str) and len(word) == WORD_LENGTH and self.has_prefix(word)
+        )
+
+    def child(self, node: int, letter: str) -> None | int:
+        """Get the child node of a letter.
+
+        :param node: Index of the node (0 = root).
+        :type node: int
+        :param letter: The letter.
+        :type letter: str
+        :return: Index of the child node or None, if no word continues with
+            the letter.
+        :rtype: None | int
+        """
+
+        code = ALPHABET.find(upper(letter)) if len(letter) == 1 else -1
+
+        if code < 0:
+            return None
+
+        bit = 1 << code
+        mask = self.masks[node]
+
+        if not mask & bit:
+            return None
+
+        return self.first_children[node] + (mask & (bit - 1)).bit_count()
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check if a word starts with prefix.
+
+        :param prefix: The prefix.
+        :type prefix: str
+        :return: True, if a word starts with prefix.
+        :rtype: bool
+        """
+
+        node: None | int = 0
+
+        for letter in prefix:
+            node = self.child(node, letter)
+
+            if node is None:
+                return False
+
+        return self.word_count > 0
+
+    def matches(self, letters: Sequence[None | str]) -> bool:
+        """Check if a word matches the letters (None = any letter).
+
+        :param letters: Letters of the first positions, None for positions
+            without letter.
+        :type letters: Sequence[None | str]
+        :return: True, if a word matches.
+        :rtype: bool
+        """
+
+        if len(letters) > WORD_LENGTH:
+            return False
+
+        nodes = [0] if self.word_count else []
+
+        for letter in letters:
+            if letter is None:
+                nodes = [
+                    self.first_children[node] + offset
+                    for node in nodes
+                    for offset in range(self.masks[node].bit_count())
+                ]
+            else:
+                nodes = [
+                    child
+                    for child in (self.child(node, letter) for node in nodes)
+                    if child is not None
+                ]
+
+            if not nodes:
+                return False
+
+        return bool(nodes)
+
+
+_shared = db_manager.VersionedCache(PrefixTrie.from_database)
+
+
+def shared() -> PrefixTrie:
+    """Get the trie of the database words, built once per dictionary version.
+
+    Safe to call from worker threads, the trie is shared read-only.
+
+    :return: The prefix trie.
+    :rtype: PrefixTrie
+    """
+
+    return _shared.get()
@@ -0,0 +1,383 @@
+"""
+Write-behind queue for game results.
+
+Results are buffered and written by a background thread as one bulk insert
+(db_manager.add_results), as soon as max_rows results are pending or the
+oldest result waited max_delay_ms. Every result is appended to a journal
+file first (synced to disk), which is replaced by a synced journal of the
+still pending results after every successful insert. So results survive a
+crash or power loss (or a locked database) and are written on the next
+start (at least once: a crash between insert and journal replacement
+writes the batch twice).
+
+Every writer has its own journal (journal path + unique suffix), locked
+while the writer runs. A new writer adopts the journals, that are not
+locked (left by crashed or failed writers), so concurrent processes never
+replay the results of each other.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TextIO
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from pywordle import my_globals
+from pywordle.logic import db_manager, file_lock
+
+# pending result: word id, guessed_in_run, created_at
+PendingResult = tuple[int, None | int, datetime]
+
+# retries after failed inserts wait max_delay_ms, doubled up to this limit
+MAX_RETRY_DELAY_MS = 30_000
+
+
+def default_journal_path() -> Path:
+    """Get the path of the results journal next to the database.
+
+    :return: Path of the journal (journals of writers get a suffix).
+    :rtype: pathlib.Path
+    """
+
+    return my_globals.WORKING_DIR / my_globals.RESULTS_JOURNAL_FILE
+
+
+def _parse_journal(text: str) -> tuple[list[PendingResult], int]:
+    """Parse journal lines, skip torn (no line end) and invalid lines.
+
+    :return: The results and the number of skipped lines.
+    """
+
+    results = []
+    skipped = 0
+
+    for line in text.splitlines(keepends=True):
+        try:
+            if not line.endswith("\n"):
+                raise ValueError("Torn line.")
+
+            word_id, guessed_in_run, created_at = next(csv.reader([line]))
+            results.append(
+                (
+                    int(word_id),
+                    int(guessed_in_run) if guessed_in_run else None,
+                    datetime.fromisoformat(created_at),
+                )
+            )
+        except ValueError:
+            skipped += 1
+
+    return results, skipped
+
+
+class ResultWriter:
+    """Buffers results and writes them in batches on a background thread."""
+
+    def __init__(
+        self,
+        max_rows: int = 256,
+        max_delay_ms: int = 500,
+        journal_path: None | Path = None,
+    ) -> None:
+        self.max_rows = max_rows
+        self.max_delay_ms = max_delay_ms
+        self.last_error: None | SQLAlchemyError = None
+        # unparseable journal lines, that were dropped on recovery
+        self.skipped_rows = 0
+
+        self._pending: list[PendingResult] = []
+        # monotonic time, when the oldest pending result was added
+        self._pending_since = 0.0
+        # no automatic flush before this monotonic time (after failures)
+        self._retry_at = 0.0
+        self._retry_delay = 0.0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+
+        base_path = journal_path or default_journal_path()
+
+        # results of previous writers, that were not written
+        adopted = self._adopt_journals(base_path)
+        self._journal, self.journal_path = self._create_journal(base_path)
+        self._write_journal(self._pending)
+
+        for journal in adopted:
+            # empty first, so nobody replays it between close and unlink
+            journal.truncate(0)
+            journal.close()
+            Path(journal.name).unlink(missing_ok=True)
+
+        self._pending_since = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="pywordle-results", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _adopt_journals(self, base_path: Path) -> list[TextIO]:
+        """Lock and read the journals, that are not locked by a writer.
+
+        :return: The locked journals (still open).
+        """
+
+        adopted = []
+
+        # unfinished replacements of crashed writers, the journals are complete
+        for path in base_path.parent.glob(f".{base_path.name}*"):
+            with path.open(mode="a", encoding="utf8") as journal:
+                if file_lock.lock(journal, blocking=False):
+                    path.unlink(missing_ok=True)
+
+        for path in sorted(base_path.parent.glob(f"{base_path.name}*")):
+            try:
+                journal = path.open(mode="r+", newline="", encoding="utf8")
+            except (FileNotFoundError, IsADirectoryError):
+                continue
+
+            # locked by its writer or replaced by it before the lock
+            if (
+                not file_lock.lock(journal, blocking=False)
+                or os.fstat(journal.fileno()).st_nlink == 0
+            ):
+                journal.close()
+                continue
+
+            results, skipped = _parse_journal(journal.read())
+            self._pending += results
+            self.skipped_rows += skipped
+            adopted.append(journal)
+
+        return adopted
+
+    @staticmethod
+    def _create_journal(base_path: Path) -> tuple[TextIO, Path]:
+        """Create and lock a new journal of this writer."""
+
+        while True:
+            descriptor, name = tempfile.mkstemp(
+                prefix=f"{base_path.name}.", dir=base_path.parent
+            )
+            journal = os.fdopen(descriptor, mode="a", newline="", encoding="utf8")
+            file_lock.lock(journal)
+
+            # another writer may have adopted (and removed) it before the lock
+            if os.fstat(descriptor).st_nlink > 0:
+                return journal, Path(name)
+
+            journal.close()
+
+    def _write_journal(
+        self, results: list[PendingResult], journal: None | TextIO = None
+    ) -> None:
+        """Append results to the journal (default: of the writer) and sync it
+        (caller holds the condition)."""
+
+        journal = journal or self._journal
+        writer = csv.writer(journal)
+
+        for word_id, guessed_in_run, created_at in results:
+            writer.writerow(
+                (
+                    word_id,
+                    "" if guessed_in_run is None else guessed_in_run,
+                    created_at.isoformat(),
+                )
+            )
+
+        journal.flush()
+        os.fsync(journal.fileno())
+
+    def _replace_journal(self) -> None:
+        """Replace the journal by a journal of the pending results (caller
+        holds the condition).
+
+        The new journal is written, synced and locked before it replaces the
+        old one, so a crash leaves one of both complete.
+        """
+
+        directory = self.journal_path.parent
+        descriptor, name = tempfile.mkstemp(
+            prefix=f".{self.journal_path.name}.", dir=directory
+        )
+        journal = os.fdopen(descriptor, mode="a", newline="", encoding="utf8")
+        file_lock.lock(journal)
+
+        try:
+            self._write_journal(self._pending, journal)
+
+            if os.name == "nt":
+                # open files can not be replaced on Windows
+                journal.close()
+                self._journal.close()
+
+            os.replace(name, self.journal_path)
+        except BaseException:
+            journal.close()
+            Path(name).unlink(missing_ok=True)
+
+            if self._journal.closed:
+                self._journal = self._open_journal(self.journal_path)
+
+            raise
+
+        if os.name == "nt":
+            self._journal = self._open_journal(self.journal_path)
+            return
+
+        self._journal.close()
+        self._journal = journal
+
+        # the rename itself is durable with the synced directory
+        directory_descriptor = os.open(directory, os.O_RDONLY)
+
+        try:
+            os.fsync(directory_descriptor)
+        finally:
+            os.close(directory_descriptor)
+
+    @staticmethod
+    def _open_journal(path: Path) -> TextIO:
+        """Open and lock the journal of this writer again."""
+
+        journal = path.open(mode="a", newline="", encoding="utf8")
+        file_lock.lock(journal)
+
+        return journal
+
+    def add(
+        self,
+        word_id: int,
+        guessed_in_run: None | int,
+        created_at: None | datetime = None,
+    ) -> None:
+        """Queue the result of a game.
+
+        :param word_id: ID of the searched word.
+        :type word_id: int
+        :param guessed_in_run: Run, in which the word was guessed or None.
+        :type guessed_in_run: None | int
+        :param created_at: Time of the result (default: now).
+        :type created_at: None | datetime.datetime
+        :raise: ValueError
+        """
+
+        result = (word_id, guessed_in_run, created_at or datetime.utcnow())
+
+        with self._condition:
+            if self._closing:
+                raise ValueError("Result writer is closed.")
+
+            self._write_journal([result])
+            self._pending.append(result)
+
+            # the first result starts the delay, max_rows results flush at once
+            if len(self._pending) == 1:
+                self._pending_since = time.monotonic()
+                self._condition.notify()
+            elif len(self._pending) >= self.max_rows:
+                self._condition.notify()
+
+    def flush(self) -> bool:
+        """Write all pending results now.
+
+        :return: True, if all pending results were written, False, if the
+            insert failed (they are retried with growing delay, see
+            last_error).
+        :rtype: bool
+        """
+
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self._pending)
+
+            if not batch:
+                return True
+
+            try:
+                db_manager.add_results(batch)
+            except SQLAlchemyError as error:
+                self.last_error = error
+
+                with self._condition:
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, self.max_delay_ms / 1000),
+                        MAX_RETRY_DELAY_MS / 1000,
+                    )
+                    self._retry_at = time.monotonic() + self._retry_delay
+
+                return False
+
+            with self._condition:
+                # results added during the insert stay pending
+                del self._pending[: len(batch)]
+                self._pending_since = time.monotonic()
+                self._retry_at = self._retry_delay = 0.0
+                self._replace_journal()
+
+            self.last_error = None
+
+            return True
+
+    def _run(self) -> None:
+        """Flush, if enough results are pending or waited long enough."""
+
+        while True:
+            with self._condition:
+                while not self._closing:
+                    now = time.monotonic()
+
+                    if now < self._retry_at:
+                        timeout: None | float = self._retry_at - now
+                    elif len(self._pending) >= self.max_rows:
+                        break
+                    elif self._pending:
+                        timeout = self._pending_since + self.max_delay_ms / 1000 - now
+
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+
+                    self._condition.wait(timeout)
+
+                closing = self._closing
+
+            self.flush()
+
+            if closing:
+                return
+
+    def close(self) -> None:
+        """Write the pending results and stop the background thread.
+
+        Results, that could not be written, stay in the journal (adopted by
+        the next writer).
+        """
+
+        with self._condition:
+            if self._closing:
+                return
+
+            self._closing = True
+            self._condition.notify()
+
+        self._thread.join()
+
+        with self._condition:
+            self._journal.close()
+
+            if not self._pending:
+                self.journal_path.unlink(missing_ok=True)
@@ -0,0 +1,252 @@
+"""
+Qt-free scoring engine.
+
+The feedback of a guess is encoded as a single base-3 integer (0..242).
+Position ``i`` of the word is stored in the digit with the weight ``3**i``,
+the digit values are:
+
+    0 - letter does not exist (gray)
+    1 - letter exists on other position (yellow)
+    2 - letter is on the correct position (green)
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pywordle.logic.codec import WORD_LENGTH, letter_codes
+
+PATTERN_COUNT = 3**WORD_LENGTH
+ALL_CORRECT = PATTERN_COUNT - 1
+
+_WEIGHTS = tuple(3**position for position in range(WORD_LENGTH))
+_CORRECT_WEIGHTS = tuple(2 * weight for weight in _WEIGHTS)
+
+# number of guess x answer pairs scored at once by score_matrix
+_MATRIX_CHUNK_SIZE = 1 << 22
+
+
+class GueissingPositionState(IntEnum):
+    """Guessed states"""
+
+    UNKNOWN = 0
+    CORRECT_POSITION = 1
+    EXIST_ON_OTHER_POSITION = 2
+    DOES_NOT_EXIST = 3
+
+
+_STATE_TO_DIGIT = {
+    GueissingPositionState.DOES_NOT_EXIST: 0,
+    GueissingPositionState.EXIST_ON_OTHER_POSITION: 1,
+    GueissingPositionState.CORRECT_POSITION: 2,
+}
+
+_DIGIT_TO_STATE = {digit: state for state, digit in _STATE_TO_DIGIT.items()}
+
+
+def score(guess: str, answer: str) -> int:
+    """Score guess against answer and return the encoded feedback pattern.
+
+    A letter, that is not on the correct position, exists on other position,
+    if the answer contains the letter on any position, that is not guessed
+    correctly. Duplicate letters are not counted, every occurence of such a
+    letter in the guess is marked as existing (same as the UI does).
+
+    :param guess: Guessed word.
+    :type guess: str
+    :param answer: The searched word.
+    :type answer: str
+    :return: Feedback pattern (0..242).
+    :rtype: int
+    """
+
+    pattern = 0
+    open_letters = set()
+
+    for position, (guess_letter, answer_letter) in enumerate(zip(guess, answer)):
+        if guess_letter == answer_letter:
+            pattern += _CORRECT_WEIGHTS[position]
+        else:
+            open_letters.add(answer_letter)
+
+    if open_letters:
+        for position, (guess_letter, answer_letter) in enumerate(zip(guess, answer)):
+            if guess_letter != answer_letter and guess_letter in open_letters:
+                pattern += _WEIGHTS[position]
+
+    return pattern
+
+
+@lru_cache(maxsize=PATTERN_COUNT)
+def _pattern_to_states(pattern: int) -> tuple[GueissingPositionState, ...]:
+    states = []
+
+    for _ in range(WORD_LENGTH):
+        pattern, digit = divmod(pattern, 3)
+        states.append(_DIGIT_TO_STATE[digit])
+
+    return tuple(states)
+
+
+def pattern_to_states(pattern: int) -> list[GueissingPositionState]:
+    """Convert an encoded feedback pattern to a list of guessed position states.
+
+    :param pattern: Feedback pattern (0..242).
+    :type pattern: int
+    :return: List of guessed position states.
+    :rtype: list[GueissingPositionState]
+    :raise: ValueError
+    """
+
+    if not 0 <= pattern < PATTERN_COUNT:
+        raise ValueError(f"Invalid pattern: {pattern}")
+
+    return list(_pattern_to_states(pattern))
+
+
+def states_to_pattern(states: list[GueissingPositionState]) -> int:
+    """Convert a list of guessed position states to an encoded feedback pattern.
+
+    :param states: List of guessed position states.
+    :type states: list[GueissingPositionState]
+    :return: Feedback pattern (0..242).
+    :rtype: int
+    :raise: ValueError
+    """
+
+    if len(states) != WORD_LENGTH:
+        raise ValueError(f"Exact {WORD_LENGTH} states required, got {len(states)}.")
+
+    try:
+        return sum(
+            _STATE_TO_DIGIT[state] * weight for state, weight in zip(states, _WEIGHTS)
+        )
+    except KeyError as error:
+        raise ValueError(f"State can not be encoded: {error}") from error
+
+
+def score_states(guess: str, answer: str) -> list[GueissingPositionState]:
+    """Score guess against answer and return the guessed position states.
+
+    :param guess: Guessed word.
+    :type guess: str
+    :param answer: The searched word.
+    :type answer: str
+    :return: List of guessed position states.
+    :rtype: list[GueissingPositionState]
+    """
+
+    return pattern_to_states(score(guess, answer))
+
+
+def _as_letter_codes(
+    words: Sequence[str] | npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    if isinstance(words, np.ndarray):
+        return words.astype(np.uint8, copy=False).reshape(-1, WORD_LENGTH)
+
+    return letter_codes(words)
+
+
+def _score_codes(
+    guess_codes: npt.NDArray[np.uint8],
+    answer_codes: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    """Score every guess against every answer (vectorized score).
+
+    The letters of the answer on not correctly guessed positions are
+    collected as bitmask, so existence checks are a single AND per position.
+    """
+
+    answer_bits = np.left_shift(np.uint32(1), answer_codes.astype(np.uint32))
+    guess_bits = np.left_shift(np.uint32(1), guess_codes.astype(np.uint32))
+
+    shape = (len(guess_codes), len(answer_codes))
+    correct = np.empty((WORD_LENGTH, *shape), dtype=bool)
+    open_letters = np.zeros(shape, dtype=np.uint32)
+
+    for position in range(WORD_LENGTH):
+        np.equal(
+            guess_codes[:, position, None],
+            answer_codes[None, :, position],
+            out=correct[position],
+        )
+        open_letters |= np.where(correct[position], 0, answer_bits[None, :, position])
+
+    patterns = np.zeros(shape, dtype=np.uint8)
+
+    for position in range(WORD_LENGTH):
+        exists = (open_letters & guess_bits[:, position, None]) != 0
+        exists &= ~correct[position]
+        patterns += correct[position] * np.uint8(_CORRECT_WEIGHTS[position])
+        patterns += exists * np.uint8(_WEIGHTS[position])
+
+    return patterns
+
+
+def score_matrix(
+    guesses: Sequence[str] | npt.NDArray[np.uint8],
+    answers: Sequence[str] | npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    """Score every guess against every answer (same rules as score).
+
+    :param guesses: Guessed words or their letter codes (see letter_codes).
+    :type guesses: Sequence[str] | numpy.ndarray[numpy.uint8]
+    :param answers: Searched words or their letter codes (see letter_codes).
+    :type answers: Sequence[str] | numpy.ndarray[numpy.uint8]
+    :return:
+        Matrix of feedback patterns with shape (len(guesses), len(answers)),
+        the row is the guess, the column is the answer.
+    :rtype: numpy.ndarray[numpy.uint8]
+    """
+
+    guess_codes = _as_letter_codes(guesses)
+    answer_codes = _as_letter_codes(answers)
+
+    matrix = np.empty((len(guess_codes), len(answer_codes)), dtype=np.uint8)
+    rows_per_chunk = max(1, _MATRIX_CHUNK_SIZE // max(1, len(answer_codes)))
+
+    for start in range(0, len(guess_codes), rows_per_chunk):
+        stop = start + rows_per_chunk
+        matrix[start:stop] = _score_codes(guess_codes[start:stop], answer_codes)
+
+    return matrix
+
+
+def score_pairs(
+    guesses: Sequence[str] | npt.NDArray[np.uint8],
+    answers: Sequence[str] | npt.NDArray[np.uint8],
+) -> npt.NDArray[np.uint8]:
+    """Score the i-th guess against the i-th answer (same rules as score).
+
+    :param guesses: Guessed words or their letter codes (see letter_codes).
+    :type guesses: Sequence[str] | numpy.ndarray[numpy.uint8]
+    :param answers: Searched words or their letter codes (see letter_codes).
+    :type answers: Sequence[str] | numpy.ndarray[numpy.uint8]
+    :return: Feedback pattern for every pair.
+    :rtype: numpy.ndarray[numpy.uint8]
+    :raise: ValueError
+    """
+
+    guess_codes = _as_letter_codes(guesses)
+    answer_codes = _as_letter_codes(answers)
+
+    if guess_codes.shape != answer_codes.shape:
+        raise ValueError("Same number of guesses and answers required.")
+
+    correct = guess_codes == answer_codes
+    answer_bits = np.left_shift(np.uint32(1), answer_codes.astype(np.uint32))
+    open_letters = np.bitwise_or.reduce(np.where(correct, 0, answer_bits), axis=1)
+
+    exists = (
+        np.right_shift(open_letters[:, None], guess_codes.astype(np.uint32)) & 1
+    ).astype(bool) & ~correct
+
+    digits = correct * np.uint8(2) + exists
+
+    return (digits * np.array(_WEIGHTS, dtype=np.uint8)).sum(axis=1, dtype=np.uint8)
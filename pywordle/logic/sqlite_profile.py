@@ -0,0 +1,142 @@
+"""
+SQLite engine profiles.
+
+A profile (see my_globals.SQLITE_PROFILES) is a set of PRAGMAs, which are
+executed on every new connection of an engine. The "wal" profile lets
+readers (e.g. the GUI) and one writer (e.g. the simulator) work at the same
+time, instead of failing with "database is locked".
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from sqlalchemy import create_engine as sqlalchemy_create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from pywordle import my_globals
+
+# supported PRAGMAs and their allowed values (None = any integer)
+PRAGMAS: dict[str, None | frozenset[str]] = {
+    "journal_mode": frozenset({"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL"}),
+    "synchronous": frozenset({"OFF", "NORMAL", "FULL", "EXTRA"}),
+    "busy_timeout": None,
+    "mmap_size": None,
+    "cache_size": None,
+    "temp_store": frozenset({"DEFAULT", "FILE", "MEMORY"}),
+}
+
+
+def get_pragmas(profile: None | str = None) -> dict[str, int | str]:
+    """Get the validated PRAGMAs of a profile.
+
+    :param profile: Name of the profile (default: my_globals.SQLITE_PROFILE).
+    :type profile: None | str
+    :return: Values by PRAGMA name.
+    :rtype: dict[str, int | str]
+    :raise: ValueError
+    """
+
+    profile = profile or my_globals.SQLITE_PROFILE
+
+    if profile not in my_globals.SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'.")
+
+    pragmas: dict[str, int | str] = {}
+
+    for name, value in my_globals.SQLITE_PROFILES[profile].items():
+        if name not in PRAGMAS:
+            raise ValueError(f"Unsupported PRAGMA '{name}' in profile '{profile}'.")
+
+        allowed = PRAGMAS[name]
+
+        if allowed is None:
+            if not isinstance(value, int):
+                raise ValueError(f"PRAGMA '{name}' needs an integer.")
+        elif not isinstance(value, str) or value.upper() not in allowed:
+            raise ValueError(f"PRAGMA '{name}' must be one of {sorted(allowed)}.")
+        else:
+            value = value.upper()
+
+        pragmas[name] = value
+
+    return pragmas
+
+
+def apply_profile(engine: Engine, profile: None | str = None) -> Engine:
+    """Execute the PRAGMAs of a profile on every new connection of engine.
+
+    :param engine: A SQLite engine.
+    :type engine: sqlalchemy.engine.Engine
+    :param profile: Name of the profile (default: my_globals.SQLITE_PROFILE).
+    :type profile: None | str
+    :return: The engine.
+    :rtype: sqlalchemy.engine.Engine
+    :raise: ValueError
+    """
+
+    pragmas = get_pragmas(profile)
+
+    if not pragmas:
+        return engine
+
+    # journal_mode first, it can not be changed inside a transaction
+    statements = [
+        f"PRAGMA {name}={value}"
+        for name, value in sorted(
+            pragmas.items(), key=lambda item: item[0] != "journal_mode"
+        )
+    ]
+
+    def on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+
+        for statement in statements:
+            cursor.execute(statement)
+
+        cursor.close()
+
+    event.listen(engine, "connect", on_connect)
+
+    return engine
+
+
+def create_engine(url: str, profile: None | str = None, **kwargs: Any) -> Engine:
+    """Create a SQLite engine with the PRAGMAs of a profile.
+
+    Connections to a database file are pooled (QueuePool) and may be used by
+    any thread (one at a time), so the PRAGMAs and the WAL setup run once per
+    connection instead of once per session (the default NullPool).
+
+    :param url: Database URL.
+    :type url: str
+    :param profile: Name of the profile (default: my_globals.SQLITE_PROFILE).
+    :type profile: None | str
+    :return: The engine.
+    :rtype: sqlalchemy.engine.Engine
+    :raise: ValueError
+    """
+
+    if make_url(url).database not in (None, "", ":memory:"):
+        kwargs.setdefault("poolclass", QueuePool)
+        kwargs.setdefault("connect_args", {}).setdefault("check_same_thread", False)
+
+    return apply_profile(sqlalchemy_create_engine(url, **kwargs), profile)
+
+
+def current_pragmas(engine: Engine) -> Mapping[str, int | str]:
+    """Read the PRAGMAs of the profiles from a connection of engine.
+
+    :param engine: A SQLite engine.
+    :type engine: sqlalchemy.engine.Engine
+    :return: Current values by PRAGMA name.
+    :rtype: Mapping[str, int | str]
+    """
+
+    with engine.connect() as connection:
+        return {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in PRAGMAS
+        }
@@ -0,0 +1,199 @@
+"""
+"Did you mean" suggestions for rejected guesses.
+
+Every word is indexed by all its variants with up to max_distance deleted
+letters (deletion neighborhood). A query looks up the variants of the
+rejected word and compares only the words found there, instead of
+computing the edit distance to every word of the dictionary.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from pywordle.logic import db_manager
+from pywordle.logic.helper import upper
+
+
+def hamming(word: str, other: str) -> int:
+    """Get the number of positions with different letters.
+
+    :param word: A word.
+    :type word: str
+    :param other: Another word (same length).
+    :type other: str
+    :return: The Hamming distance.
+    :rtype: int
+    """
+
+    return sum(letter != other_letter for letter, other_letter in zip(word, other))
+
+
+def levenshtein(word: str, other: str) -> int:
+    """Get the minimal number of inserted, deleted or replaced letters.
+
+    :param word: A word.
+    :type word: str
+    :param other: Another word.
+    :type other: str
+    :return: The Levenshtein distance.
+    :rtype: int
+    """
+
+    previous = list(range(len(other) + 1))
+
+    for row, letter in enumerate(word, start=1):
+        current = [row]
+
+        for column, other_letter in enumerate(other, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (letter != other_letter),
+                )
+            )
+
+        previous = current
+
+    return previous[-1]
+
+
+def _deletions(word: str, max_deletions: int) -> set[str]:
+    """Get the word and all variants with up to max_deletions deleted letters."""
+
+    variants = {word}
+    frontier = {word}
+
+    for _ in range(max_deletions):
+        frontier = {
+            variant[:position] + variant[position + 1 :]
+            for variant in frontier
+            for position in range(len(variant))
+        }
+        variants |= frontier
+
+    return variants
+
+
+class DeletionIndex:
+    """Deletion-neighborhood index over words for the Levenshtein distance."""
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2) -> None:
+        self.max_distance = max_distance
+        self.words: list[str] = []
+        self._known: set[str] = set()
+        # variant with deleted letters -> indices of the words
+        self._variants: dict[str, list[int]] = {}
+
+        for word in words:
+            self.add(word)
+
+    @classmethod
+    def from_database(cls) -> DeletionIndex:
+        """Create an index over all words of the database (same words as exist).
+
+        :return: The deletion index.
+        :rtype: DeletionIndex
+        """
+
+        return cls(
+            word.word
+            for word in db_manager.get_words(
+                allow_nsfw_words=True, allow_disabled_words=True
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str) -> None:
+        """Add a word (duplicates are ignored).
+
+        :param word: The word.
+        :type word: str
+        """
+
+        word = upper(word)
+
+        if word in self._known:
+            return
+
+        self._known.add(word)
+        self.words.append(word)
+
+        for variant in _deletions(word, self.max_distance):
+            self._variants.setdefault(variant, []).append(len(self.words) - 1)
+
+    def search(
+        self, word: str, max_distance: None | int = None
+    ) -> list[tuple[int, str]]:
+        """Find all words within max_distance.
+
+        Two words within the distance d share a variant with at most d deleted
+        letters, so only the words of the variants of word are compared.
+
+        :param word: The searched word.
+        :type word: str
+        :param max_distance: Maximal Levenshtein distance (default and upper
+            limit: max_distance of the index).
+        :type max_distance: None | int
+        :return: Pairs of distance and word, sorted by distance and word.
+        :rtype: list[tuple[int, str]]
+        """
+
+        word = upper(word)
+        max_distance = (
+            self.max_distance
+            if max_distance is None
+            else min(max_distance, self.max_distance)
+        )
+
+        candidates = {
+            index
+            for variant in _deletions(word, max_distance)
+            for index in self._variants.get(variant, ())
+        }
+        found = (
+            (levenshtein(word, self.words[index]), self.words[index])
+            for index in candidates
+        )
+
+        return sorted(item for item in found if item[0] <= max_distance)
+
+    def suggest(
+        self, word: str, limit: int = 3, max_distance: None | int = None
+    ) -> list[str]:
+        """Get the closest words, ranked by Levenshtein and Hamming distance.
+
+        :param word: The rejected word.
+        :type word: str
+        :param limit: Maximal number of suggestions.
+        :type limit: int
+        :param max_distance: Maximal Levenshtein distance of a suggestion
+            (default: max_distance of the index).
+        :type max_distance: None | int
+        :return: The suggested words.
+        :rtype: list[str]
+        """
+
+        word = upper(word)
+        found = [item for item in self.search(word, max_distance) if item[1] != word]
+        found.sort(key=lambda item: (item[0], hamming(word, item[1]), item[1]))
+
+        return [suggestion for _, suggestion in found[:limit]]
+
+
+_shared = db_manager.VersionedCache(DeletionIndex.from_database)
+
+
+def shared() -> DeletionIndex:
+    """Get the index of the database words, built once per dictionary version.
+
+    Safe to call from worker threads, the index is shared read-only.
+
+    :return: The deletion index.
+    :rtype: DeletionIndex
+    """
+
+    return _shared.get()
@@ -32,3 +32,27 @@ class WordList1Parser(BaseParser):  # pylint: disable=too-few-public-methods
                     german_nouns.append(german_noun)
 
         return NormalizedSet(german_nouns)
+
+    @staticmethod
+    def get_ranks() -> dict[str, int]:
+        """Get the frequency rank of the words (1 = most frequent).
+
+        :return: Rank of every normalized word, duplicates keep the best rank.
+        :rtype: dict[str, int]
+        """
+
+        file_path = Path(WORKING_DIR) / "doc" / "word_lists" / "word_list_1.txt"
+
+        ranks: dict[str, int] = {}
+
+        with file_path.open(mode="r", encoding="utf8") as file:
+            for line in file:
+                parts = line.strip().split()
+
+                if len(parts) < 2 or not parts[0].rstrip(".").isdigit():
+                    continue
+
+                for german_noun in NormalizedSet([parts[-1]]):
+                    ranks.setdefault(german_noun, int(parts[0].rstrip(".")))
+
+        return ranks
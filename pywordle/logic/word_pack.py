@@ -0,0 +1,372 @@
+"""
+Precompiled binary word pack (read-only runtime backend without SQLAlchemy).
+
+File layout (little endian):
+
+    header      magic (4s), format version (H), filter count f (H),
+                word count n (I), padding
+    filters     f x (filter bits (B), padding, offset (I), members m (I)),
+                filter bit 0 = allow nsfw words, bit 1 = allow disabled words
+    ids         n x int64, word ids in database
+    codes       n x uint32, sorted word codes (see codec)
+    weights     n x float32
+    flags       n x uint8, bit 0 = enabled, bit 1 = nsfw
+    per filter  m x uint32 members (indices of the eligible words),
+                m x float32 alias probabilities, m x uint32 aliases
+                (see alias_table, built over the weights of the members)
+
+The pack is opened with mmap, exist is a binary search over the codes and
+random words are drawn in O(1), so nothing is parsed at startup.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, NamedTuple, Sequence
+
+from pywordle import my_globals
+from pywordle.logic.alias_table import AliasTable
+from pywordle.logic.codec import decode, encode
+
+MAGIC = b"PWWP"
+FORMAT_VERSION = 1
+
+FLAG_ENABLED = 1
+FLAG_NSFW = 2
+
+FILTER_ALLOW_NSFW = 1
+FILTER_ALLOW_DISABLED = 2
+
+_HEADER = struct.Struct("<4sHHI4x")
+_FILTER = struct.Struct("<BxxxII")
+_FILTERS = (0, FILTER_ALLOW_NSFW, FILTER_ALLOW_DISABLED, 3)
+
+
+class PackedWord(NamedTuple):
+    """A word of the pack (same attribute names as the Word model)."""
+
+    id: int
+    word: str
+    enabled: bool
+    nsfw: bool
+    weight: float
+
+
+def default_path() -> Path:
+    """Get the path of the word pack next to the database.
+
+    :return: Path of the word pack.
+    :rtype: pathlib.Path
+    """
+
+    return my_globals.WORKING_DIR / my_globals.WORD_PACK_FILE
+
+
+def _align(offset: int) -> int:
+    """Round offset up to a multiple of 8."""
+
+    return (offset + 7) & ~7
+
+
+def _little_endian(values: array[Any]) -> bytes:
+    """Get the bytes of an array in little endian byte order."""
+
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def _eligible(filter_bits: int, enabled: bool, nsfw: bool) -> bool:
+    """Check if a word is selectable with the filter."""
+
+    return bool(
+        (filter_bits & FILTER_ALLOW_NSFW or not nsfw)
+        and (filter_bits & FILTER_ALLOW_DISABLED or enabled)
+    )
+
+
+def write(words: Sequence[PackedWord], path: None | Path = None) -> Path:
+    """Write the word pack (atomically replaces an existing pack).
+
+    :param words: All words with flags and weights.
+    :type words: Sequence[PackedWord]
+    :param path: Path of the word pack (default: next to database).
+    :type path: None | pathlib.Path
+    :return: Path of the written word pack.
+    :rtype: pathlib.Path
+    :raise: ValueError
+    """
+
+    path = path or default_path()
+    words = sorted(words, key=lambda word: encode(word.word))
+    count = len(words)
+
+    sections = [
+        _little_endian(array("q", (word.id for word in words))),
+        _little_endian(array("I", (encode(word.word) for word in words))),
+        _little_endian(array("f", (word.weight for word in words))),
+        bytes(
+            (FLAG_ENABLED if word.enabled else 0) | (FLAG_NSFW if word.nsfw else 0)
+            for word in words
+        ),
+    ]
+
+    filters = []
+
+    for filter_bits in _FILTERS:
+        members = array(
+            "I",
+            (
+                index
+                for index, word in enumerate(words)
+                if _eligible(filter_bits, word.enabled, word.nsfw)
+            ),
+        )
+        weights = [words[index].weight for index in members]
+
+        if sum(weights) > 0:
+            table = AliasTable(weights)
+            probabilities = array("f", table.probabilities)
+            aliases = table.aliases
+        else:
+            # no positive weight: weighted selection is uniform
+            probabilities = array("f", [1.0]) * len(members)
+            aliases = array("I", range(len(members)))
+
+        filters.append((filter_bits, len(members)))
+        sections += [
+            _little_endian(members),
+            _little_endian(probabilities),
+            _little_endian(aliases),
+        ]
+
+    offset = _align(_HEADER.size + _FILTER.size * len(_FILTERS))
+    offsets = []
+
+    for section in sections:
+        offsets.append(offset)
+        offset = _align(offset + len(section))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with open(tmp_path, mode="wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(_FILTERS), count))
+
+        for index, (filter_bits, member_count) in enumerate(filters):
+            file.write(_FILTER.pack(filter_bits, offsets[4 + 3 * index], member_count))
+
+        for section_offset, section in zip(offsets, sections):
+            file.write(bytes(section_offset - file.tell()))
+            file.write(section)
+
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class WordPack:
+    """Memory-mapped word pack (read-only)."""
+
+    def __init__(self, path: None | Path = None) -> None:
+        self.path = path or default_path()
+
+        with open(self.path, mode="rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._buffer = memoryview(self._mmap)
+        self._views: list[memoryview] = []
+
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError(f"Invalid word pack: {self.path}")
+
+        magic, version, filter_count, count = _HEADER.unpack_from(self._buffer)
+
+        if magic != MAGIC:
+            raise ValueError(f"Invalid word pack: {self.path}")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported word pack version {version} "
+                f"(expected {FORMAT_VERSION}): {self.path}"
+            )
+
+        self.count: int = count
+
+        offset = _align(_HEADER.size + _FILTER.size * filter_count)
+        self._ids = self._section("q", offset, count)
+        offset = _align(offset + 8 * count)
+        self._codes = self._section("I", offset, count)
+        offset = _align(offset + 4 * count)
+        self._weights = self._section("f", offset, count)
+        offset = _align(offset + 4 * count)
+        self._flags = self._section("B", offset, count)
+
+        self._filters = {}
+
+        for index in range(filter_count):
+            filter_bits, offset, members = _FILTER.unpack_from(
+                self._buffer, _HEADER.size + index * _FILTER.size
+            )
+            probabilities_offset = _align(offset + 4 * members)
+            aliases_offset = _align(probabilities_offset + 4 * members)
+
+            self._filters[filter_bits] = (
+                self._section("I", offset, members),
+                self._section("f", probabilities_offset, members),
+                self._section("I", aliases_offset, members),
+            )
+
+    def _section(self, typecode: str, offset: int, count: int) -> Sequence[Any]:
+        """Get a typed view of a section (a copy on big endian machines)."""
+
+        size = array(typecode).itemsize
+        data = self._buffer[offset : offset + size * count]
+
+        self._views.append(data)
+
+        if sys.byteorder == "big":
+            values = array(typecode, data.tobytes())
+            values.byteswap()
+            return values
+
+        # the typecodes are literals of this module
+        view = data.cast(typecode)  # type: ignore[call-overload]
+        self._views.append(view)
+
+        return view
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.exist(word)
+
+    def close(self) -> None:
+        """Release the views and close the memory map."""
+
+        self._ids = self._codes = self._weights = self._flags = []
+        self._filters = {}
+
+        for view in reversed(self._views):
+            view.release()
+
+        self._buffer.release()
+        self._mmap.close()
+
+    def exist(self, word: str) -> bool:
+        """Check if given word exists in the pack (enabled or not).
+
+        :param word: The word to check.
+        :type word: str
+        :return: True, if word exists in the pack and False, if not.
+        :rtype: bool
+        """
+
+        try:
+            code = encode(word)
+        except ValueError:
+            return False
+
+        index = bisect_left(self._codes, code)
+
+        return index < self.count and self._codes[index] == code
+
+    def word(self, index: int) -> PackedWord:
+        """Get the word at index (words are sorted by code).
+
+        :param index: Index of the word.
+        :type index: int
+        :return: The word.
+        :rtype: PackedWord
+        """
+
+        flags = self._flags[index]
+
+        return PackedWord(
+            id=self._ids[index],
+            word=decode(self._codes[index]),
+            enabled=bool(flags & FLAG_ENABLED),
+            nsfw=bool(flags & FLAG_NSFW),
+            weight=self._weights[index],
+        )
+
+    def get_random_word(
+        self,
+        allow_nsfw_words: bool = True,
+        allow_disabled_words: bool = False,
+        weighted: bool = False,
+        rng: None | random.Random = None,
+    ) -> None | PackedWord:
+        """Get a random word (same filters as db_manager.get_random_word).
+
+        :return: A random word or None, if no word is eligible.
+        :rtype: None | PackedWord
+        """
+
+        generator = rng if rng is not None else random
+        members, probabilities, aliases = self._filters[
+            (FILTER_ALLOW_NSFW if allow_nsfw_words else 0)
+            | (FILTER_ALLOW_DISABLED if allow_disabled_words else 0)
+        ]
+
+        if not members:
+            return None
+
+        slot = generator.randrange(len(members))
+
+        if weighted and generator.random() >= probabilities[slot]:
+            slot = aliases[slot]
+
+        return self.word(members[slot])
+
+
+_default_pack: None | WordPack = None
+
+
+def _open_default_pack() -> WordPack:
+    """Open the word pack next to the database once."""
+
+    global _default_pack  # pylint: disable=global-statement
+
+    if _default_pack is None:
+        _default_pack = WordPack()
+
+    return _default_pack
+
+
+def exist(word: str) -> bool:
+    """Check if given word exists in the default word pack.
+
+    :param word: The word to check.
+    :type word: str
+    :return: True, if word exists in the pack and False, if not.
+    :rtype: bool
+    """
+
+    return _open_default_pack().exist(word)
+
+
+def get_random_word(
+    allow_nsfw_words: bool = True,
+    allow_disabled_words: bool = False,
+    weighted: bool = False,
+) -> None | PackedWord:
+    """Get a random word from the default word pack.
+
+    :return: A random word or None, if no word is eligible (see
+        WordPack.get_random_word).
+    :rtype: None | PackedWord
+    """
+
+    return _open_default_pack().get_random_word(
+        allow_nsfw_words, allow_disabled_words, weighted
+    )
@@ -1,9 +1,10 @@
 """SQLAlchemy database models"""
 
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer,
-                        MetaData, String)
+from sqlalchemy import (Boolean, Column, Date, DateTime, Float, ForeignKey,
+                        Index, Integer, LargeBinary, MetaData, String,
+                        UniqueConstraint)
 from sqlalchemy.ext.declarative import DeclarativeMeta, declarative_base
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import deferred, relationship, validates
 from sqlalchemy.sql import func
 
 meta = MetaData(
@@ -32,6 +33,7 @@ class Word(BaseModel):  # pylint: disable=too-few-public-methods
     """The Word model"""
 
     __tablename__ = "words"
+    __table_args__ = (Index("ix_words_enabled_nsfw", "enabled", "nsfw"),)
 
     word = Column(
         String(5, collation="NOCASE"),
@@ -59,6 +61,8 @@ class Word(BaseModel):  # pylint: disable=too-few-public-methods
 
     enabled = Column(Boolean, default=True)
     nsfw = Column(Boolean, default=False)
+    # relative answer frequency for weighted random words
+    weight = Column(Float, nullable=False, default=1.0, server_default="1.0")
     results = relationship(
         "Result", back_populates="word", cascade="all, delete-orphan"
     )
@@ -73,3 +77,32 @@ class Result(BaseModel):  # pylint: disable=too-few-public-methods
     word = relationship("Word", back_populates="results")
 
     guessed_in_run = Column(Integer, nullable=True, default=None)
+
+
+class Deck(BaseModel):  # pylint: disable=too-few-public-methods
+    """The Deck model (non-repeating shuffled answers of one word filter)"""
+
+    __tablename__ = "decks"
+    __table_args__ = (UniqueConstraint("allow_nsfw_words", "allow_disabled_words"),)
+
+    allow_nsfw_words = Column(Boolean, nullable=False)
+    allow_disabled_words = Column(Boolean, nullable=False)
+
+    seed = Column(Integer, nullable=False)
+    cursor = Column(Integer, nullable=False, default=0)
+    size = Column(Integer, nullable=False, default=0)
+
+    # packed little-endian int64 word ids, loaded only if needed
+    word_ids = deferred(Column(LargeBinary, nullable=False, default=b""))
+
+
+class DailyWord(BaseModel):  # pylint: disable=too-few-public-methods
+    """The DailyWord model (precomputed answer of the daily challenge)"""
+
+    __tablename__ = "daily_words"
+
+    day = Column(Date, unique=True, nullable=False)
+    word_id = Column(
+        Integer, ForeignKey("words.id", ondelete="cascade"), nullable=False
+    )
+    word = relationship("Word")
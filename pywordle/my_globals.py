@@ -2,8 +2,35 @@
 App globals
 """
 
+from datetime import date
 from pathlib import Path
 
 WORKING_DIR = Path(__file__).absolute().parent.parent
 DATABASE_FILE = "db.sqlite3"
 DATABASE_URL = f"sqlite:///{WORKING_DIR}/{DATABASE_FILE}"
+PATTERN_MATRIX_FILE = "patterns.bin"
+DECISION_TREE_FILE = "decision_tree.bin"
+OPENERS_DATABASE_FILE = "openers.sqlite3"
+OPENERS_DATABASE_URL = f"sqlite:///{WORKING_DIR}/{OPENERS_DATABASE_FILE}"
+WORD_PACK_FILE = "words.pack"
+RESULTS_JOURNAL_FILE = "results.journal"
+MAX_RUNS = 6
+# PRAGMAs of every new SQLite connection by profile (see logic/sqlite_profile)
+SQLITE_PROFILES: dict[str, dict[str, int | str]] = {
+    "default": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms
+        "mmap_size": 256 * 1024 * 1024,  # bytes
+        "cache_size": -64 * 1024,  # negative: KiB
+        "temp_store": "MEMORY",
+    },
+}
+# opt-in "wal": the journal mode is stored in the database file, so the file
+# stays in WAL mode (with -wal/-shm files) until switched back (see README)
+SQLITE_PROFILE = "default"
+DAILY_SEED = "pywordle-daily"
+DAILY_START = date(2022, 4, 1)
+DAILY_DAYS = 10 * 366
+DAILY_NO_REPEAT_WINDOW = 365
@@ -0,0 +1,259 @@
+"""
+Headless self-play simulator.
+
+A solver plays against every enabled word of the database (or a seeded
+sample) with the same run limit as the UI. The games are fanned out over a
+process pool, every worker creates its own solver once (with the state of
+Solver.prepare, computed once in the parent, e.g. the opener).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple, Sequence
+
+from pywordle.logic import db_manager
+from pywordle.logic.candidates import CandidateIndex
+from pywordle.logic.hints import best_scored_guess
+from pywordle.logic.scoring import ALL_CORRECT, letter_codes, score
+from pywordle.model.models import Word
+from pywordle.my_globals import MAX_RUNS
+
+# number of games played by one worker task
+GAMES_PER_TASK = 256
+
+
+class Solver(ABC):  # pylint: disable=too-few-public-methods
+    """Abstract solver used as interface for all implemented solvers."""
+
+    def __init__(self, words: Sequence[Word], seed: None | int = None) -> None:
+        self.words = list(words)
+        self.random = random.Random(seed)
+
+    @classmethod
+    def prepare(cls, words: Sequence[Word]) -> dict[str, Any]:
+        """Compute the state shared by all solvers of a simulation once.
+
+        :param words: Guesses and answers.
+        :type words: Sequence[Word]
+        :return: Keyword arguments for the solvers of the workers.
+        :rtype: dict[str, Any]
+        """
+
+        # pylint: disable=unused-argument
+        return {}
+
+    @abstractmethod
+    def guess(self, history: Sequence[tuple[str, int]]) -> str:
+        """Get the next guess.
+
+        :param history: Pairs of guessed word and feedback pattern.
+        :type history: Sequence[tuple[str, int]]
+        :return: The next guess.
+        :rtype: str
+        """
+
+
+class RandomCandidateSolver(Solver):  # pylint: disable=too-few-public-methods
+    """Guesses a random word of the answers still possible."""
+
+    def __init__(self, words: Sequence[Word], seed: None | int = None) -> None:
+        super().__init__(words, seed)
+        self.index = CandidateIndex(self.words)
+
+    def guess(self, history: Sequence[tuple[str, int]]) -> str:
+        candidates = self.index.indices(self.index.candidates(history))
+
+        return self.words[self.random.choice(candidates)].word
+
+
+class EntropySolver(Solver):  # pylint: disable=too-few-public-methods
+    """Guesses the word with the most expected information (see hints).
+
+    The guesses are scored on the fly in chunks, the opener (ranked against
+    all words) is computed once by prepare or by the first game.
+    """
+
+    def __init__(
+        self,
+        words: Sequence[Word],
+        seed: None | int = None,
+        opener: None | str = None,
+    ) -> None:
+        super().__init__(words, seed)
+        self.index = CandidateIndex(self.words)
+        self.codes = letter_codes([word.word for word in self.words])
+        self._opener = opener
+
+    @classmethod
+    def prepare(cls, words: Sequence[Word]) -> dict[str, Any]:
+        return {"opener": cls(words).guess([])}
+
+    def guess(self, history: Sequence[tuple[str, int]]) -> str:
+        if not history and self._opener is not None:
+            return self._opener
+
+        candidates = self.index.indices(self.index.candidates(history))
+
+        if len(candidates) <= 2:
+            return self.words[candidates[0]].word
+
+        guess = self.words[best_scored_guess(self.codes, candidates)[0]].word
+
+        if not history:
+            self._opener = guess
+
+        return guess
+
+
+def play(solver: Solver, answer: str) -> None | int:
+    """Play one game.
+
+    :param solver: The solver.
+    :type solver: Solver
+    :param answer: The searched word.
+    :type answer: str
+    :return: Run, in which the word was guessed or None, if not guessed.
+    :rtype: None | int
+    """
+
+    history: list[tuple[str, int]] = []
+
+    for run in range(1, MAX_RUNS + 1):
+        guess = solver.guess(history)
+        pattern = score(guess, answer)
+
+        if pattern == ALL_CORRECT:
+            return run
+
+        history.append((guess, pattern))
+
+    return None
+
+
+_worker_solver: None | Solver = None
+
+
+def _init_worker(
+    solver_class: type[Solver],
+    words: list[tuple[int, str]],
+    seed: None | int,
+    options: dict[str, Any],
+) -> None:
+    """Create the solver of a worker process once."""
+
+    global _worker_solver  # pylint: disable=global-statement
+    _worker_solver = solver_class(
+        [Word(id=word_id, word=word) for word_id, word in words], seed, **options
+    )
+
+
+def _play_games(answers: list[str]) -> list[None | int]:
+    """Play a game for every answer with the solver of the worker (task)."""
+
+    if _worker_solver is None:
+        raise ValueError("Worker is not initialized.")
+
+    return [play(_worker_solver, answer) for answer in answers]
+
+
+class SimulationReport(NamedTuple):
+    """Outcome of a simulation."""
+
+    games: int
+    distribution: dict[int, int]
+    failures: int
+    seconds: float
+    results: list[tuple[int, None | int]]
+
+    @property
+    def failure_rate(self) -> float:
+        """Fraction of the games, that were not guessed."""
+
+        return self.failures / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """Played games per second."""
+
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def simulate(  # pylint: disable=too-many-arguments,too-many-locals
+    solver_class: type[Solver] = EntropySolver,
+    words: None | Sequence[Word] = None,
+    sample: None | int = None,
+    seed: None | int = None,
+    processes: None | int = None,
+    save_results: bool = False,
+) -> SimulationReport:
+    """Let the solver play against every word (or a sample of the words).
+
+    :param solver_class: Class of the solver, created once in every worker.
+    :type solver_class: type[Solver]
+    :param words: Guesses and answers (default: enabled words of database).
+    :type words: None | Sequence[Word]
+    :param sample: Number of answers in the seeded sample (default: all).
+    :type sample: None | int
+    :param seed: Seed of the sample and the solvers.
+    :type seed: None | int
+    :param processes: Number of worker processes (default: number of CPUs).
+    :type processes: None | int
+    :param save_results: If True, the outcomes are saved as Result rows
+        with one bulk insert.
+    :type save_results: bool
+    :return: The simulation report.
+    :rtype: SimulationReport
+    """
+
+    if words is None:
+        words = db_manager.get_words()
+
+    answers = list(words)
+
+    if sample is not None:
+        answers = random.Random(seed).sample(answers, min(sample, len(answers)))
+
+    word_tuples = [(word.id, word.word) for word in words]
+    texts = [word.word for word in answers]
+    start_time = time.perf_counter()
+
+    # e.g. the opener, computed once instead of once per worker
+    options = solver_class.prepare(words)
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(solver_class, word_tuples, seed, options),
+    ) as executor:
+        runs = [
+            run
+            for chunk in executor.map(
+                _play_games,
+                [
+                    texts[start : start + GAMES_PER_TASK]
+                    for start in range(0, len(texts), GAMES_PER_TASK)
+                ],
+            )
+            for run in chunk
+        ]
+
+    seconds = time.perf_counter() - start_time
+    results = [(word.id, run) for word, run in zip(answers, runs)]
+
+    if save_results:
+        db_manager.add_results(results)
+
+    distribution = Counter(run for run in runs if run is not None)
+
+    return SimulationReport(
+        games=len(runs),
+        distribution={run: distribution[run] for run in range(1, MAX_RUNS + 1)},
+        failures=runs.count(None),
+        seconds=seconds,
+        results=results,
+    )
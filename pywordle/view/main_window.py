@@ -1,27 +1,37 @@
-"""The main window widget"""
+"""The main window widget
+
+The database modules (SQLAlchemy) are imported on first use, so a start
+with a word pack (kiosk mode) shows the window without loading them.
+"""
+# pylint: disable=import-outside-toplevel
 from __future__ import annotations
 
-import re
+import asyncio
 from collections import defaultdict
-from enum import IntEnum
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
+from typing import TYPE_CHECKING
 
 from PySide2.QtWidgets import QMainWindow, QMessageBox, QPushButton, QWidget
 
-from pywordle.logic import db_manager
 from pywordle.logic.helper import get_app_version
-from pywordle.model.models import Result, Word
-from pywordle.my_globals import WORKING_DIR
+from pywordle.logic.scoring import (
+    GueissingPositionState,
+    score_states,
+    states_to_pattern,
+)
+from pywordle.logic.word_pack import PackedWord, WordPack
+from pywordle.my_globals import MAX_RUNS, WORKING_DIR
 from pywordle.view.ui.ui_main_window import Ui_MainWindow
 
-
-class GueissingPositionState(IntEnum):
-    """Guessed states"""
-
-    UNKNOWN = 0
-    CORRECT_POSITION = 1
-    EXIST_ON_OTHER_POSITION = 2
-    DOES_NOT_EXIST = 3
+if TYPE_CHECKING:
+    from pywordle.logic.async_db import AsyncDB
+    from pywordle.logic.candidates import CandidateIndex
+    from pywordle.logic.hints import HintEngine
+    from pywordle.logic.prefix_trie import PrefixTrie
+    from pywordle.logic.result_writer import ResultWriter
+    from pywordle.logic.suggestions import DeletionIndex
+    from pywordle.model.models import Word
 
 
 COLORS = {
@@ -30,23 +40,40 @@ COLORS = {
     GueissingPositionState.DOES_NOT_EXIST: "#a0a0a0",  # gray
 }
 
+# background of an input row, whose letters can not complete any word
+INVALID_ROW_COLOR = "#f4a6a6"  # light red
+
 
 class MainWindow(QMainWindow, Ui_MainWindow):
-    """The main window widget."""
+    """The main window widget.
+
+    With a word pack (kiosk mode), exist and the answer are served by the
+    pack, else by the database.
+    """
 
-    def __init__(self, parent: QWidget = None):
+    def __init__(self, parent: QWidget = None, word_pack: None | WordPack = None):
         super().__init__(parent)
         self.setupUi(self)
         self.setWindowTitle(
             f"{self.windowTitle()} v{get_app_version(working_dir=WORKING_DIR)}"
         )
 
-        self.random_word: None | Word = db_manager.get_random_word()
-
-        if self.random_word is None:
-            raise ValueError("No word in database found.")
+        # queries of the slots run on the database thread (see AsyncDB),
+        # rows are sent after the answer is drawn
+        self._word_pack = word_pack
+        self._db: None | AsyncDB = None
+        self._result_writer: None | ResultWriter = None
+        self.random_word: None | Word | PackedWord = None
+
+        if word_pack is None:
+            # recovers the results of crashed sessions at once
+            self._results()
+            drawn_word = self._database().draw_word()
+        else:
+            drawn_word = asyncio.get_event_loop().create_future()
+            drawn_word.set_result(word_pack.get_random_word())
 
-        print("Random word:", self.random_word.word)
+        drawn_word.add_done_callback(self._word_drawn)
 
         self._current_run = 1
         self._input_rows = {
@@ -61,10 +88,26 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self._current_row = self._input_rows[self._current_run]
         self._current_field = self._get_first_or_selected_input_field()
 
+        # guessed words with their feedback patterns
+        self._history: list[tuple[str, int]] = []
+
+        self._candidate_index: None | CandidateIndex = None
+        self._hint_engine: None | HintEngine = None
+        self._hint_executor: None | ProcessPoolExecutor = None
+        self._hint_task: None | asyncio.Future = None
+        self._send_task: None | asyncio.Future = None
+
+        # built in background, until then typed letters are not checked and
+        # rejected words get no suggestions
+        self._prefix_trie: None | PrefixTrie = None
+        self._suggestion_index: None | DeletionIndex = None
+        self._word_indexes_task = asyncio.ensure_future(self._load_word_indexes())
+
         # connections
         self.actionAbout_Qt.triggered.connect(  # pylint: disable=no-member
             lambda *args, **kwargs: QMessageBox.aboutQt(self)
         )
+        self.action_Hint.triggered.connect(self._show_hint)  # pylint: disable=no-member
 
         for frame in self._input_rows.values():
             for child in frame.children():
@@ -90,13 +133,81 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                         partial(self._set_field_value, input_letter)
                     )
 
+    def _database(self) -> AsyncDB:
+        """Get the async database facade, started on first use."""
+
+        if self._db is None:
+            from pywordle.logic.async_db import AsyncDB
+
+            self._db = AsyncDB()
+
+        return self._db
+
+    def _results(self) -> ResultWriter:
+        """Get the result writer, started on first use."""
+
+        if self._result_writer is None:
+            from pywordle.logic.result_writer import ResultWriter
+
+            self._result_writer = ResultWriter()
+
+        return self._result_writer
+
+    def _word_drawn(self, random_word: asyncio.Future) -> None:
+        """Start the game with the drawn answer or close without answer.
+
+        :param random_word: The finished draw of the answer.
+        :type random_word: asyncio.Future
+        """
+
+        if random_word.cancelled():
+            return
+
+        self.random_word = random_word.result()
+
+        if self.random_word is None:
+            QMessageBox.critical(self, "Error", "No word in database found.")
+            self.close()
+            return
+
+        print("Random word:", self.random_word.word)
+
     def _validate_and_send(self) -> None:
-        """Validate input row and send if word is exists."""
+        """Start validating the input row, if the answer is drawn and no
+        validation is running."""
+
+        if self.random_word is None:
+            return
 
-        word = "".join([field.text() for field in self._get_sorted_input_fields()])
+        if self._send_task is None or self._send_task.done():
+            word = "".join([field.text() for field in self._get_sorted_input_fields()])
 
-        if db_manager.exist(word):
+            # the lookup runs on the database thread, the dialogs (nested Qt
+            # event loop of exec_) are shown by the done callback, outside of
+            # any task
+            if self._word_pack is None:
+                self._send_task = self._database().exist(word)
+            else:
+                self._send_task = asyncio.get_event_loop().create_future()
+                self._send_task.set_result(self._word_pack.exist(word))
+
+            self._send_task.add_done_callback(partial(self._send, word))
+
+    def _send(self, word: str, exists: asyncio.Future) -> None:
+        """Send the input row, if the word exists, else show not a word dialog.
+
+        :param word: The word of the input row.
+        :type word: str
+        :param exists: The finished lookup of the word.
+        :type exists: asyncio.Future
+        """
+
+        if exists.cancelled():
+            return
+
+        if exists.result():
             result_list = self.validate_guessing(word)
+            self._history.append((word, states_to_pattern(result_list)))
             self._colorize_fields(result_list)
             all_correct = all(
                 result == GueissingPositionState.CORRECT_POSITION
@@ -105,7 +216,93 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
             self._select_next_input_row(all_correct)
         else:
-            self._not_a_word()
+            self._not_a_word(word)
+
+    def _show_hint(self) -> None:
+        """Start searching a hint, if no search is running."""
+
+        if self._hint_task is None or self._hint_task.done():
+            self._hint_task = asyncio.ensure_future(self._search_hint())
+
+    async def _search_hint(self) -> None:
+        """Search the guess with the most information and show it in status bar.
+
+        The ranking runs in a process pool, the best guess so far is shown
+        every time a chunk of guesses is ranked.
+        """
+
+        from pywordle.logic.candidates import CandidateIndex
+        from pywordle.logic.hints import HintEngine
+
+        loop = asyncio.get_event_loop()
+        self.statusbar.showMessage("Searching hint ...")
+
+        if self._candidate_index is None or self._hint_engine is None:
+            self._candidate_index = await self._database().call(
+                CandidateIndex.from_database
+            )
+            self._hint_engine = await loop.run_in_executor(
+                None, HintEngine, self._candidate_index.words
+            )
+
+        if self._hint_executor is None:
+            self._hint_executor = ProcessPoolExecutor()
+
+        index = self._candidate_index
+        answers = index.indices(index.candidates(self._history))
+
+        async for word, entropy in self._hint_engine.best_guesses(
+            self._hint_executor, answers
+        ):
+            self.statusbar.showMessage(
+                f"Hint: {word.word} ({entropy:.2f} bits, "
+                f"{len(answers)} possible words)"
+            )
+
+    async def _load_word_indexes(self) -> None:
+        """Load the shared prefix trie and suggestion index in background (from
+        the database, after the window is shown)."""
+
+        from pywordle.logic import prefix_trie, suggestions
+
+        self._prefix_trie = await self._database().call(prefix_trie.shared)
+        self._mark_invalid_row()
+        self._suggestion_index = await self._database().call(suggestions.shared)
+
+    def _mark_invalid_row(self) -> None:
+        """Highlight the current row, if its letters can not complete any word."""
+
+        letters = [field.text() or None for field in self._get_sorted_input_fields()]
+        invalid = self._prefix_trie is not None and not self._prefix_trie.matches(
+            letters
+        )
+        row_name = self._current_row.objectName()
+
+        self._current_row.setStyleSheet(
+            f"QFrame#{row_name} {{ background-color: {INVALID_ROW_COLOR} }}"
+            if invalid
+            else ""
+        )
+
+    def closeEvent(self, event) -> None:  # pylint: disable=invalid-name
+        """Stop running hint searches, finish the submitted database calls and
+        write the pending results, before the window is closed."""
+
+        self._word_indexes_task.cancel()
+
+        if self._hint_task is not None:
+            self._hint_task.cancel()
+
+        if self._hint_executor is not None:
+            self._hint_executor.shutdown(wait=False, cancel_futures=True)
+
+        if self._db is not None:
+            self._db.close()
+
+        if self._result_writer is not None:
+            self._result_writer.close()
+
+        super().closeEvent(event)
 
     def _colorize_fields(self, result_list: list[GueissingPositionState]) -> None:
         """Colorize input fields like QPushButtons in input rows (QFrame).
@@ -229,6 +426,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             )
 
         self._current_field.setText("")
+        self._mark_invalid_row()
 
     def _update_current_field(self) -> None:
         """Is updating the current field."""
@@ -246,6 +444,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             return
 
         self._current_field.setText(letter)
+        self._mark_invalid_row()
         self._select_next_input_field()
 
     def _get_sorted_input_fields(self, use_reversed: bool = False) -> list[QPushButton]:
@@ -323,7 +522,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if guessed:
             self._game_won()
             finished = True
-        elif self._current_run == 6:
+        elif self._current_run == MAX_RUNS:
             self._game_lost()
             finished = True
         else:
@@ -343,11 +542,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         :raise: ValueError
         """
 
-        runs = None if self._current_run == 6 else self._current_run
-        result = Result(guessed_in_run=runs)
+        runs = None if self._current_run == MAX_RUNS else self._current_run
 
         if self.random_word is not None:
-            db_manager.add_result(self.random_word.id, result)
+            # journaled at once, written in batches (closeEvent flushes)
+            self._results().add(self.random_word.id, runs)
         else:
             raise ValueError("Word is None.")
 
@@ -369,11 +568,23 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         msg_box.setWindowTitle("Game Over")
         msg_box.exec_()
 
-    def _not_a_word(self) -> None:
-        """Show not a word dialog."""
+    def _not_a_word(self, word: str) -> None:
+        """Show not a word dialog with the closest words as suggestions.
+
+        :param word: The rejected word.
+        :type word: str
+        """
+
+        text = "Not a word!"
+
+        if self._suggestion_index is not None:
+            closest_words = self._suggestion_index.suggest(word)
+
+            if closest_words:
+                text += f"<br>Did you mean: {', '.join(closest_words)}?"
 
         msg_box = QMessageBox(self)
-        msg_box.setText("Not a word!")
+        msg_box.setText(text)
         msg_box.setWindowTitle("Nope")
         msg_box.exec_()
 
@@ -413,45 +624,4 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         random_word: str = self.random_word.word if self.random_word is not None else ""
 
-        guessed_positions = list(
-            map(
-                lambda ch_tuple: ch_tuple[0] == ch_tuple[1],
-                zip(random_word, word),
-            )
-        )
-
-        # convert bool to GueissingPositionState
-        guessed_positions_states = [
-            GueissingPositionState(int(guessed_position))
-            for guessed_position in guessed_positions
-        ]
-
-        for position, position_state in enumerate(guessed_positions_states):
-            if position_state == GueissingPositionState.CORRECT_POSITION:
-                continue
-
-            letter = word[position]
-
-            other_positions = [ch.start() for ch in re.finditer(letter, random_word)]
-            other_positions = list(
-                filter(
-                    lambda other_position: guessed_positions_states[other_position]
-                    != GueissingPositionState.CORRECT_POSITION,
-                    other_positions,
-                )
-            )
-
-            # update guessed_positions_states with other position found
-            if other_positions:
-                guessed_positions_states[
-                    position
-                ] = GueissingPositionState.EXIST_ON_OTHER_POSITION
-
-        # update unknowns to GueissingPositionState.DOES_NOT_EXIST
-        for position, guessed_positions_state in enumerate(guessed_positions_states):
-            if guessed_positions_state == GueissingPositionState.UNKNOWN:
-                guessed_positions_states[
-                    position
-                ] = GueissingPositionState.DOES_NOT_EXIST
-
-        return guessed_positions_states
+        return score_states(word, random_word)
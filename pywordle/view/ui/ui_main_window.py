@@ -23,6 +23,8 @@ class Ui_MainWindow(object):
         self.action_Close.setObjectName(u"action_Close")
         self.actionAbout_Qt = QAction(MainWindow)
         self.actionAbout_Qt.setObjectName(u"actionAbout_Qt")
+        self.action_Hint = QAction(MainWindow)
+        self.action_Hint.setObjectName(u"action_Hint")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         self.verticalLayout_2 = QVBoxLayout(self.centralwidget)
@@ -1401,6 +1403,9 @@ class Ui_MainWindow(object):
         self.menu_File = QMenu(self.menubar)
         self.menu_File.setObjectName(u"menu_File")
         MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(MainWindow)
+        self.statusbar.setObjectName(u"statusbar")
+        MainWindow.setStatusBar(self.statusbar)
         QWidget.setTabOrder(self.pushButton_Q, self.pushButton_W)
         QWidget.setTabOrder(self.pushButton_W, self.pushButton_E)
         QWidget.setTabOrder(self.pushButton_E, self.pushButton_R)
@@ -1436,6 +1441,8 @@ class Ui_MainWindow(object):
         self.menubar.addAction(self.menu_File.menuAction())
         self.menubar.addAction(self.menu_About.menuAction())
         self.menu_About.addAction(self.actionAbout_Qt)
+        self.menu_File.addAction(self.action_Hint)
+        self.menu_File.addSeparator()
         self.menu_File.addAction(self.action_Close)
 
         self.retranslateUi(MainWindow)
@@ -1448,6 +1455,10 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"pyWordle", None))
         self.action_Close.setText(QCoreApplication.translate("MainWindow", u"&Close", None))
         self.actionAbout_Qt.setText(QCoreApplication.translate("MainWindow", u"About &Qt", None))
+        self.action_Hint.setText(QCoreApplication.translate("MainWindow", u"&Hint", None))
+#if QT_CONFIG(shortcut)
+        self.action_Hint.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+H", None))
+#endif // QT_CONFIG(shortcut)
         self.pushButton_1_4.setText("")
         self.pushButton_1_5.setText("")
         self.pushButton_1_1.setText("")
@@ -0,0 +1,31 @@
+import argparse
+
+from pywordle import sim
+
+solvers = {
+    "entropy": sim.EntropySolver,
+    "random": sim.RandomCandidateSolver,
+}
+
+parser = argparse.ArgumentParser(description="Let a solver play every word.")
+parser.add_argument("--solver", choices=solvers, default="entropy")
+parser.add_argument("--sample", type=int, default=None)
+parser.add_argument("--seed", type=int, default=None)
+parser.add_argument("--processes", type=int, default=None)
+parser.add_argument("--save-results", action="store_true")
+args = parser.parse_args()
+
+report = sim.simulate(
+    solvers[args.solver],
+    sample=args.sample,
+    seed=args.seed,
+    processes=args.processes,
+    save_results=args.save_results,
+)
+
+for run, games in report.distribution.items():
+    print(f"{run}: {games}")
+
+print(f"Failure rate: {report.failure_rate:.2%}")
+print(f"{report.games} games in {report.seconds:.1f}s", end=" ")
+print(f"({report.games_per_second:.0f} games/s)")
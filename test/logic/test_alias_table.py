@@ -0,0 +1,33 @@
+"""All tests for the alias table"""
+
+import random
+from collections import Counter
+
+import pytest
+from pywordle.logic.alias_table import AliasTable
+
+
+class TestAliasTable:
+    """Testclass for the alias table (alias_table.py)"""
+
+    def test_alias_table_distribution(self):
+        weights = [1.0, 0.0, 3.0, 6.0]
+        table = AliasTable(weights)
+        rng = random.Random(1)
+
+        counts = Counter(table.sample(rng) for _ in range(100_000))
+
+        assert counts[1] == 0
+        for index, weight in enumerate(weights):
+            assert counts[index] / 100_000 == pytest.approx(weight / 10, abs=0.01)
+
+    def test_alias_table_single_and_uniform(self):
+        assert AliasTable([5.0]).sample() == 0
+
+        table = AliasTable([2.0, 2.0, 2.0])
+        assert list(table.probabilities) == [1.0, 1.0, 1.0]
+
+    @pytest.mark.parametrize("weights", [[], [0.0, 0.0], [1.0, -1.0]])
+    def test_alias_table_invalid_weights(self, weights):
+        with pytest.raises(ValueError):
+            AliasTable(weights)
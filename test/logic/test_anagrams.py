@@ -0,0 +1,57 @@
+"""All tests for the anagram and letter-multiset index"""
+
+from pywordle.logic import anagrams
+from pywordle.logic.anagrams import LetterIndex, multiset_key
+from pywordle.model.models import Word
+
+WORDS = ["KATZE", "ZAKET", "TATZE", "HUNDI", "GRÜßE", "KEKSE"]
+
+
+def _index():
+    return LetterIndex([Word(id=index, word=word) for index, word in enumerate(WORDS)])
+
+
+class TestAnagrams:
+    """Testclass for the letter index (anagrams.py)"""
+
+    def test_multiset_key(self):
+        assert multiset_key("katze") == multiset_key("ZEKTA") == "AEKTZ"
+
+    def test_anagrams(self):
+        index = _index()
+
+        assert [word.word for word in index.anagrams("eztak")] == ["KATZE", "ZAKET"]
+        assert [word.word for word in index.anagrams("ẞERGÜ")] == ["GRÜßE"]
+        assert index.anagrams("KATZ") == []
+        assert index.letter_counts.shape == (len(WORDS), 30)
+
+    def test_containing(self):
+        index = _index()
+
+        assert [word.word for word in index.containing("TZ")] == [
+            "KATZE",
+            "ZAKET",
+            "TATZE",
+        ]
+        assert [word.word for word in index.containing("TT")] == ["TATZE"]
+        assert [word.word for word in index.containing("EEK")] == ["KEKSE"]
+        assert len(index.containing("")) == len(WORDS)
+        assert index.containing("Q") == []
+        assert index.containing("1") == []
+        assert index.containing("KATZEN") == []
+
+    def test_shared(self, mocker):
+        cache = anagrams.db_manager.VersionedCache(anagrams.LetterIndex.from_database)
+        mocker.patch.object(anagrams, "_shared", cache)
+        get_words = mocker.patch.object(
+            anagrams.db_manager, "get_words", return_value=[Word(id=1, word="KATZE")]
+        )
+        version = mocker.patch.object(
+            anagrams.db_manager, "dictionary_version", return_value=1
+        )
+
+        assert anagrams.shared() is anagrams.shared()
+
+        version.return_value = 2
+        assert anagrams.shared().anagrams("ZEKTA")[0].word == "KATZE"
+        assert get_words.call_count == 2
@@ -0,0 +1,71 @@
+"""All tests for the async database facade"""
+
+import asyncio
+import threading
+
+import pytest
+from pywordle.logic.async_db import AsyncDB
+from pywordle.model.models import Base, Word
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+class TestAsyncDB:
+    """Testclass for the async database facade (async_db.py)"""
+
+    @pytest.fixture
+    def db(self, mocker):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(engine)
+
+        with Session() as session:
+            session.add(Word(word="KATZE"))
+            session.commit()
+
+        mocker.patch("pywordle.logic.db_manager.Session", Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        mocker.patch("pywordle.logic.db_manager._dictionary", None)
+
+        async_db = AsyncDB()
+        yield async_db
+        async_db.close()
+
+    def test_async_db_functions(self, db):
+        async def run():
+            assert await db.exist("KATZE")
+            assert not await db.exist("HUNDI")
+
+            await db.add_word("HUNDI")
+            assert await db.exist("HUNDI")
+            assert [word.word for word in await db.get_words()] == ["KATZE", "HUNDI"]
+
+        asyncio.run(run())
+
+    def test_async_db_thread(self, db):
+        async def run():
+            return [await db.call(threading.get_ident) for _ in range(3)]
+
+        thread_ids = asyncio.run(run())
+
+        assert len(set(thread_ids)) == 1
+        assert thread_ids[0] != threading.get_ident()
+
+    def test_async_db_draw_word(self, db):
+        async def run():
+            return await db.draw_word(), await db.call(len, "KATZE")
+
+        word, length = asyncio.run(run())
+
+        assert word.word == "KATZE"
+        assert length == 5
+
+    @pytest.mark.parametrize("name", ["_filter_words", "Session", "set_nsfw", "xyz"])
+    def test_async_db_no_wrapper(self, db, name):
+        with pytest.raises(AttributeError):
+            getattr(db, name)
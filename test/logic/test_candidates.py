@@ -0,0 +1,41 @@
+"""All tests for the candidate index"""
+
+import random
+
+from pywordle.logic.candidates import CandidateIndex
+from pywordle.logic.scoring import ALL_CORRECT, score
+from pywordle.model.models import Word
+
+
+class TestCandidateIndex:
+    """Testclass for the candidate index (candidates.py)"""
+
+    def test_candidates(self):
+        rng = random.Random(42)
+        texts = sorted(
+            {"".join(rng.choice("AEKTZÄẞ") for _ in range(5)) for _ in range(300)}
+        )
+        words = [Word(id=index, word=text) for index, text in enumerate(texts)]
+        index = CandidateIndex(words)
+
+        for _ in range(50):
+            answer = rng.choice(texts)
+            history = [(rng.choice(texts), None) for _ in range(rng.randint(1, 3))]
+            history = [(guess, score(guess, answer)) for guess, _ in history]
+
+            expected = [
+                text
+                for text in texts
+                if all(score(guess, text) == pattern for guess, pattern in history)
+            ]
+            bits = index.candidates(history)
+
+            assert [word.word for word in index.words_of(bits)] == expected
+            assert answer in expected
+
+    def test_solved(self):
+        words = [Word(id=1, word="KATZE"), Word(id=2, word="KATER")]
+        index = CandidateIndex(words)
+
+        assert index.words_of(index.candidates([("KATZE", ALL_CORRECT)])) == [words[0]]
+        assert index.indices(index.candidates([])) == [0, 1]
@@ -0,0 +1,62 @@
+"""All tests for the word codec"""
+
+import numpy as np
+import pytest
+from pywordle.logic.codec import (
+    ALPHABET,
+    decode,
+    decode_words,
+    encode,
+    encode_words,
+    letter_codes,
+    pack,
+    unpack,
+)
+
+WORDS = ["KATZE", "HUNDI", "FJÄLL", "VÖLVA", "GRÜßE", "ẞẞẞẞẞ", "AAAAA"]
+
+
+class TestCodec:
+    """Testclass for the word codec (codec.py)"""
+
+    def test_encode_decode(self):
+        for word in WORDS:
+            code = encode(word)
+
+            assert 0 <= code < 1 << 25
+            assert decode(code) == word.replace("ß", "ẞ")
+
+        assert encode("grüße") == encode("GRÜẞE")
+        assert encode("AAAAA") == 0
+        assert encode("BAAAA") == 1 << 20
+
+    def test_encode_sorts_by_alphabet(self):
+        words = sorted(
+            WORDS,
+            key=lambda word: [
+                ALPHABET.index(letter) for letter in word.replace("ß", "ẞ")
+            ],
+        )
+
+        assert sorted(encode_words(WORDS)) == list(encode_words(words))
+        assert decode_words(sorted(encode_words(WORDS))) == [
+            word.replace("ß", "ẞ") for word in words
+        ]
+
+    @pytest.mark.parametrize("word", ["KATZ", "KATZEN", "KAT3E"])
+    def test_encode_invalid_word(self, word):
+        with pytest.raises(ValueError):
+            encode(word)
+
+    @pytest.mark.parametrize("code", [-1, 1 << 25, 31])
+    def test_decode_invalid_code(self, code):
+        with pytest.raises(ValueError):
+            decode(code)
+
+    def test_pack_unpack(self):
+        codes = letter_codes(WORDS)
+        packed = pack(codes)
+
+        assert packed.dtype == np.uint32
+        assert list(packed) == list(encode_words(WORDS))
+        assert (unpack(packed) == codes).all()
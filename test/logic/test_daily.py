@@ -0,0 +1,51 @@
+"""All tests for the daily-challenge schedule"""
+
+from datetime import date
+
+import pytest
+from pywordle.logic.daily import replacement, schedule
+
+WORDS = ["KATZE", "HUNDI", "KATER", "MAUSI", "VOGEL", "FISCH"]
+
+
+class TestDaily:
+    """Testclass for the daily schedule (daily.py)"""
+
+    def test_schedule_is_deterministic(self):
+        answers = schedule(WORDS, 100, "seed", 3)
+
+        assert answers == schedule(WORDS, 100, "seed", 3)
+        assert answers != schedule(WORDS, 100, "other seed", 3)
+
+        # the order of the words does not matter
+        reversed_words = WORDS[::-1]
+        assert [
+            reversed_words[answer]
+            for answer in schedule(reversed_words, 100, "seed", 3)
+        ] == [WORDS[answer] for answer in answers]
+
+    @pytest.mark.parametrize("window", [0, 3, 5, 100])
+    def test_schedule_window(self, window):
+        answers = schedule(WORDS, 200, 1, window)
+        limit = min(window, len(WORDS) - 1)
+
+        for day, answer in enumerate(answers):
+            assert answer not in answers[max(0, day - limit) : day]
+
+        assert set(answers) == set(range(len(WORDS)))
+
+    def test_schedule_without_words(self):
+        with pytest.raises(ValueError):
+            schedule([], 10, 1, 3)
+
+    def test_replacement(self):
+        day = date(2022, 1, 1)
+        answer = replacement(WORDS, [], "seed", day)
+
+        assert answer == replacement(WORDS, ["ABCDE"], "seed", day)
+        assert WORDS[::-1][replacement(WORDS[::-1], [], "seed", day)] == WORDS[answer]
+
+        # recent words are skipped, unless no other word is left
+        assert replacement(WORDS, WORDS[1:], "seed", day) == 0
+        assert replacement(WORDS, WORDS, "seed", day) is not None
+        assert replacement([], [], "seed", day) is None
@@ -1,9 +1,26 @@
 """All tests for DBManager"""
 
+import random
+from datetime import date
+
 import pytest
-from pywordle.logic.db_manager import exist, get_random_word, add_word
-from pywordle.model.models import Base, Word
-from sqlalchemy import create_engine
+from pywordle import my_globals
+from pywordle.logic.db_manager import (add_result, add_results, add_word,
+                                       add_word_list, build_daily_schedule,
+                                       delete_word, delete_words,
+                                       dictionary_version, draw_word, exist,
+                                       export_word_pack, get_daily_word,
+                                       get_random_word, get_words,
+                                       import_words, invalidate_caches,
+                                       set_enable,
+                                       set_enable_many, set_nsfw,
+                                       set_nsfw_many, set_weights,
+                                       unit_of_work)
+from pywordle.logic.pattern_matrix import PatternMatrix, build, default_path
+from pywordle.logic.word_pack import WordPack
+from pywordle.model.models import Base, Deck, Result, Word
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 
@@ -11,10 +28,13 @@ class TestDBManager:
     """Testclass for DBManager (db_manager.py)"""
 
     @pytest.fixture(autouse=True)
-    def _setup(self):
+    def _setup(self, tmp_path, monkeypatch):
+        # files next to the database (e.g. patterns.bin) of the tests only
+        monkeypatch.setattr(my_globals, "WORKING_DIR", tmp_path)
         engine = create_engine("sqlite:///:memory:")
         Base.metadata.create_all(engine)
         self.Session = sessionmaker(engine)
+        invalidate_caches()
         self.objects = [
                 Word(word="KATZE"),
                 Word(word="HUNDI"),
@@ -45,6 +65,22 @@ class TestDBManager:
         assert exist("HUNDI")
         assert not exist("ABCDE")
 
+    def test_exist_cache(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        assert exist("katze")
+
+        delete_word(1)
+        assert not exist("KATZE")
+        set_enable(2, False)
+        assert exist("HUNDI")
+
+        # the dictionary is loaded once, checks do not use the database
+        mocker.patch("pywordle.logic.db_manager.Session", side_effect=RuntimeError)
+        assert exist("HUNDI")
+        assert not exist("ABCDE")
+
     def test_get_random_word(self, mocker):
         session = self.Session()
         mocker.patch(
@@ -54,3 +90,340 @@ class TestDBManager:
         for _ in range(10):
             assert get_random_word().word in [word.word for word in self.objects]
 
+    def test_get_words(self, mocker):
+        session = self.Session()
+        mocker.patch(
+            "pywordle.logic.db_manager.Session"
+        ).return_value.__enter__.return_value = session
+
+        assert [word.word for word in get_words()] == ["KATZE", "HUNDI"]
+
+    def test_add_results(self, mocker):
+        session = self.Session()
+        mocker.patch(
+            "pywordle.logic.db_manager.Session"
+        ).return_value.__enter__.return_value = session
+
+        add_results([(1, 3), (2, None), (1, 6)])
+
+        with self.Session() as session:
+            results = session.query(Result).order_by(Result.id).all()
+
+        assert [(result.word_id, result.guessed_in_run) for result in results] == [
+            (1, 3),
+            (2, None),
+            (1, 6),
+        ]
+
+    def test_get_random_word_filters(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+
+        set_nsfw(1, True)
+        assert {get_random_word(allow_nsfw_words=False).word for _ in range(10)} == {
+            "HUNDI"
+        }
+
+        set_enable(2, False)
+        assert get_random_word(allow_nsfw_words=False) is None
+        assert get_random_word().word == "KATZE"
+        assert get_random_word(allow_disabled_words=True).word in ["KATZE", "HUNDI"]
+
+    def test_changes_update_pattern_matrix(self, tmp_path, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        assert default_path().parent == tmp_path
+        build(get_words(), processes=1)
+
+        set_enable(2, False)
+        add_word("KATER")
+
+        # half of the slots were tombstones, so the file was compacted
+        matrix = PatternMatrix(default_path())
+        assert list(matrix.ids) == [1, 3]
+        assert matrix.alive.all()
+
+    def test_draw_word(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+
+        drawn = [draw_word().word for _ in range(4)]
+
+        assert sorted(drawn[:2]) == ["HUNDI", "KATZE"]
+        assert sorted(drawn[2:]) == ["HUNDI", "KATZE"]
+
+    def test_draw_word_updates_deck(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        first = draw_word().word
+        add_word("KATER")
+        assert {draw_word().word, draw_word().word} == {"KATER", "HUNDI", "KATZE"} - {
+            first
+        }
+
+        set_nsfw(1, True)
+        delete_word(2)
+        assert {draw_word(allow_nsfw_words=False).word for _ in range(3)} == {"KATER"}
+        assert draw_word().word in ["KATZE", "KATER"]
+
+        set_enable(3, False)
+        assert draw_word(allow_nsfw_words=False) is None
+
+    def test_import_words_updates_deck(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        mocker.patch("pywordle.logic.db_manager._DECK_SHUFFLE_THRESHOLD", 1)
+        first = draw_word().word
+        shuffle = mocker.spy(random.Random, "shuffle")
+
+        statements = []
+        event.listen(
+            self.Session.kw["bind"],
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        import_words(["KATER", "MAUSI"])
+
+        # flags of the inserted words are known, only the deck is read
+        assert not [sql for sql in statements if "words.enabled" in sql]
+        shuffle.assert_called_once()
+        assert {draw_word().word for _ in range(3)} == {
+            "KATER",
+            "MAUSI",
+            "HUNDI",
+            "KATZE",
+        } - {first}
+
+    def test_update_decks_is_seeded(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        mocker.patch("pywordle.logic.db_manager.random.randrange", return_value=42)
+        words = [f"KAT{letter}R" for letter in "ABCDEFGHIJ"]
+        drawn = []
+
+        for state in (1, 2):
+            with unit_of_work() as session:
+                session.query(Word).filter(Word.word.in_(words)).delete()
+                session.query(Deck).delete()
+
+            invalidate_caches()
+            # the global random state must not matter
+            random.seed(state)
+            draw_word()
+            add_word_list(words)
+            drawn.append([draw_word().word for _ in range(len(words) + 1)])
+
+        assert drawn[0] == drawn[1]
+
+    def test_get_random_word_weighted(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+
+        set_weights({"katze": 0.0})
+        assert {get_random_word(weighted=True).word for _ in range(10)} == {"HUNDI"}
+
+        set_weights({"KATZE": 3.0}, default=0.0)
+        assert {get_random_word(weighted=True).word for _ in range(10)} == {"KATZE"}
+
+        set_nsfw(1, True)
+        assert get_random_word(allow_nsfw_words=False, weighted=True) is None
+
+    def test_get_daily_word(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+
+        set_nsfw(1, True)
+        assert build_daily_schedule(date(2022, 1, 1), 30, "seed", 1) == 30
+
+        assert get_daily_word(date(2022, 1, 1)).word == "HUNDI"
+        assert get_daily_word(date(2022, 1, 30)).word == "HUNDI"
+        assert get_daily_word(date(2022, 1, 31)) is None
+
+    def test_delete_word_refills_daily_words(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        mocker.patch.object(my_globals, "DAILY_NO_REPEAT_WINDOW", 1)
+
+        add_word_list(["KATER", "MAUSI", "VOGEL"])
+        build_daily_schedule(date(2022, 1, 1), 30, "seed", 1)
+        days = [date(2022, 1, day) for day in range(1, 31)]
+        deleted = get_daily_word(days[0])
+
+        delete_word(deleted.id)
+        answers = [get_daily_word(day).word for day in days]
+
+        assert deleted.word not in answers
+        assert all(first != second for first, second in zip(answers, answers[1:]))
+
+    def test_export_word_pack(self, mocker, tmp_path):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+
+        set_nsfw(2, True)
+        pack = WordPack(export_word_pack(tmp_path / "words.pack"))
+
+        assert pack.exist("KATZE") and pack.exist("HUNDI")
+        assert pack.get_random_word(allow_nsfw_words=False).word == "KATZE"
+        pack.close()
+
+    def test_dictionary_version(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        version = dictionary_version()
+        add_word_list(["KATER", "MAUSI"])
+        assert dictionary_version() > version
+
+        version = dictionary_version()
+        set_enable(1, False)
+        assert dictionary_version() > version
+        assert exist("MAUSI")
+
+    def test_unit_of_work(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        pattern_matrix = mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        assert exist("KATZE")
+        version = dictionary_version()
+
+        with unit_of_work() as session:
+            add_word("KATER", session=session)
+            set_nsfw(1, True, session=session)
+            set_enable(2, False, session=session)
+            add_result(2, Result(guessed_in_run=4), session=session)
+
+            # caches are updated after the commit
+            assert dictionary_version() == version
+            assert not exist("KATER")
+
+        assert dictionary_version() > version
+        assert exist("KATER")
+        assert get_random_word(allow_nsfw_words=False).word == "KATER"
+        assert [word.word for word in pattern_matrix.add_words.call_args[0][0]] == [
+            "KATER"
+        ]
+        pattern_matrix.remove_words.assert_called_once_with([2])
+
+        with self.Session() as session:
+            assert session.query(Result.word_id, Result.guessed_in_run).all() == [
+                (2, 4)
+            ]
+
+    def test_unit_of_work_rollback(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        pattern_matrix = mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        version = dictionary_version()
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work() as session:
+                delete_word(1, session=session)
+                raise RuntimeError
+
+        assert dictionary_version() == version
+        assert exist("KATZE")
+        assert not pattern_matrix.remove_words.called
+
+        with self.Session() as session:
+            assert session.query(Word).count() == 2
+
+        with pytest.raises(ValueError):
+            with self.Session() as session:
+                set_nsfw(1, True, session=session)
+
+    def test_bulk_updates(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        add_results([(1, 3), (2, None)])
+
+        assert set_nsfw_many([1, 2, 99], True) == 2
+        assert get_random_word(allow_nsfw_words=False) is None
+
+        assert set_enable_many([2], False) == 1
+        assert get_random_word().word == "KATZE"
+
+        assert delete_words([1, 99]) == 1
+        assert not exist("KATZE") and exist("HUNDI")
+
+        with self.Session() as session:
+            assert session.query(Word.word).all() == [("HUNDI",)]
+            assert session.query(Result.word_id).all() == [(2,)]
+
+    def test_import_words(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        pattern_matrix = mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        assert not exist("KATER")
+
+        report = import_words(
+            (word for word in ["kater", "KATZE", "MAUSI", "Kater", "HUNDI"]),
+            chunk_size=2,
+        )
+
+        assert report == (2, 3)
+        assert exist("KATER") and exist("MAUSI")
+        assert [word.word for word in get_words()] == ["KATZE", "HUNDI", "KATER", "MAUSI"]
+        assert [word.word for word in pattern_matrix.add_words.call_args[0][0]] == [
+            "KATER",
+            "MAUSI",
+        ]
+
+    def test_import_words_rebuild_indexes(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        assert import_words(["KATER", "MAUSI"], rebuild_indexes=True) == (2, 0)
+
+        with pytest.raises(ValueError):
+            import_words(["VOGEL", "AMSEL", "SPATZ", "MEI"], True, chunk_size=2)
+
+        with self.Session() as session:
+            indexes = inspect(session.connection()).get_indexes("words")
+            assert session.query(Word).count() == 4
+
+        assert [index["name"] for index in indexes] == ["ix_words_enabled_nsfw"]
+
+    def test_add_word_ignore_existing(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        add_word("katze", ignore_unique_constraint_exception=True)
+        add_word("KATER", ignore_unique_constraint_exception=True)
+
+        assert [word.word for word in get_words()] == ["KATZE", "HUNDI", "KATER"]
+
+    def test_add_word_invalid_letters(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        pattern_matrix = mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+
+        with pytest.raises(ValueError):
+            add_word("KAT-E")
+
+        with pytest.raises(ValueError):
+            add_word_list(["KATER", "MÄUSé"])
+
+        with pytest.raises(ValueError):
+            import_words(["KATER", "ÉCLAT"])
+
+        assert [word.word for word in get_words()] == ["KATZE", "HUNDI"]
+        assert not pattern_matrix.add_words.called
+
+        add_word_list(["mäuse", "grüße"])
+        assert exist("MÄUSE") and exist("GRÜẞE")
+
+        # stored uppered, so the non ASCII letters are unique, too
+        with pytest.raises(IntegrityError):
+            add_word("MÄUSE")
+
+        add_word("möwen")
+        assert [word.word for word in get_words()][-3:] == [
+            "MÄUSE",
+            "GRÜẞE",
+            "MÖWEN",
+        ]
+
+    def test_matrix_error_marks_stale(self, mocker):
+        mocker.patch("pywordle.logic.db_manager.Session", self.Session)
+        pattern_matrix = mocker.patch("pywordle.logic.db_manager.pattern_matrix")
+        pattern_matrix.add_words.side_effect = OSError
+        assert not exist("KATER")
+        version = dictionary_version()
+
+        add_word("KATER")
+
+        assert exist("KATER")
+        assert dictionary_version() > version
+        pattern_matrix.mark_stale.assert_called_once_with()
@@ -0,0 +1,63 @@
+"""All tests for the decision tree"""
+
+import random
+
+import pytest
+from pywordle.logic.decision_tree import DecisionTree, build
+from pywordle.logic.pattern_matrix import build as build_pattern_matrix
+from pywordle.logic.scoring import ALL_CORRECT, score
+from pywordle.model.models import Word
+
+
+class TestDecisionTree:
+    """Testclass for the decision tree (decision_tree.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        self.path = tmp_path / "decision_tree.bin"
+        self.matrix_path = tmp_path / "patterns.bin"
+        rng = random.Random(7)
+        texts = sorted(
+            {"".join(rng.choice("AEIKNRSTZ") for _ in range(5)) for _ in range(150)}
+        )
+        self.words = [
+            Word(id=100 + index, word=text) for index, text in enumerate(texts)
+        ]
+
+    def _play(self, tree, answer):
+        patterns = []
+
+        for _ in range(len(self.words)):
+            guess = tree.next_guess(patterns)
+            pattern = score(guess, answer)
+
+            if pattern == ALL_CORRECT:
+                return len(patterns) + 1
+
+            patterns.append(pattern)
+
+        raise AssertionError(f"{answer} not solved")
+
+    def test_build(self):
+        opener = self.words[0].word
+        build(self.words, opener, self.path, self.matrix_path, processes=2)
+        tree = DecisionTree(self.path)
+
+        assert tree.opener == opener
+        assert tree.word_id(0) == 100
+        assert not self.path.with_name("decision_tree.bin.parts").exists()
+
+        for word in self.words:
+            self._play(tree, word.word)
+
+    def test_build_with_pattern_matrix(self):
+        build_pattern_matrix(self.words, self.matrix_path, processes=1)
+        build(self.words, self.words[1].word, self.path, self.matrix_path, processes=1)
+        tree = DecisionTree(self.path)
+
+        for word in self.words:
+            self._play(tree, word.word)
+
+    def test_invalid_opener(self):
+        with pytest.raises(ValueError):
+            build(self.words, "QQQQQ", self.path, self.matrix_path)
@@ -0,0 +1,55 @@
+"""All tests for the batch game engine"""
+
+import numpy as np
+import pytest
+from pywordle.logic.game_batch import NO_PATTERN, GameBatch
+from pywordle.logic.scoring import ALL_CORRECT, score
+from pywordle.model.models import Word
+
+
+class TestGameBatch:
+    """Testclass for the batch game engine (game_batch.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self):
+        self.words = [
+            Word(id=index, word=word)
+            for index, word in enumerate(["KATZE", "KATER", "TATZE", "HUNDE"])
+        ]
+
+    def test_step(self):
+        batch = GameBatch(self.words, [0, 1, 2, 3])
+        patterns = batch.step([0, 0, 0, 0])
+
+        assert patterns.tolist() == [
+            score("KATZE", answer.word) for answer in self.words
+        ]
+        assert batch.done.tolist() == [True, False, False, False]
+        assert batch.won.tolist() == [True, False, False, False]
+
+        patterns = batch.step([2, 1, 2, 3])
+        assert patterns.tolist() == [NO_PATTERN, ALL_CORRECT, ALL_CORRECT, ALL_CORRECT]
+        assert batch.runs.tolist() == [1, 2, 2, 2]
+        assert batch.done.all()
+        assert batch.history(1) == [
+            ("KATZE", score("KATZE", "KATER")),
+            ("KATER", ALL_CORRECT),
+        ]
+
+    def test_run_limit(self):
+        batch = GameBatch(self.words, [3])
+
+        for _ in range(6):
+            batch.step([0])
+
+        assert batch.done.all()
+        assert not batch.won.any()
+        assert batch.step([3]).tolist() == [NO_PATTERN]
+
+        batch.restart([0], [1])
+        assert not batch.done.any()
+        assert batch.step(np.array([1])).tolist() == [ALL_CORRECT]
+
+    def test_invalid_guesses(self):
+        with pytest.raises(ValueError):
+            GameBatch(self.words, [0, 1]).step([0])
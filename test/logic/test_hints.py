@@ -0,0 +1,85 @@
+"""All tests for the hint engine"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from pywordle.logic.hints import (HintEngine, best_guess, best_scored_guess,
+                                  expected_entropy)
+from pywordle.logic.pattern_matrix import build
+from pywordle.logic.scoring import letter_codes, score_matrix
+from pywordle.model.models import Word
+
+
+class TestHintEngine:
+    """Testclass for the hint engine (hints.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        self.path = tmp_path / "patterns.bin"
+        self.words = [
+            Word(id=index, word=word)
+            for index, word in enumerate(["KATZE", "KATER", "TATZE", "HUNDE", "MAUSI"])
+        ]
+
+    def _best_guesses(self, engine, answers):
+        async def collect():
+            with ThreadPoolExecutor() as executor:
+                return [item async for item in engine.best_guesses(executor, answers)]
+
+        return asyncio.run(collect())
+
+    def test_expected_entropy(self):
+        patterns = np.array([[0, 0, 0, 0], [0, 1, 2, 3], [0, 0, 1, 1]], dtype=np.uint8)
+        assert expected_entropy(patterns).tolist() == [0.0, 2.0, 1.0]
+
+    def test_expected_entropy_chunks(self, mocker):
+        patterns = np.random.default_rng(1).integers(0, 243, (50, 7), dtype=np.uint8)
+        expected = expected_entropy(patterns)
+
+        mocker.patch("pywordle.logic.hints._ENTROPY_CHUNK_SIZE", 20)
+        assert np.allclose(expected_entropy(patterns), expected)
+        assert np.allclose(expected_entropy(patterns[:, :1]), 0.0)
+
+    def test_best_scored_guess(self, mocker):
+        codes = letter_codes([word.word for word in self.words])
+        expected = best_guess(score_matrix(codes, codes[[0, 1, 3]]), [0, 1, 3])
+
+        mocker.patch("pywordle.logic.hints.CHUNK_SIZE", 2)
+        assert best_scored_guess(codes, [0, 1, 3]) == expected
+
+    def test_best_guesses(self):
+        engine = HintEngine(self.words, self.path)
+        results = self._best_guesses(engine, [0, 1, 2, 3])
+
+        assert results
+        word, entropy = results[-1]
+        assert word.word == "KATZE"
+        assert entropy == 2.0
+
+        build(self.words, self.path, processes=1)
+        assert self._best_guesses(HintEngine(self.words, self.path), [0, 1, 2, 3])[
+            -1
+        ] == (word, entropy)
+
+    def test_few_answers(self):
+        engine = HintEngine(self.words, self.path)
+
+        assert self._best_guesses(engine, []) == []
+        assert self._best_guesses(engine, [3]) == [(self.words[3], 0.0)]
+
+    def test_changed_matrix_file(self):
+        build(self.words, self.path, processes=1)
+        engine = HintEngine(self.words, self.path)
+        expected = self._best_guesses(engine, [0, 1, 2, 3])[-1]
+
+        # rows of the engine point to other words after the rebuild
+        build(self.words[::-1], self.path, processes=1)
+        assert self._best_guesses(engine, [0, 1, 2, 3])[-1] == expected
+
+        build(self.words[1:], self.path, processes=1)
+        assert self._best_guesses(engine, [0, 1, 2, 3])[-1] == expected
+
+        self.path.unlink()
+        assert self._best_guesses(engine, [0, 1, 2, 3])[-1] == expected
@@ -0,0 +1,56 @@
+"""All tests for the best-opener search"""
+
+import csv
+
+import pytest
+from pywordle.logic.openers import find_openers, write_csv
+from pywordle.model.models import Word
+
+
+class TestOpeners:
+    """Testclass for the best-opener search (openers.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.checkpoint_url = f"sqlite:///{tmp_path}/openers.sqlite3"
+        self.matrix_path = tmp_path / "patterns.bin"
+        self.words = [
+            Word(id=index, word=word)
+            for index, word in enumerate(
+                ["KATZE", "KATER", "TATZE", "HUNDE", "MAUSI", "KERZE", "TANTE"]
+            )
+        ]
+
+    def test_find_openers(self):
+        scores = find_openers(
+            self.words, self.checkpoint_url, self.matrix_path, processes=2
+        )
+
+        assert sorted(score.word for score in scores) == sorted(
+            word.word for word in self.words
+        )
+        assert scores == sorted(
+            scores, key=lambda score: (score.expected_remaining, score.worst_case)
+        )
+        assert all(1.0 <= score.average_depth <= 7.0 for score in scores)
+
+        # resumed from checkpoint
+        assert (
+            find_openers(self.words, self.checkpoint_url, self.matrix_path, processes=1)
+            == scores
+        )
+
+    def test_write_csv(self):
+        scores = find_openers(
+            self.words, self.checkpoint_url, self.matrix_path, with_depth=False
+        )
+        path = self.tmp_path / "openers.csv"
+        write_csv(scores, path)
+
+        with path.open(newline="", encoding="utf8") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+
+        assert [row["word"] for row in rows] == [score.word for score in scores]
+        assert rows[0]["rank"] == "1"
+        assert rows[0]["average_depth"] == ""
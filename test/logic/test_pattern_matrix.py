@@ -0,0 +1,183 @@
+"""All tests for the pattern matrix"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+from pywordle.logic import file_lock
+from pywordle.logic.pattern_matrix import (
+    PatternMatrix,
+    add_words,
+    build,
+    compact,
+    mark_stale,
+    remove_words,
+)
+from pywordle.logic.scoring import score
+from pywordle.model.models import Word
+
+
+class TestPatternMatrix:
+    """Testclass for the pattern matrix (pattern_matrix.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        self.path = tmp_path / "patterns.bin"
+        self.words = [
+            Word(id=3, word="KATZE"),
+            Word(id=7, word="HUNDI"),
+            Word(id=9, word="KATER"),
+        ]
+
+    def test_build(self):
+        build(self.words, self.path, processes=2)
+        matrix = PatternMatrix(self.path)
+
+        assert not matrix.stale
+        assert list(matrix.ids) == [3, 7, 9]
+
+        for guess in self.words:
+            for answer in self.words:
+                pattern = matrix.matrix[
+                    matrix.index_of(guess.id), matrix.index_of(answer.id)
+                ]
+                assert pattern == score(guess.word, answer.word)
+
+    def test_mark_stale(self):
+        mark_stale(self.path)
+        assert not self.path.exists()
+
+        build(self.words, self.path, processes=1)
+        mark_stale(self.path)
+        assert PatternMatrix(self.path).stale
+
+    def _assert_scored(self, matrix, words):
+        for guess in words:
+            for answer in words:
+                pattern = matrix.matrix[
+                    matrix.index_of(guess.id), matrix.index_of(answer.id)
+                ]
+                assert pattern == score(guess.word, answer.word)
+
+    def test_add_words(self):
+        build(self.words, self.path, processes=1)
+        new_words = [
+            Word(id=100 + index, word=f"KAT{first}{second}")
+            for index, (first, second) in enumerate(zip("ABCDEFGH" * 8, "ÄÖÜẞ" * 16))
+        ]
+        add_words(new_words, self.path)
+
+        matrix = PatternMatrix(self.path)
+        assert matrix.count == len(self.words) + len(new_words)
+        assert matrix.capacity >= matrix.count
+        assert matrix.alive.all()
+        self._assert_scored(matrix, self.words + new_words)
+
+    def test_add_words_concurrent_writers(self):
+        build(self.words, self.path, processes=1)
+        batches = [
+            [
+                Word(id=100 + 10 * batch + index, word=f"KAT{letter}{last}")
+                for index, letter in enumerate("ABCDEFGH")
+            ]
+            for batch, last in enumerate("ÄÖÜẞ")
+        ]
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            for future in [
+                executor.submit(add_words, batch, self.path) for batch in batches
+            ]:
+                future.result()
+
+        matrix = PatternMatrix(self.path)
+        added = [word for batch in batches for word in batch]
+        assert sorted(matrix.ids) == sorted(word.id for word in self.words + added)
+        self._assert_scored(matrix, self.words + added)
+
+    def test_add_words_waits_for_lock(self):
+        build(self.words, self.path, processes=1)
+        writer = threading.Thread(
+            target=add_words, args=([Word(id=11, word="HUNDE")], self.path)
+        )
+
+        with open(self.path.with_name("patterns.bin.lock"), mode="a+b") as lock_file:
+            file_lock.lock(lock_file)
+            writer.start()
+            writer.join(0.2)
+
+            assert writer.is_alive()
+            assert PatternMatrix(self.path).count == len(self.words)
+
+        writer.join()
+        assert PatternMatrix(self.path).count == len(self.words) + 1
+
+    def test_remove_words(self, mocker):
+        build(self.words, self.path, processes=1)
+        mocker.patch("pywordle.logic.pattern_matrix.COMPACTION_THRESHOLD", 1.0)
+        remove_words([7], self.path)
+
+        matrix = PatternMatrix(self.path)
+        assert list(matrix.ids) == [3, 7, 9]
+        assert list(matrix.alive) == [True, False, True]
+
+        # reused id of a removed word gets scored again
+        word = Word(id=7, word="HUNDE")
+        add_words([word], self.path)
+        matrix = PatternMatrix(self.path)
+        assert matrix.alive.all()
+        self._assert_scored(matrix, [self.words[0], word, self.words[2]])
+
+        remove_words([3], self.path)
+        compact(self.path)
+        matrix = PatternMatrix(self.path)
+        assert list(matrix.ids) == [7, 9]
+        self._assert_scored(matrix, [word, self.words[2]])
+
+    def test_remove_words_compacts(self):
+        build(self.words, self.path, processes=1)
+        remove_words([7], self.path)
+
+        matrix = PatternMatrix(self.path)
+        assert list(matrix.ids) == [3, 9]
+        self._assert_scored(matrix, [self.words[0], self.words[2]])
+
+    @pytest.mark.skipif(
+        not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps"
+    )
+    def test_rewrite_unmaps_file(self, mocker):
+        build(self.words, self.path, processes=1)
+        replace = os.replace
+
+        def unmapped_replace(source, target):
+            # Windows can not replace a mapped file
+            assert str(target) not in Path("/proc/self/maps").read_text()
+            replace(source, target)
+
+        mocker.patch("pywordle.logic.pattern_matrix.os.replace", unmapped_replace)
+
+        # grow past the capacity and compact (tombstones)
+        new_words = [
+            Word(id=100 + index, word=f"KAT{first}{second}")
+            for index, (first, second) in enumerate(zip("ABCDEFGH" * 8, "ÄÖÜẞ" * 16))
+        ]
+        add_words(new_words, self.path)
+        assert PatternMatrix(self.path).count == len(self.words) + len(new_words)
+
+        remove_words([word.id for word in new_words], self.path)
+
+        assert list(PatternMatrix(self.path).ids) == [3, 7, 9]
+
+    def test_stale_file_is_not_maintained(self):
+        build(self.words, self.path, processes=1)
+        mark_stale(self.path)
+        add_words([Word(id=11, word="HUNDE")], self.path)
+
+        assert PatternMatrix(self.path).count == len(self.words)
+
+    def test_invalid_file(self):
+        self.path.write_bytes(b"invalid file")
+
+        with pytest.raises(ValueError):
+            PatternMatrix(self.path)
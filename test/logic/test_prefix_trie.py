@@ -0,0 +1,60 @@
+"""All tests for the prefix trie"""
+
+from pywordle.logic import prefix_trie
+from pywordle.logic.prefix_trie import PrefixTrie
+
+WORDS = ["KATZE", "KATER", "HUNDI", "GRÜßE", "KÄFER"]
+
+
+class TestPrefixTrie:
+    """Testclass for the prefix trie (prefix_trie.py)"""
+
+    def test_prefix_trie_has_prefix(self):
+        trie = PrefixTrie(WORDS)
+
+        for prefix in ["", "K", "KAT", "KATZ", "KATER", "kä", "GRÜẞ", "grüß"]:
+            assert trie.has_prefix(prefix)
+
+        for prefix in ["A", "KAZ", "KATZA", "HUNDIS", "K1"]:
+            assert not trie.has_prefix(prefix)
+
+        assert "KATZE" in trie
+        assert "KATZ" not in trie
+
+    def test_prefix_trie_layout(self):
+        trie = PrefixTrie(["AB" + "AAA", "AC" + "AAA"])
+
+        # root, A, B, C and two nodes per remaining letter of both words
+        assert len(trie) == 1 + 1 + 2 + 2 * 3
+        assert trie.child(0, "A") == 1
+        assert trie.child(1, "B") == 2
+        assert trie.child(1, "C") == 3
+        assert trie.child(1, "D") is None
+
+    def test_prefix_trie_matches(self):
+        trie = PrefixTrie(WORDS)
+
+        assert trie.matches([None, None, "T", None, "R"])
+        assert trie.matches(["K", None, None, "E", "R"])
+        assert not trie.matches([None, None, "T", None, "I"])
+        assert not trie.matches(["K", None, None, None, None, None])
+        assert trie.matches([None] * 5)
+        assert not PrefixTrie([]).matches([None])
+        assert not PrefixTrie([]).has_prefix("")
+
+    def test_prefix_trie_shared(self, mocker):
+        cache = prefix_trie.db_manager.VersionedCache(PrefixTrie.from_database)
+        mocker.patch.object(prefix_trie, "_shared", cache)
+        get_words = mocker.patch.object(
+            prefix_trie.db_manager, "get_words", return_value=[]
+        )
+        version = mocker.patch.object(
+            prefix_trie.db_manager, "dictionary_version", return_value=1
+        )
+
+        assert prefix_trie.shared() is prefix_trie.shared()
+        assert get_words.call_count == 1
+
+        version.return_value = 2
+        prefix_trie.shared()
+        assert get_words.call_count == 2
@@ -0,0 +1,239 @@
+"""All tests for the write-behind result writer"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+from pywordle.logic import db_manager
+from pywordle.logic.result_writer import ResultWriter
+from pywordle.model.models import Base, Result, Word
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+def _results(session_maker):
+    with session_maker() as session:
+        return [
+            (result.word_id, result.guessed_in_run, result.created_at)
+            for result in session.query(Result).order_by(Result.id)
+        ]
+
+
+class TestResultWriter:
+    """Testclass for the result writer (result_writer.py)"""
+
+    @pytest.fixture
+    def session_maker(self, mocker):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(engine)
+
+        with Session() as session:
+            session.add_all([Word(word="KATZE"), Word(word="HUNDE")])
+            session.commit()
+
+        mocker.patch("pywordle.logic.db_manager.Session", Session)
+
+        return Session
+
+    def test_result_writer_flushes_at_max_rows(self, session_maker, tmp_path):
+        created_at = datetime(2022, 4, 1, 12, 0)
+
+        with ResultWriter(
+            max_rows=3, max_delay_ms=60_000, journal_path=tmp_path / "j"
+        ) as writer:
+            writer.add(1, 2, created_at)
+            writer.add(2, None, created_at)
+            assert _results(session_maker) == []
+
+            writer.add(1, 6, created_at)
+
+            for _ in range(100):
+                if _results(session_maker):
+                    break
+                time.sleep(0.01)
+
+            assert _results(session_maker) == [
+                (1, 2, created_at),
+                (2, None, created_at),
+                (1, 6, created_at),
+            ]
+
+    def test_result_writer_flushes_after_delay(self, session_maker, tmp_path):
+        with ResultWriter(max_delay_ms=10, journal_path=tmp_path / "j") as writer:
+            writer.add(1, 1)
+
+            for _ in range(100):
+                if _results(session_maker):
+                    break
+                time.sleep(0.01)
+
+            assert [result[:2] for result in _results(session_maker)] == [(1, 1)]
+
+    def test_result_writer_flushes_on_close(self, session_maker, tmp_path):
+        journal_path = tmp_path / "j"
+        writer = ResultWriter(max_delay_ms=60_000, journal_path=journal_path)
+        writer.add(2, 3)
+        assert writer.journal_path.parent == tmp_path
+        assert writer.journal_path.name.startswith("j.")
+        writer.close()
+
+        assert [result[:2] for result in _results(session_maker)] == [(2, 3)]
+        assert list(tmp_path.iterdir()) == []
+
+        with pytest.raises(ValueError):
+            writer.add(1, 1)
+
+    def test_result_writer_keeps_journal_on_failure(
+        self, session_maker, tmp_path, mocker
+    ):
+        journal_path = tmp_path / "j"
+        created_at = datetime(2022, 4, 1, 12, 0)
+        add_results = mocker.patch(
+            "pywordle.logic.db_manager.add_results",
+            side_effect=OperationalError("INSERT", {}, Exception("locked")),
+        )
+
+        writer = ResultWriter(max_delay_ms=60_000, journal_path=journal_path)
+        writer.add(1, None, created_at)
+        writer.add(2, 4, created_at)
+        assert not writer.flush()
+        assert isinstance(writer.last_error, OperationalError)
+        writer.close()
+
+        assert add_results.called
+        assert writer.journal_path.exists()
+        assert _results(session_maker) == []
+
+        # the next writer recovers the journal
+        mocker.stopall()
+        mocker.patch("pywordle.logic.db_manager.Session", session_maker)
+
+        with ResultWriter(max_delay_ms=60_000, journal_path=journal_path) as writer:
+            assert writer.flush()
+            assert writer.last_error is None
+
+        assert _results(session_maker) == [(1, None, created_at), (2, 4, created_at)]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_result_writer_replaces_synced_journal(
+        self, session_maker, tmp_path, mocker
+    ):
+        journal_path = tmp_path / "j"
+        # left by a writer, that crashed while replacing its journal
+        (tmp_path / ".j.crashed").write_text("1,,2022-04-01T12:00:00\n")
+        fsync = mocker.spy(os, "fsync")
+
+        writer = ResultWriter(max_delay_ms=60_000, journal_path=journal_path)
+        assert list(tmp_path.iterdir()) == [writer.journal_path]
+
+        fsync.reset_mock()
+        writer.add(1, 2)
+        assert fsync.call_count == 1
+        inode = writer.journal_path.stat().st_ino
+
+        # the insert worked, a crash before the replacement keeps the old
+        # journal complete (replayed at least once)
+        mocker.patch("pywordle.logic.result_writer.os.replace", side_effect=OSError)
+
+        with pytest.raises(OSError):
+            writer.flush()
+
+        mocker.stopall()
+        mocker.patch("pywordle.logic.db_manager.Session", session_maker)
+        assert writer.journal_path.read_text().startswith("1,2,")
+
+        writer.add(2, None)
+        assert writer.flush()
+        assert writer.journal_path.read_text() == ""
+        assert writer.journal_path.stat().st_ino != inode
+        writer.close()
+
+        assert [result[:2] for result in _results(session_maker)] == [
+            (1, 2),
+            (2, None),
+        ]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_result_writer_backs_off_after_failure(self, tmp_path, mocker):
+        add_results = mocker.patch(
+            "pywordle.logic.db_manager.add_results",
+            side_effect=OperationalError("INSERT", {}, Exception("locked")),
+        )
+
+        writer = ResultWriter(max_rows=1, max_delay_ms=50, journal_path=tmp_path / "j")
+        writer.add(1, 1)
+        time.sleep(0.5)
+
+        # insert at once, retries after 50, 100 and 200 ms (not a busy loop)
+        assert 2 <= add_results.call_count <= 5
+
+        # max_rows results do not skip the delay of the retry
+        writer.add(2, 2)
+        time.sleep(0.05)
+        assert add_results.call_count <= 5
+
+        writer.close()
+        assert writer.journal_path.exists()
+
+    def test_result_writer_skips_torn_journal_lines(self, session_maker, tmp_path):
+        journal_path = tmp_path / "j"
+        (tmp_path / "j.crashed").write_text(
+            "1,2,2022-04-01T12:00:00\r\n"
+            "not,a,result\r\n"
+            "2,,2022-04-01T12:00:00\r\n"
+            "1,6,2022-04-0",
+            encoding="utf8",
+        )
+
+        with ResultWriter(max_delay_ms=60_000, journal_path=journal_path) as writer:
+            assert writer.skipped_rows == 2
+
+        created_at = datetime(2022, 4, 1, 12, 0)
+        assert _results(session_maker) == [(1, 2, created_at), (2, None, created_at)]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_result_writers_keep_their_journals(self, session_maker, tmp_path, mocker):
+        journal_path = tmp_path / "j"
+        mocker.patch(
+            "pywordle.logic.db_manager.add_results",
+            side_effect=OperationalError("INSERT", {}, Exception("locked")),
+        )
+
+        first = ResultWriter(max_delay_ms=60_000, journal_path=journal_path)
+        first.add(1, 1)
+        second = ResultWriter(max_delay_ms=60_000, journal_path=journal_path)
+
+        # the journal of a running writer is locked, not replayed
+        assert second.flush()
+        assert first.journal_path != second.journal_path
+        assert first.journal_path.read_text(encoding="utf8").startswith("1,1,")
+
+        second.close()
+        first.close()
+
+        # the journal of the failed writer is adopted by the next one
+        mocker.stopall()
+        mocker.patch("pywordle.logic.db_manager.Session", session_maker)
+
+        with ResultWriter(max_delay_ms=60_000, journal_path=journal_path):
+            pass
+
+        assert [result[:2] for result in _results(session_maker)] == [(1, 1)]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_add_results_created_at(self, session_maker):
+        created_at = datetime(2022, 4, 1, 12, 0)
+        db_manager.add_results([(1, 1, created_at), (2, None)])
+
+        results = _results(session_maker)
+        assert results[0] == (1, 1, created_at)
+        assert results[1][:2] == (2, None)
+        assert results[1][2] != created_at
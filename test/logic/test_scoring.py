@@ -0,0 +1,84 @@
+"""All tests for the scoring engine"""
+
+import numpy as np
+import pytest
+from pywordle.logic.helper import upper
+from pywordle.logic.scoring import (
+    ALL_CORRECT,
+    PATTERN_COUNT,
+    GueissingPositionState,
+    letter_codes,
+    pattern_to_states,
+    score,
+    score_matrix,
+    score_states,
+    states_to_pattern,
+)
+
+CORRECT = GueissingPositionState.CORRECT_POSITION
+OTHER = GueissingPositionState.EXIST_ON_OTHER_POSITION
+MISSING = GueissingPositionState.DOES_NOT_EXIST
+
+
+class TestScoring:
+    """Testclass for the scoring engine (scoring.py)"""
+
+    def test_score(self):
+        assert score("KATZE", "KATZE") == ALL_CORRECT
+        assert score("ABCDE", "FGHIJ") == 0
+        assert score_states("KATER", "KATZE") == [
+            CORRECT,
+            CORRECT,
+            CORRECT,
+            OTHER,
+            MISSING,
+        ]
+
+    def test_score_duplicate_letters(self):
+        # every occurence of an open letter is marked as existing
+        assert score_states("EEEEX", "ABCDE") == [OTHER, OTHER, OTHER, OTHER, MISSING]
+
+        # letters on correct positions are not available for other positions
+        assert score_states("AABBB", "AXXXX") == [
+            CORRECT,
+            MISSING,
+            MISSING,
+            MISSING,
+            MISSING,
+        ]
+        assert score_states("AABBB", "AXXXA") == [
+            CORRECT,
+            OTHER,
+            MISSING,
+            MISSING,
+            MISSING,
+        ]
+
+    def test_pattern_conversion(self):
+        for pattern in range(PATTERN_COUNT):
+            assert states_to_pattern(pattern_to_states(pattern)) == pattern
+
+        assert pattern_to_states(ALL_CORRECT) == [CORRECT] * 5
+
+        with pytest.raises(ValueError):
+            pattern_to_states(PATTERN_COUNT)
+
+        with pytest.raises(ValueError):
+            states_to_pattern([GueissingPositionState.UNKNOWN] * 5)
+
+    def test_score_matrix(self):
+        words = ["KATZE", "KATER", "TATZE", "EEEEX", "ABCDE", "SPAẞE", "spaße"]
+        matrix = score_matrix(words, words[:4])
+
+        assert matrix.shape == (len(words), 4)
+        assert matrix.dtype == np.uint8
+
+        for row, guess in enumerate(words):
+            for column, answer in enumerate(words[:4]):
+                assert matrix[row, column] == score(upper(guess), answer)
+
+        codes = letter_codes(words)
+        assert (score_matrix(codes, codes) == score_matrix(words, words)).all()
+
+        with pytest.raises(ValueError):
+            letter_codes(["KATZ"])
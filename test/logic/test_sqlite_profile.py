@@ -0,0 +1,77 @@
+"""All tests for the SQLite engine profiles"""
+
+import pytest
+from pywordle.logic import sqlite_profile
+from sqlalchemy.pool import QueuePool
+
+PROFILES = {
+    "default": {},
+    "wal": {
+        "journal_mode": "wal",
+        "synchronous": "NORMAL",
+        "mmap_size": 1024 * 1024,
+        "cache_size": -1024,
+        "temp_store": "MEMORY",
+    },
+    "unknown_pragma": {"foreign_keys": 1},
+    "bad_value": {"synchronous": "FAST"},
+    "bad_integer": {"mmap_size": "big"},
+}
+
+
+class TestSqliteProfile:
+    """Testclass for the SQLite engine profiles (sqlite_profile.py)"""
+
+    @pytest.fixture(autouse=True)
+    def profiles(self, mocker):
+        mocker.patch("pywordle.my_globals.SQLITE_PROFILES", PROFILES)
+        mocker.patch("pywordle.my_globals.SQLITE_PROFILE", "wal")
+
+    def test_get_pragmas(self):
+        assert sqlite_profile.get_pragmas("default") == {}
+        assert sqlite_profile.get_pragmas() == {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 1024 * 1024,
+            "cache_size": -1024,
+            "temp_store": "MEMORY",
+        }
+
+    @pytest.mark.parametrize(
+        "profile", ["missing", "unknown_pragma", "bad_value", "bad_integer"]
+    )
+    def test_get_pragmas_invalid(self, profile):
+        with pytest.raises(ValueError):
+            sqlite_profile.get_pragmas(profile)
+
+    def test_create_engine(self, tmp_path):
+        engine = sqlite_profile.create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+
+        assert isinstance(engine.pool, QueuePool)
+        assert sqlite_profile.current_pragmas(engine) | {"busy_timeout": 0} == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "busy_timeout": 0,
+            "mmap_size": 1024 * 1024,
+            "cache_size": -1024,
+            "temp_store": 2,
+        }
+
+        engine.dispose()
+
+    def test_create_engine_default_profile(self, tmp_path):
+        engine = sqlite_profile.create_engine(
+            f"sqlite:///{tmp_path / 'db.sqlite3'}", profile="default"
+        )
+
+        pragmas = sqlite_profile.current_pragmas(engine)
+        assert pragmas["journal_mode"] == "delete"
+        assert pragmas["synchronous"] == 2
+
+        engine.dispose()
+
+    def test_create_engine_memory(self):
+        engine = sqlite_profile.create_engine("sqlite://")
+
+        assert not isinstance(engine.pool, QueuePool)
+        assert sqlite_profile.current_pragmas(engine)["temp_store"] == 2
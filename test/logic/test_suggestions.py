@@ -0,0 +1,51 @@
+"""All tests for the "did you mean" suggestions"""
+
+import pytest
+from pywordle.logic.suggestions import DeletionIndex, hamming, levenshtein
+
+WORDS = ["KATZE", "KATER", "HUNDI", "MATZE", "TATZE", "KAFFE", "ZEKAT"]
+
+
+class TestSuggestions:
+    """Testclass for the suggestions (suggestions.py)"""
+
+    @pytest.mark.parametrize(
+        "word, other, distance",
+        [
+            ("KATZE", "KATZE", 0),
+            ("KATZE", "MATZE", 1),
+            ("KATZE", "ATZEK", 2),
+            ("KATZE", "KATER", 2),
+            ("", "KATZE", 5),
+            ("KAT", "KATZE", 2),
+        ],
+    )
+    def test_levenshtein(self, word, other, distance):
+        assert levenshtein(word, other) == distance
+        assert levenshtein(other, word) == distance
+
+    def test_hamming(self):
+        assert hamming("KATZE", "ATZEK") == 5
+        assert hamming("KATZE", "MATZE") == 1
+
+    def test_search_matches_linear_scan(self):
+        index = DeletionIndex(WORDS + ["katze"])
+
+        assert len(index) == len(WORDS)
+
+        for word in ["KATZA", "ATZEK", "HUND", "QQQQQ", "KAFEE"]:
+            for max_distance in range(3):
+                assert index.search(word, max_distance) == sorted(
+                    (levenshtein(word, other), other)
+                    for other in WORDS
+                    if levenshtein(word, other) <= max_distance
+                )
+
+    def test_suggest(self):
+        index = DeletionIndex(WORDS)
+
+        # same Levenshtein distance, fewer replaced positions first
+        assert index.suggest("KATZA") == ["KATZE", "KATER", "MATZE"]
+        assert index.suggest("katzi", limit=1) == ["KATZE"]
+        assert "KATZE" not in index.suggest("KATZE")
+        assert index.suggest("QQQQQ") == []
@@ -0,0 +1,98 @@
+"""All tests for the binary word pack"""
+
+import random
+import struct
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+from pywordle.logic.word_pack import PackedWord, WordPack, write
+
+WORDS = [
+    PackedWord(3, "KATZE", True, False, 1.0),
+    PackedWord(1, "HUNDI", True, True, 3.0),
+    PackedWord(7, "GRÜẞE", False, False, 1.0),
+    PackedWord(4, "ÄPFEL", True, False, 0.0),
+]
+
+
+class TestWordPack:
+    """Testclass for the word pack (word_pack.py)"""
+
+    @pytest.fixture
+    def pack(self, tmp_path):
+        word_pack = WordPack(write(WORDS, tmp_path / "words.pack"))
+        yield word_pack
+        word_pack.close()
+
+    def test_word_pack_exist(self, pack):
+        assert len(pack) == 4
+        assert "KATZE" in pack
+        assert pack.exist("grüße")
+        assert pack.exist("äpfel")
+        assert not pack.exist("KATER")
+        assert not pack.exist("KAT")
+
+    def test_word_pack_words_sorted(self, pack):
+        assert [pack.word(index) for index in range(len(pack))] == [
+            WORDS[2],
+            WORDS[1],
+            WORDS[0],
+            WORDS[3],
+        ]
+
+    def test_word_pack_random_word(self, pack):
+        rng = random.Random(1)
+
+        def draw(**kwargs):
+            return Counter(
+                pack.get_random_word(rng=rng, **kwargs).word for _ in range(2000)
+            )
+
+        assert set(draw()) == {"KATZE", "HUNDI", "ÄPFEL"}
+        assert set(draw(allow_nsfw_words=False)) == {"KATZE", "ÄPFEL"}
+        assert set(draw(allow_disabled_words=True)) == {
+            "KATZE",
+            "HUNDI",
+            "GRÜẞE",
+            "ÄPFEL",
+        }
+
+        weighted = draw(weighted=True)
+        assert set(weighted) == {"KATZE", "HUNDI"}
+        assert weighted["HUNDI"] / 2000 == pytest.approx(0.75, abs=0.05)
+
+    def test_word_pack_empty(self, tmp_path):
+        pack = WordPack(write([], tmp_path / "words.pack"))
+
+        assert not pack.exist("KATZE")
+        assert pack.get_random_word() is None
+        pack.close()
+
+    def test_word_pack_invalid(self, tmp_path):
+        path = tmp_path / "words.pack"
+        path.write_bytes(b"XXXX" + bytes(12))
+
+        with pytest.raises(ValueError):
+            WordPack(path)
+
+        write(WORDS, path)
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 4, 99)
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError):
+            WordPack(path)
+
+    def test_word_pack_imports(self):
+        # the kiosk start must not load the database or array libraries
+        code = (
+            "import sys, pywordle.logic.word_pack; "
+            "print(sorted({'numpy', 'sqlalchemy'} & set(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        ).stdout
+
+        assert output.strip() == "[]"
@@ -0,0 +1,62 @@
+"""All tests for the self-play simulator"""
+
+import pytest
+from pywordle.model.models import Word
+from pywordle.sim import EntropySolver, RandomCandidateSolver, Solver, play, simulate
+
+
+class FixedSolver(Solver):
+    """Always guesses the first word."""
+
+    def guess(self, history):
+        return self.words[0].word
+
+
+class TestSimulator:
+    """Testclass for the self-play simulator (sim.py)"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self):
+        self.words = [
+            Word(id=index, word=word)
+            for index, word in enumerate(
+                ["KATZE", "KATER", "TATZE", "HUNDE", "MAUSI", "KERZE", "TANTE"]
+            )
+        ]
+
+    def test_play(self):
+        solver = FixedSolver(self.words)
+
+        assert play(solver, "KATZE") == 1
+        assert play(solver, "HUNDE") is None
+
+        solver = EntropySolver(self.words)
+        assert all(play(solver, word.word) is not None for word in self.words)
+
+    def test_simulate(self, mocker):
+        add_results = mocker.patch("pywordle.sim.db_manager.add_results")
+        report = simulate(
+            RandomCandidateSolver, self.words, seed=1, processes=2, save_results=True
+        )
+
+        assert report.games == len(self.words)
+        assert sum(report.distribution.values()) + report.failures == report.games
+        assert report.failure_rate == 0.0
+        assert report.games_per_second > 0
+        add_results.assert_called_once_with(report.results)
+
+    def test_simulate_entropy_solver(self, mocker):
+        prepare = mocker.spy(EntropySolver, "prepare")
+        report = simulate(EntropySolver, self.words, processes=2)
+
+        # the opener is computed once, not once per worker
+        opener = prepare.spy_return["opener"]
+        assert prepare.call_count == 1
+        assert opener == EntropySolver(self.words).guess([])
+        assert report.failure_rate == 0.0
+        assert EntropySolver(self.words, opener="HUNDE").guess([]) == "HUNDE"
+
+    def test_simulate_sample(self):
+        report = simulate(FixedSolver, self.words, sample=3, seed=1, processes=1)
+        assert report.games == 3
+        assert {word_id for word_id, _ in report.results} <= set(range(7))